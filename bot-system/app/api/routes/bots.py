@@ -2,22 +2,25 @@
 Bot API routes for the BlackWave Bot Service.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
-
-from app.db.session import get_db
-from app.db.repositories.bot_repository import BotRepository
-from app.db.repositories.activity_repository import ActivityRepository
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from app.core.settings import EXPORT_PAGE_SIZE
+from app.db.session import get_async_db, AsyncSessionLocal
+from app.db.repositories.bot_repository import AsyncBotRepository
+from app.db.repositories.activity_repository import AsyncActivityRepository
+from app.services.activity_writer import ActivityWriter
 from app.services.bot_manager import BotManager
-from app.services.content_generator import ContentGenerator
-from app.clients.blackwave_api import BlackwaveAPIClient
-from app.services.memory_service import MemoryService
+from app.services.container import ServiceContainer, get_bot_manager, get_container
 from app.models.models import (
     BotResponse,
     ActivityResponse,
     MemoryResponse,
 )
+from app.utils.cursor import encode_cursor, decode_id_cursor, decode_time_cursor
 
 from app.core.logging import setup_logging
 
@@ -26,58 +29,240 @@ logger = setup_logging()
 
 router = APIRouter()
 
+# Header carrying the cursor of the next page of a keyset-paginated listing
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _decode(decoder, cursor: str):
+    """Decode a request cursor, rejecting malformed ones with a 400."""
+    try:
+        return decoder(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _bot_response(bot, writer: ActivityWriter) -> BotResponse:
+    """Serialize a bot with its last_active time still buffered by the writer."""
+    response = BotResponse.from_orm(bot)
+    last_active = writer.pending_last_active(bot.id)
+    if last_active is not None:
+        response.last_active = last_active
+    return response
+
+
+def _pending_responses(activities: List[Dict[str, Any]]) -> List[ActivityResponse]:
+    """Serialize activities buffered by the writer, newest first, without IDs."""
+    return [
+        ActivityResponse(**{**activity, "target_id": str(activity["target_id"])})
+        for activity in reversed(activities)
+    ]
+
+
+def _sort_key(activity: ActivityResponse) -> Tuple[datetime, int]:
+    """The (created_at, id) key activities are listed and paginated by."""
+    return activity.created_at, activity.id or 0
+
+
+def _merge_activities(
+    rows,
+    pending: List[ActivityResponse],
+    limit: int,
+    before: Optional[Tuple[datetime, int]] = None,
+) -> List[ActivityResponse]:
+    """
+    Merge stored activities with buffered ones, newest first.
+
+    The buffer is read before the database, so an activity committed in
+    between is in both lists; it is returned once, from the database.
+
+    Args:
+        rows: Activities read from the database, newest first
+        pending: Buffered activities from _pending_responses()
+        limit: Maximum number of activities to return
+        before: (created_at, id) of the last activity of the previous page
+
+    Returns:
+        Activity responses
+    """
+    stored = [ActivityResponse.from_orm(row) for row in rows]
+    seen = {(a.bot_id, a.activity_type, a.target_id, a.created_at) for a in stored}
+    pending = [
+        a
+        for a in pending
+        if (a.bot_id, a.activity_type, a.target_id, a.created_at) not in seen
+        and (before is None or _sort_key(a) < before)
+    ]
+    return sorted(stored + pending, key=_sort_key, reverse=True)[:limit]
+
+
+async def _stream_ndjson(
+    fetch_page,
+    serialize: Callable[[Any], str],
+    tail: Optional[Callable[[], List[str]]] = None,
+) -> AsyncIterator[str]:
+    """
+    Stream rows as newline-delimited JSON, one keyset page at a time.
+
+    Only one page of rows is held in memory: each page is serialized, sent,
+    and expunged from the session before the next one is fetched. The stream
+    uses its own session because request-scoped ones are closed before a
+    streaming body is sent.
+
+    Args:
+        fetch_page: Async callable (repositories, after_id) returning the next page
+        serialize: Callable turning a row into a JSON line
+        tail: Callable returning JSON lines sent after the last page
+
+    Yields:
+        One chunk of NDJSON lines per page
+    """
+    async with AsyncSessionLocal() as db:
+        repositories = (AsyncBotRepository(db), AsyncActivityRepository(db))
+        after_id = 0
+        while True:
+            rows = await fetch_page(repositories, after_id)
+            if not rows:
+                break
+            after_id = rows[-1].id
+            yield "".join(serialize(row) + "\n" for row in rows)
+            db.expunge_all()
+            if len(rows) < EXPORT_PAGE_SIZE:
+                break
+    if tail is not None:
+        lines = tail()
+        if lines:
+            yield "".join(line + "\n" for line in lines)
+
 
 @router.get("/activities", response_model=List[ActivityResponse])
 async def get_recent_activities(
-    limit: int = Query(20, ge=1, le=100), db: Session = Depends(get_db)
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    container: ServiceContainer = Depends(get_container),
+):
+    """
+    Get recent activities from all bots, including ones not yet written.
+    """
+    pending = _pending_responses(container.activity_writer.pending_activities())
+    activity_repository = AsyncActivityRepository(db)
+    activities = await activity_repository.get_recent_activities(limit=limit)
+
+    return _merge_activities(activities, pending, limit)
+
+
+@router.get("/export")
+async def export_bots(container: ServiceContainer = Depends(get_container)):
+    """
+    Stream all bots as newline-delimited JSON, ordered by ID.
+    """
+    writer = container.activity_writer
+
+    async def fetch_page(repositories, after_id):
+        return await repositories[0].get_bots_after(after_id, EXPORT_PAGE_SIZE)
+
+    def serialize(bot):
+        return _bot_response(bot, writer).model_dump_json()
+
+    return StreamingResponse(
+        _stream_ndjson(fetch_page, serialize), media_type="application/x-ndjson"
+    )
+
+
+@router.get("/activities/export")
+async def export_activities(
+    bot_id: Optional[int] = None,
+    activity_type: Optional[str] = None,
+    container: ServiceContainer = Depends(get_container),
 ):
     """
-    Get recent activities from all bots.
+    Stream activities as newline-delimited JSON, ordered by ID.
+
+    Activities not yet written follow the stored ones, without an ID.
     """
-    activity_repository = ActivityRepository(db)
-    activities = activity_repository.get_recent_activities(limit=limit)
 
-    return [ActivityResponse.from_orm(activity) for activity in activities]
+    async def fetch_page(repositories, after_id):
+        return await repositories[1].get_activities_after(
+            after_id, EXPORT_PAGE_SIZE, bot_id, activity_type
+        )
+
+    def serialize(activity):
+        return ActivityResponse.model_validate(activity).model_dump_json()
+
+    def tail():
+        pending = container.activity_writer.pending_activities(bot_id, activity_type)
+        return [a.model_dump_json() for a in reversed(_pending_responses(pending))]
+
+    return StreamingResponse(
+        _stream_ndjson(fetch_page, serialize, tail),
+        media_type="application/x-ndjson",
+    )
 
 
 @router.get("/", response_model=List[BotResponse])
-async def get_bots(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def get_bots(
+    response: Response,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+    container: ServiceContainer = Depends(get_container),
+):
     """
-    Get all bots with pagination.
+    Get bots ordered by ID, paginated by cursor.
+
+    The cursor of the next page is returned in the X-Next-Cursor header.
+    skip is still accepted for offset pagination when no cursor is given.
     """
-    bot_repository = BotRepository(db)
-    bots = bot_repository.get_all_bots(skip, limit)
+    bot_repository = AsyncBotRepository(db)
+    if cursor is None and skip:
+        bots = await bot_repository.get_all_bots(skip, limit)
+    else:
+        after_id = _decode(decode_id_cursor, cursor) if cursor else 0
+        bots = await bot_repository.get_bots_after(after_id, limit)
+        if len(bots) == limit:
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(bots[-1].id)
 
-    return [BotResponse.from_orm(bot) for bot in bots]
+    return [_bot_response(bot, container.activity_writer) for bot in bots]
 
 
 @router.get("/{bot_id}", response_model=BotResponse)
-async def get_bot(bot_id: int, db: Session = Depends(get_db)):
+async def get_bot(
+    bot_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    container: ServiceContainer = Depends(get_container),
+):
     """
     Get a specific bot by ID.
     """
-    bot_repository = BotRepository(db)
-    bot = bot_repository.get_bot_by_id(bot_id)
+    bot_repository = AsyncBotRepository(db)
+    bot = await bot_repository.get_bot_by_id(bot_id)
 
     if not bot:
         raise HTTPException(status_code=404, detail="Bot not found")
 
-    return BotResponse.from_orm(bot)
+    return _bot_response(bot, container.activity_writer)
 
 
 @router.delete("/{bot_id}")
-async def delete_bot(bot_id: int, db: Session = Depends(get_db)):
+async def delete_bot(
+    bot_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    container: ServiceContainer = Depends(get_container),
+):
     """
     Delete a specific bot.
     """
-    bot_repository = BotRepository(db)
-    bot = bot_repository.get_bot_by_id(bot_id)
+    bot_repository = AsyncBotRepository(db)
+    bot = await bot_repository.get_bot_by_id(bot_id)
 
     if not bot:
         raise HTTPException(status_code=404, detail="Bot not found")
 
     # Delete bot
-    bot_repository.delete_bot(bot_id)
+    await bot_repository.delete_bot(bot_id)
+    container.stats.bots_removed(1, [bot.category])
+    container.interaction_index.evict(bot_id)
+    container.activity_writer.discard_bot(bot_id)
 
     return {"message": f"Bot {bot_id} deleted successfully"}
 
@@ -85,46 +270,76 @@ async def delete_bot(bot_id: int, db: Session = Depends(get_db)):
 @router.get("/{bot_id}/activities", response_model=List[ActivityResponse])
 async def get_bot_activities(
     bot_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=1000),
     activity_type: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
+    container: ServiceContainer = Depends(get_container),
 ):
     """
-    Get activities for a specific bot.
+    Get activities for a specific bot, newest first, paginated by cursor.
+
+    The cursor of the next page is returned in the X-Next-Cursor header.
+    skip is still accepted for offset pagination when no cursor is given.
+    Activities not yet written come first, without an ID.
     """
-    bot_repository = BotRepository(db)
-    activity_repository = ActivityRepository(db)
+    bot_repository = AsyncBotRepository(db)
+    activity_repository = AsyncActivityRepository(db)
 
-    bot = bot_repository.get_bot_by_id(bot_id)
+    bot = await bot_repository.get_bot_by_id(bot_id)
     if not bot:
         raise HTTPException(status_code=404, detail="Bot not found")
 
-    if activity_type:
-        activities = activity_repository.get_activities_by_type(
-            bot_id, activity_type, skip, limit
-        )
-    else:
-        activities = activity_repository.get_activities_by_bot_id(bot_id, skip, limit)
-
-    return [ActivityResponse.from_orm(activity) for activity in activities]
+    pending = _pending_responses(
+        container.activity_writer.pending_activities(bot_id, activity_type)
+    )
+    if cursor is None and skip:
+        # Buffered activities are newer than stored ones and come first
+        page = pending[skip : skip + limit]
+        stored_skip = max(0, skip - len(pending))
+        activities = []
+        if len(page) < limit:
+            if activity_type:
+                activities = await activity_repository.get_activities_by_type(
+                    bot_id, activity_type, stored_skip, limit - len(page)
+                )
+            else:
+                activities = await activity_repository.get_activities_by_bot_id(
+                    bot_id, stored_skip, limit - len(page)
+                )
+        return page + [ActivityResponse.from_orm(activity) for activity in activities]
+
+    before = _decode(decode_time_cursor, cursor) if cursor else None
+    activities = await activity_repository.get_activities_before(
+        bot_id, before, limit, activity_type
+    )
+    activities = _merge_activities(activities, pending, limit, before)
+    if len(activities) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*_sort_key(activities[-1]))
+    return activities
 
 
 @router.get("/{bot_id}/memories", response_model=List[MemoryResponse])
 async def get_bot_memories(
-    bot_id: int, limit: int = 100, db: Session = Depends(get_db)
+    bot_id: int,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_async_db),
+    container: ServiceContainer = Depends(get_container),
 ):
     """
     Get memories for a specific bot.
     """
-    bot_repository = BotRepository(db)
-    bot = bot_repository.get_bot_by_id(bot_id)
+    bot_repository = AsyncBotRepository(db)
+    bot = await bot_repository.get_bot_by_id(bot_id)
     if not bot:
         raise HTTPException(status_code=404, detail="Bot not found")
 
-    # Use MemoryService to search for memories
-    memory_service = MemoryService()
-    memories = await memory_service.search_memories(bot_id, query="", limit=limit)
+    # Use the shared MemoryService to search for memories
+    memories = await container.memory_service.search_memories(
+        bot_id, query="", limit=limit
+    )
 
     return [
         MemoryResponse(
@@ -138,60 +353,34 @@ async def get_bot_memories(
 
 
 @router.post("/{bot_id}/react")
-async def trigger_bot_reaction(bot_id: int, db: Session = Depends(get_db)):
+async def trigger_bot_reaction(
+    bot_id: int, bot_manager: BotManager = Depends(get_bot_manager)
+):
     """
     Trigger a reaction from a specific bot to a post.
     """
-    bot_repository = BotRepository(db)
-    activity_repository = ActivityRepository(db)
-    content_generator = ContentGenerator()
-    api_client = BlackwaveAPIClient()
-    memory_service = MemoryService()
-
-    bot = bot_repository.get_bot_by_id(bot_id)
+    bot = await bot_manager.bot_repository.get_bot_by_id(bot_id)
     if not bot:
         raise HTTPException(status_code=404, detail="Bot not found")
 
-    bot_manager = BotManager(
-        bot_repository=bot_repository,
-        activity_repository=activity_repository,
-        content_generator=content_generator,
-        api_client=api_client,
-        memory_service=memory_service,
-    )
-
     # Process bot activity
-    async with api_client:
-        result = await bot_manager.process_bot_activity(bot_id)
+    result = await bot_manager.process_bot_activity(bot_id)
 
     return result
 
 
 @router.post("/{bot_id}/post")
-async def create_bot_post(bot_id: int, db: Session = Depends(get_db)):
+async def create_bot_post(
+    bot_id: int, bot_manager: BotManager = Depends(get_bot_manager)
+):
     """
     Create a post for a specific bot.
     """
-    bot_repository = BotRepository(db)
-    activity_repository = ActivityRepository(db)
-    content_generator = ContentGenerator()
-    api_client = BlackwaveAPIClient()
-    memory_service = MemoryService()
-
-    bot = bot_repository.get_bot_by_id(bot_id)
+    bot = await bot_manager.bot_repository.get_bot_by_id(bot_id)
     if not bot:
         raise HTTPException(status_code=404, detail="Bot not found")
 
-    bot_manager = BotManager(
-        bot_repository=bot_repository,
-        activity_repository=activity_repository,
-        content_generator=content_generator,
-        api_client=api_client,
-        memory_service=memory_service,
-    )
-
     # Create post
-    async with api_client:
-        result = await bot_manager.create_bot_post(bot_id)
+    result = await bot_manager.create_bot_post(bot_id)
 
     return result
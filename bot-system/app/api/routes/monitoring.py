@@ -2,17 +2,20 @@
 Monitoring API routes for the BlackWave Bot Service.
 """
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-import psutil
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+import asyncio
+import os
 import time
 from datetime import datetime
+from typing import List, Optional, Tuple
 
-from app.db.session import get_db
-from app.db.repositories.bot_repository import BotRepository
-from app.db.repositories.activity_repository import ActivityRepository
+from app.clients.resilience import get_client_metrics
+from app.services.container import ServiceContainer, get_container
+from app.core.settings import LOG_FILE, LOG_FOLLOW_INTERVAL
+from app.core.log_reader import end_position, level_filter, read_since, tail
 
-from app.core.logging import setup_logging
+from app.core.logging import setup_logging, log_buffer
 
 # Setup logging
 logger = setup_logging()
@@ -22,6 +25,9 @@ router = APIRouter()
 # Track service start time
 SERVICE_START_TIME = time.time()
 
+LEVEL_PATTERN = "^(DEBUG|INFO|WARNING|ERROR|CRITICAL)$"
+SOURCE_PATTERN = "^(file|memory)$"
+
 
 @router.get("/health")
 async def health_check():
@@ -36,67 +42,141 @@ async def health_check():
 
 
 @router.get("/stats")
-async def get_stats(db: Session = Depends(get_db)):
+async def get_stats(container: ServiceContainer = Depends(get_container)):
     """
     Get system statistics.
-    """
-    bot_repository = BotRepository(db)
-    activity_repository = ActivityRepository(db)
-
-    # Get bot statistics
-    bot_count = bot_repository.count_bots()
-    bot_categories = bot_repository.count_bots_by_category()
 
-    # Get activity statistics
-    recent_activities = activity_repository.get_recent_activities(limit=10)
-    recent_activity_count = len(recent_activities)
+    Served from in-memory counters; see StatsCollector for how current they are.
+    """
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "uptime_seconds": time.time() - SERVICE_START_TIME,
+        **container.stats.snapshot(),
+        "interaction_index": container.interaction_index.snapshot(),
+        "activity_writer": container.activity_writer.snapshot(),
+    }
 
-    # Get system resource usage
-    cpu_percent = psutil.cpu_percent()
-    memory_info = psutil.virtual_memory()
-    disk_info = psutil.disk_usage("/")
 
+@router.get("/api-client")
+async def get_api_client_metrics():
+    """
+    Get circuit breaker state, in-flight requests, error rate and latency per endpoint class.
+    """
     return {
         "timestamp": datetime.utcnow().isoformat(),
-        "uptime_seconds": time.time() - SERVICE_START_TIME,
-        "bot_stats": {"total_bots": bot_count, "categories": bot_categories},
-        "activity_stats": {"recent_activities": recent_activity_count},
-        "system_stats": {
-            "cpu_percent": cpu_percent,
-            "memory_percent": memory_info.percent,
-            "disk_percent": disk_info.percent,
-        },
+        "endpoints": get_client_metrics(),
     }
 
 
+def _read_new_logs(source: str, cursor: str, level: str) -> Tuple[List[str], str]:
+    """
+    Get the log lines written after a follow cursor.
+
+    Args:
+        source: "file" or "memory"
+        cursor: Cursor from a previous read
+        level: Level name
+
+    Returns:
+        New lines and the cursor to continue from
+
+    Raises:
+        HTTPException: If the source is unavailable or the cursor is malformed
+    """
+    try:
+        if source == "memory":
+            buffer = _memory_buffer()
+            return buffer.since(int(cursor), level), str(buffer.last_sequence)
+        return read_since(LOG_FILE, cursor, level_filter(level))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _memory_buffer():
+    """Get the in-memory log buffer, or fail with a 404 when it is disabled."""
+    if log_buffer is None:
+        raise HTTPException(
+            status_code=404, detail="In-memory log buffer is disabled (LOG_BUFFER_SIZE)"
+        )
+    return log_buffer
+
+
 @router.get("/logs")
 async def get_logs(
     lines: int = Query(100, ge=1, le=1000),
-    level: str = Query("INFO", regex="^(DEBUG|INFO|WARNING|ERROR|CRITICAL)$"),
+    level: str = Query("INFO", regex=LEVEL_PATTERN),
+    source: str = Query("file", regex=SOURCE_PATTERN),
 ):
     """
-    Get application logs.
+    Get the last application log lines of a level.
+
+    The returned cursor can be passed to /logs/follow or /logs/stream to get
+    the lines written afterwards.
     """
-    from app.core.settings import LOG_FILE
-    import os
+    if source == "memory":
+        buffer = _memory_buffer()
+        return {
+            "logs": buffer.tail(lines, level),
+            "cursor": str(buffer.last_sequence),
+        }
 
     if not os.path.exists(LOG_FILE):
         return {"logs": [], "message": "Log file not found"}
 
     try:
-        with open(LOG_FILE, "r") as f:
-            all_lines = f.readlines()
-
-        # Filter by level if specified
-        if level:
-            filtered_lines = [line for line in all_lines if f"| {level}" in line]
-        else:
-            filtered_lines = all_lines
-
-        # Get the last N lines
-        last_lines = filtered_lines[-lines:]
-
-        return {"logs": last_lines}
+        # Taken before the tail: a follow may repeat lines written meanwhile but skips none
+        cursor = end_position(LOG_FILE)
+        last_lines = await asyncio.to_thread(tail, LOG_FILE, lines, level_filter(level))
+        return {"logs": last_lines, "cursor": cursor}
     except Exception as e:
         logger.error(f"Failed to read logs: {str(e)}")
         return {"logs": [], "error": str(e)}
+
+
+@router.get("/logs/follow")
+async def follow_logs(
+    cursor: str,
+    level: str = Query("INFO", regex=LEVEL_PATTERN),
+    source: str = Query("file", regex=SOURCE_PATTERN),
+):
+    """
+    Get the application log lines written after a cursor.
+    """
+    new_lines, cursor = await asyncio.to_thread(_read_new_logs, source, cursor, level)
+    return {"logs": new_lines, "cursor": cursor}
+
+
+@router.get("/logs/stream")
+async def stream_logs(
+    request: Request,
+    cursor: Optional[str] = None,
+    level: str = Query("INFO", regex=LEVEL_PATTERN),
+    source: str = Query("file", regex=SOURCE_PATTERN),
+):
+    """
+    Stream new application log lines as server-sent events.
+
+    Each event carries the cursor after the batch of lines it was read in as
+    its id, so a reconnecting EventSource resumes through the Last-Event-ID
+    header. Without a cursor the stream starts at the end of the log.
+    """
+    cursor = cursor or request.headers.get("last-event-id")
+    if cursor is None:
+        if source == "memory":
+            cursor = str(_memory_buffer().last_sequence)
+        else:
+            cursor = end_position(LOG_FILE)
+    # Reject a bad cursor before the response starts
+    new_lines, cursor = await asyncio.to_thread(_read_new_logs, source, cursor, level)
+
+    async def events():
+        nonlocal new_lines, cursor
+        while not await request.is_disconnected():
+            for line in new_lines:
+                yield f"id: {cursor}\ndata: {line.rstrip()}\n\n"
+            await asyncio.sleep(LOG_FOLLOW_INTERVAL)
+            new_lines, cursor = await asyncio.to_thread(
+                _read_new_logs, source, cursor, level
+            )
+
+    return StreamingResponse(events(), media_type="text/event-stream")
@@ -3,13 +3,31 @@ API client for the Blackwave C# REST API.
 Handles communication with the main C# backend.
 """
 
+import asyncio
+import time
 import aiohttp
 import json
-from typing import Dict, List, Any, Optional
-from tenacity import retry, stop_after_attempt, wait_exponential
-
-from app.core.settings import SOCIAL_NETWORK_URL, API_KEY
-from app.core.exceptions import APIError
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlencode
+from typing import AsyncIterator, Dict, List, Any, Optional, Set, Tuple
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+)
+
+from app.core.settings import (
+    SOCIAL_NETWORK_URL,
+    API_KEY,
+    API_REQUEST_TIMEOUT,
+    API_HEDGE_DELAY,
+    API_POOL_SIZE,
+    SYNC_PAGE_SIZE,
+)
+from app.core.exceptions import APIError, CircuitOpenError, RateLimitedError
+from app.clients.resilience import get_breaker, get_metrics
 
 from app.core.logging import setup_logging
 
@@ -17,6 +35,57 @@ from app.core.logging import setup_logging
 logger = setup_logging()
 
 
+# Usernames checked per request by find_usernames, keeping URLs well under 8 KB
+USERNAME_LOOKUP_BATCH = 100
+
+# Longest Retry-After a read waits for before its next attempt; longer waits
+# are left to the circuit breaker
+RETRY_AFTER_MAX = 10
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Retry only transient server/network errors and rate limits, never open circuits."""
+    return (
+        isinstance(exc, APIError)
+        and not isinstance(exc, CircuitOpenError)
+        and (exc.status_code >= 500 or isinstance(exc, RateLimitedError))
+    )
+
+
+_backoff = wait_exponential(multiplier=1, min=2, max=10)
+
+
+def _retry_wait(retry_state) -> float:
+    """Wait as long as a 429 asked for, otherwise back off exponentially."""
+    exc = retry_state.outcome.exception()
+    if isinstance(exc, RateLimitedError) and exc.retry_after is not None:
+        return min(exc.retry_after, RETRY_AFTER_MAX)
+    return _backoff(retry_state)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delay-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+read_retry = retry(
+    retry=retry_if_exception(_is_retryable),
+    stop=stop_after_attempt(3),
+    wait=_retry_wait,
+    reraise=True,
+)
+
+
 class BlackwaveAPIClient:
     """Client for interacting with the Blackwave C# REST API."""
 
@@ -32,131 +101,432 @@ class BlackwaveAPIClient:
         self.token = token
         self.session = None
 
+    async def open(self) -> None:
+        """Create the pooled HTTP session shared by all requests of this client."""
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=API_POOL_SIZE)
+            )
+
+    async def close(self) -> None:
+        """Close the HTTP session."""
+        if self.session:
+            await self.session.close()
+            self.session = None
+
     async def __aenter__(self):
         """Create session when entering context."""
-        self.session = aiohttp.ClientSession()
+        await self.open()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Close session when exiting context."""
-        if self.session:
-            await self.session.close()
-            self.session = None
+        await self.close()
 
     def _get_auth_params(self) -> Dict[str, str]:
         """Get authentication parameters for requests."""
         return {"token": self.token}
 
-    @retry(
-        stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10)
-    )
+    def _url(self, endpoint: str) -> str:
+        """Build an absolute URL for an API endpoint."""
+        return f"{self.base_url.rstrip('/')}/{endpoint}"
+
+    async def _request(
+        self, endpoint_class: str, method: str, url: str, hedge: bool = False, **kwargs
+    ) -> Tuple[int, str]:
+        """
+        Send a request and return its status and body.
+
+        Creates a temporary session when called outside the client context.
+
+        Args:
+            endpoint_class: Endpoint class used for circuit breaking and metrics
+            method: HTTP method
+            url: Request URL
+            hedge: Whether a hedged duplicate may be sent (idempotent GETs only)
+            **kwargs: Extra arguments for aiohttp
+
+        Returns:
+            Tuple of response status and response text
+        """
+        if self.session:
+            return await self._dispatch(endpoint_class, method, url, hedge, **kwargs)
+
+        async with aiohttp.ClientSession() as session:
+            self.session = session
+            try:
+                return await self._dispatch(
+                    endpoint_class, method, url, hedge, **kwargs
+                )
+            finally:
+                self.session = None
+
+    async def _dispatch(
+        self, endpoint_class: str, method: str, url: str, hedge: bool, **kwargs
+    ) -> Tuple[int, str]:
+        """Send a request, hedging it when enabled."""
+        if not hedge or API_HEDGE_DELAY <= 0:
+            return await self._send(endpoint_class, method, url, **kwargs)
+
+        primary = asyncio.create_task(self._send(endpoint_class, method, url, **kwargs))
+        pending = {primary}
+        error = None
+        try:
+            done, pending = await asyncio.wait(pending, timeout=API_HEDGE_DELAY)
+            if done:
+                return primary.result()
+
+            get_metrics(endpoint_class).hedged += 1
+            pending.add(
+                asyncio.create_task(self._send(endpoint_class, method, url, **kwargs))
+            )
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    # Prefer reporting the real upstream error over a breaker rejection
+                    if error is None or isinstance(error, CircuitOpenError):
+                        error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _send(
+        self, endpoint_class: str, method: str, url: str, **kwargs
+    ) -> Tuple[int, str]:
+        """
+        Send a single request through the endpoint's circuit breaker.
+
+        Raises:
+            CircuitOpenError: If the breaker rejects the request
+            RateLimitedError: If the API answers 429 Too Many Requests
+            APIError: If the request fails at the network level
+        """
+        breaker = get_breaker(endpoint_class)
+        metrics = get_metrics(endpoint_class)
+        if not breaker.allow_request():
+            metrics.rejected += 1
+            raise CircuitOpenError(
+                f"Circuit open for '{endpoint_class}' endpoints, failing fast"
+            )
+
+        headers = {"X-API-KEY": self.token}
+        timeout = aiohttp.ClientTimeout(total=API_REQUEST_TIMEOUT)
+        metrics.in_flight += 1
+        started = time.monotonic()
+        try:
+            async with self.session.request(
+                method, url, headers=headers, timeout=timeout, **kwargs
+            ) as response:
+                response_text = await response.text()
+                status = response.status
+                retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            breaker.record_failure()
+            metrics.record(time.monotonic() - started, ok=False)
+            raise APIError(f"API client error: {str(e) or type(e).__name__}")
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        finally:
+            metrics.in_flight -= 1
+
+        metrics.record(time.monotonic() - started, ok=status < 500 and status != 429)
+        if status == 429:
+            # Rate limited: back off like on a server error, for as long as asked
+            breaker.record_failure(retry_after)
+            raise RateLimitedError(
+                f"Rate limited on '{endpoint_class}' endpoints", retry_after
+            )
+        if status < 500:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+        return status, response_text
+
+    @read_retry
     async def get_posts(
         self, post_id: Optional[int] = None, limit: int = 25
     ) -> List[Dict[str, Any]]:
         """
-        Get posts from the API.
+        Get posts from the API in the compact representation.
 
         Args:
             post_id: Optional post ID to get a specific post
             limit: Limit for number of posts when getting all posts (default: 25)
 
         Returns:
-            List of post dictionaries
+            List of post dictionaries (id, content, date, reactions_count,
+            comments_count and user with id, username and name)
         """
         if post_id:
             # Get specific post
-            endpoint = f"api/posts/{post_id}"
-            url = f"{self.base_url.rstrip('/')}/{endpoint}"
+            url = self._url(f"api/posts/{post_id}?view=compact")
         else:
             # Get all posts with caching and limit
-            endpoint = "api/posts"
-            url = f"{self.base_url.rstrip('/')}/{endpoint}?limit={limit}"
-
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-            need_to_close = True
-        else:
-            need_to_close = False
+            url = self._url(f"api/posts?limit={limit}&view=compact")
 
         try:
-            headers = {"X-API-KEY": self.token}
-            async with self.session.get(url, headers=headers) as response:
-                response_text = await response.text()
-                if response.status == 200:
-                    try:
-                        data = json.loads(response_text)
-                        return data if isinstance(data, list) else [data]
-                    except Exception as e:
-                        logger.error(
-                            f"[API][GET_POSTS] JSON decode error: {e}, Raw: {response_text}"
-                        )
-                        raise APIError(f"Failed to decode JSON: {response_text}")
-                else:
-                    logger.error(
-                        f"[API][GET_POSTS] Error: {response.status} - {response_text}"
-                    )
-                    raise APIError(
-                        f"Failed to get posts: {response_text}", response.status
-                    )
-        except aiohttp.ClientError as e:
-            logger.error(f"Error in get_posts: {str(e)}")
-            raise APIError(f"API client error: {str(e)}")
-
-        finally:
-            if need_to_close and self.session:
-                await self.session.close()
-                self.session = None
-
-    @retry(
-        stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10)
-    )
+            status, response_text = await self._request(
+                "posts", "GET", url, hedge=True
+            )
+        except APIError as e:
+            logger.error(f"Error in get_posts: {e.message}")
+            raise
+
+        if status == 200:
+            try:
+                data = json.loads(response_text)
+                return data if isinstance(data, list) else [data]
+            except Exception as e:
+                logger.error(
+                    f"[API][GET_POSTS] JSON decode error: {e}, Raw: {response_text}"
+                )
+                raise APIError(f"Failed to decode JSON: {response_text}")
+        logger.error(f"[API][GET_POSTS] Error: {status} - {response_text}")
+        raise APIError(f"Failed to get posts: {response_text}", status)
+
+    @read_retry
     async def get_comments(self, post_id: int) -> List[Dict[str, Any]]:
         """
-        Get comments for a specific post.
+        Get comments for a specific post in the compact representation.
 
         Args:
             post_id: ID of the post to get comments for
 
         Returns:
-            List of comment dictionaries
+            List of comment dictionaries (id, content, date and user with id,
+            username and name)
         """
-        endpoint = f"api/posts/{post_id}/comments/"
-        url = f"{self.base_url.rstrip('/')}/{endpoint}"
+        url = self._url(f"api/posts/{post_id}/comments/?view=compact")
 
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-            need_to_close = True
-        else:
-            need_to_close = False
+        try:
+            status, response_text = await self._request(
+                "comments", "GET", url, hedge=True
+            )
+        except APIError as e:
+            logger.error(f"Error in get_comments: {e.message}")
+            raise
+
+        if status == 200:
+            try:
+                data = json.loads(response_text)
+                return data if isinstance(data, list) else [data]
+            except Exception as e:
+                logger.error(
+                    f"[API][GET_COMMENTS] JSON decode error: {e}, Raw: {response_text}"
+                )
+                raise APIError(f"Failed to decode JSON: {response_text}")
+        logger.error(f"[API][GET_COMMENTS] Error: {status} - {response_text}")
+        raise APIError(f"Failed to get comments: {response_text}", status)
+
+    async def _get_json(self, endpoint_class: str, endpoint: str, action: str) -> Any:
+        """
+        GET an endpoint and decode the JSON response.
+
+        Args:
+            endpoint_class: Endpoint class used for circuit breaking and metrics
+            endpoint: API endpoint path including the query string
+            action: Action name used in log and error messages (e.g. "get profiles page")
 
+        Returns:
+            Response data
+        """
+        tag = action.upper().replace(" ", "_")
         try:
-            headers = {"X-API-KEY": self.token}
-            async with self.session.get(url, headers=headers) as response:
-                response_text = await response.text()
-                if response.status == 200:
-                    try:
-                        data = json.loads(response_text)
-                        return data if isinstance(data, list) else [data]
-                    except Exception as e:
-                        logger.error(
-                            f"[API][GET_COMMENTS] JSON decode error: {e}, Raw: {response_text}"
-                        )
-                        raise APIError(f"Failed to decode JSON: {response_text}")
-                else:
-                    logger.error(
-                        f"[API][GET_COMMENTS] Error: {response.status} - {response_text}"
-                    )
-                    raise APIError(
-                        f"Failed to get comments: {response_text}", response.status
-                    )
-        except aiohttp.ClientError as e:
-            logger.error(f"Error in get_comments: {str(e)}")
-            raise APIError(f"API client error: {str(e)}")
+            status, response_text = await self._request(
+                endpoint_class, "GET", self._url(endpoint), hedge=True
+            )
+        except APIError as e:
+            logger.error(f"Error in {action.replace(' ', '_')}: {e.message}")
+            raise
+
+        if status == 200:
+            try:
+                return json.loads(response_text)
+            except Exception as e:
+                logger.error(
+                    f"[API][{tag}] JSON decode error: {e}, Raw: {response_text[:500]}"
+                )
+                raise APIError(f"Failed to decode JSON for {action}")
+        logger.error(f"[API][{tag}] Error: {status} - {response_text}")
+        raise APIError(f"Failed to {action}: {response_text}", status)
+
+    @read_retry
+    async def get_profiles_page(
+        self,
+        after: Optional[int] = None,
+        limit: int = SYNC_PAGE_SIZE,
+        is_bot: bool = True,
+        updated_since: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get one keyset page of the profile export.
 
-        finally:
-            if need_to_close and self.session:
-                await self.session.close()
-                self.session = None
+        Args:
+            after: Cursor returned with the previous page (None for the first page)
+            limit: Page size
+            is_bot: Export only bot profiles
+            updated_since: Only profiles changed since this ISO 8601 timestamp
+
+        Returns:
+            Page dictionary with keys: results, next_cursor, server_time
+        """
+        params = {"is_bot": "true" if is_bot else "false", "limit": limit}
+        if after is not None:
+            params["after"] = after
+        if updated_since:
+            params["updated_since"] = updated_since
+        return await self._get_json(
+            "profiles", f"api/profiles/export/?{urlencode(params)}", "get profiles page"
+        )
+
+    async def iter_bot_profiles(
+        self, page_size: int = SYNC_PAGE_SIZE, updated_since: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream bot profile export pages, holding a single page in memory at a time.
+
+        Args:
+            page_size: Number of profiles per page
+            updated_since: Only profiles changed since this ISO 8601 timestamp
+
+        Yields:
+            Page dictionaries with keys: results, next_cursor, server_time
+        """
+        cursor = None
+        while True:
+            page = await self.get_profiles_page(
+                after=cursor, limit=page_size, updated_since=updated_since
+            )
+            yield page
+            cursor = page.get("next_cursor")
+            if cursor is None:
+                return
+
+    @read_retry
+    async def get_usernames_page(
+        self,
+        after: Optional[int] = None,
+        limit: int = SYNC_PAGE_SIZE,
+        is_bot: Optional[bool] = None,
+        usernames: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get one keyset page of user ids and usernames.
+
+        Args:
+            after: Cursor returned with the previous page (None for the first page)
+            limit: Page size
+            is_bot: Restrict to bots (True), real users (False) or everyone (None)
+            usernames: Restrict to these usernames
+
+        Returns:
+            Page dictionary with keys: results, next_cursor and, on the first page, count
+        """
+        params = {"limit": limit}
+        if after is not None:
+            params["after"] = after
+        if is_bot is not None:
+            params["is_bot"] = "true" if is_bot else "false"
+        if usernames:
+            params["username"] = usernames
+        return await self._get_json(
+            "users",
+            f"api/users/usernames/?{urlencode(params, doseq=True)}",
+            "get usernames page",
+        )
+
+    async def iter_usernames(
+        self, page_size: int = SYNC_PAGE_SIZE, is_bot: Optional[bool] = None
+    ) -> AsyncIterator[List[str]]:
+        """
+        Stream usernames page by page.
+
+        Args:
+            page_size: Number of usernames per page
+            is_bot: Restrict to bots (True), real users (False) or everyone (None)
+
+        Yields:
+            Lists of usernames
+        """
+        cursor = None
+        while True:
+            page = await self.get_usernames_page(
+                after=cursor, limit=page_size, is_bot=is_bot
+            )
+            yield [item["username"] for item in page.get("results", [])]
+            cursor = page.get("next_cursor")
+            if cursor is None:
+                return
+
+    async def find_usernames(
+        self, names: List[str], is_bot: Optional[bool] = None
+    ) -> Set[str]:
+        """
+        Check which of the given usernames exist.
+
+        Names are looked up USERNAME_LOOKUP_BATCH at a time to keep URLs short.
+
+        Args:
+            names: Usernames to look up
+            is_bot: Restrict to bots (True), real users (False) or everyone (None)
+
+        Returns:
+            The subset of `names` that exist
+        """
+        found = set()
+        for i in range(0, len(names), USERNAME_LOOKUP_BATCH):
+            batch = names[i : i + USERNAME_LOOKUP_BATCH]
+            cursor = None
+            while True:
+                page = await self.get_usernames_page(
+                    after=cursor, limit=len(batch), is_bot=is_bot, usernames=batch
+                )
+                found.update(item["username"] for item in page.get("results", []))
+                cursor = page.get("next_cursor")
+                if cursor is None:
+                    break
+        return found
+
+    async def _post_json(
+        self, endpoint_class: str, endpoint: str, payload: Dict[str, Any], action: str
+    ) -> Dict[str, Any]:
+        """
+        POST a JSON payload and decode the JSON response.
+
+        Args:
+            endpoint_class: Endpoint class used for circuit breaking and metrics
+            endpoint: API endpoint path
+            payload: JSON payload
+            action: Action name used in log and error messages (e.g. "add bot")
+
+        Returns:
+            Response data
+        """
+        tag = action.upper().replace(" ", "_")
+        try:
+            status, response_text = await self._request(
+                endpoint_class, "POST", self._url(endpoint), json=payload
+            )
+        except APIError as e:
+            logger.error(f"Error in {action.replace(' ', '_')}: {e.message}")
+            raise
+
+        if status in (200, 201):
+            try:
+                return json.loads(response_text)
+            except Exception as e:
+                logger.error(
+                    f"[API][{tag}] JSON decode error: {e}, Raw: {response_text}"
+                )
+                raise APIError(f"Failed to decode JSON: {response_text}")
+        logger.error(f"[API][{tag}] Error: {status} - {response_text}")
+        raise APIError(f"Failed to {action}: {response_text}", status)
 
     async def add_bot(self, bot_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -168,38 +538,21 @@ class BlackwaveAPIClient:
         Returns:
             Response data
         """
-        endpoint = "api/users/"
-        url = f"{self.base_url.rstrip('/')}/{endpoint}"
+        return await self._post_json("users", "api/users/", bot_data, "add bot")
 
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-            need_to_close = True
-        else:
-            need_to_close = False
+    async def add_bots_bulk(self, bots: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Create bot users together with their profiles in a single request.
 
-        try:
-            headers = {"X-API-KEY": self.token}
-            async with self.session.post(
-                url, json=bot_data, headers=headers
-            ) as response:
-                response_text = await response.text()
-                if response.status in (200, 201):
-                    return await response.json()
-                else:
-                    logger.error(
-                        f"[API][ADD_BOT] Error: {response.status} - {response_text}"
-                    )
-                    raise APIError(
-                        f"Failed to add bot: {response_text}", response.status
-                    )
-        except aiohttp.ClientError as e:
-            logger.error(f"Error in add_bot: {str(e)}")
-            raise APIError(f"API client error: {str(e)}")
+        Args:
+            bots: Bot dictionaries with user fields and a nested "profile" dictionary
 
-        finally:
-            if need_to_close and self.session:
-                await self.session.close()
-                self.session = None
+        Returns:
+            Response data with keys: created (list of id/username), skipped (list of usernames)
+        """
+        return await self._post_json(
+            "users", "api/users/bulk/", {"bots": bots}, "add bots bulk"
+        )
 
     async def add_profile(self, profile_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -211,37 +564,9 @@ class BlackwaveAPIClient:
         Returns:
             Response data
         """
-        endpoint = "api/profiles/"
-        url = f"{self.base_url.rstrip('/')}/{endpoint}"
-
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-            need_to_close = True
-        else:
-            need_to_close = False
-
-        try:
-            headers = {"X-API-KEY": self.token}
-            async with self.session.post(
-                url, json=profile_data, headers=headers
-            ) as response:
-                response_text = await response.text()
-                if response.status in (200, 201):
-                    return await response.json()
-                else:
-                    logger.error(
-                        f"[API][ADD_PROFILE] Error: {response.status} - {response_text}"
-                    )
-                    raise APIError(
-                        f"Failed to add profile: {response_text}", response.status
-                    )
-        except aiohttp.ClientError as e:
-            logger.error(f"Error in add_profile: {str(e)}")
-            raise APIError(f"API client error: {str(e)}")
-        finally:
-            if need_to_close and self.session:
-                await self.session.close()
-                self.session = None
+        return await self._post_json(
+            "profiles", "api/profiles/", profile_data, "add profile"
+        )
 
     async def add_post(self, post_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -253,44 +578,7 @@ class BlackwaveAPIClient:
         Returns:
             Response data
         """
-        endpoint = "api/posts/"
-        url = f"{self.base_url.rstrip('/')}/{endpoint}"
-
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-            need_to_close = True
-        else:
-            need_to_close = False
-
-        try:
-            headers = {"X-API-KEY": self.token}
-            async with self.session.post(
-                url, json=post_data, headers=headers
-            ) as response:
-                response_text = await response.text()
-                if response.status in (200, 201):
-                    try:
-                        return await response.json()
-                    except Exception as e:
-                        logger.error(
-                            f"[API][ADD_POST] JSON decode error: {e}, Raw: {response_text}"
-                        )
-                        raise APIError(f"Failed to decode JSON: {response_text}")
-                else:
-                    logger.error(
-                        f"[API][ADD_POST] Error: {response.status} - {response_text}"
-                    )
-                    raise APIError(
-                        f"Failed to add post: {response_text}", response.status
-                    )
-        except Exception as e:
-            logger.error(f"Error in add_post: {str(e)}")
-            raise APIError(f"API client error: {str(e)}")
-
-        finally:
-            if need_to_close and self.session:
-                await self.session.close()
-                self.session = None
+        return await self._post_json("posts", "api/posts/", post_data, "add post")
 
     async def like_post(self, post_id: int, user_id: int) -> Dict[str, Any]:
         """
@@ -303,38 +591,12 @@ class BlackwaveAPIClient:
         Returns:
             Response status
         """
-        endpoint = f"api/posts/{post_id}/like/"
-        url = f"{self.base_url.rstrip('/')}/{endpoint}"
-
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-            need_to_close = True
-        else:
-            need_to_close = False
-
-        try:
-            headers = {"X-API-KEY": self.token}
-            async with self.session.post(
-                url, json={"user_id": user_id}, headers=headers
-            ) as response:
-                response_text = await response.text()
-                if response.status in (200, 201):
-                    return await response.json()
-                else:
-                    logger.error(
-                        f"[API][LIKE_POST] Error: {response.status} - {response_text}"
-                    )
-                    raise APIError(
-                        f"Failed to like post: {response_text}", response.status
-                    )
-        except aiohttp.ClientError as e:
-            logger.error(f"Error in like_post: {str(e)}")
-            raise APIError(f"API client error: {str(e)}")
-
-        finally:
-            if need_to_close and self.session:
-                await self.session.close()
-                self.session = None
+        return await self._post_json(
+            "reactions",
+            f"api/posts/{post_id}/like/",
+            {"user_id": user_id},
+            "like post",
+        )
 
     async def add_comment(
         self, post_id: int, comment_data: Dict[str, Any]
@@ -349,38 +611,9 @@ class BlackwaveAPIClient:
         Returns:
             Response data
         """
-        endpoint = f"api/posts/{post_id}/comments/"
-        url = f"{self.base_url.rstrip('/')}/{endpoint}"
-
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-            need_to_close = True
-        else:
-            need_to_close = False
-
-        try:
-            headers = {"X-API-KEY": self.token}
-            async with self.session.post(
-                url, json=comment_data, headers=headers
-            ) as response:
-                response_text = await response.text()
-                if response.status in (200, 201):
-                    return await response.json()
-                else:
-                    logger.error(
-                        f"[API][ADD_COMMENT] Error: {response.status} - {response_text}"
-                    )
-                    raise APIError(
-                        f"Failed to add comment: {response_text}", response.status
-                    )
-        except aiohttp.ClientError as e:
-            logger.error(f"Error in add_comment: {str(e)}")
-            raise APIError(f"API client error: {str(e)}")
-
-        finally:
-            if need_to_close and self.session:
-                await self.session.close()
-                self.session = None
+        return await self._post_json(
+            "comments", f"api/posts/{post_id}/comments/", comment_data, "add comment"
+        )
 
     async def follow_user(self, user_id: int, bot_id: int) -> Dict[str, Any]:
         """
@@ -393,38 +626,9 @@ class BlackwaveAPIClient:
         Returns:
             Response data
         """
-        # Build the endpoint and query
-        endpoint = f"api/users/{user_id}/follow/"
-        url = f"{self.base_url.rstrip('/')}/{endpoint}"
-
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-            need_to_close = True
-        else:
-            need_to_close = False
-
-        try:
-            headers = {"X-API-KEY": self.token}
-            async with self.session.post(
-                url, json={"follower_id": bot_id}, headers=headers
-            ) as response:
-                response_text = await response.text()
-                if response.status in (200, 201):
-                    return await response.json()
-                else:
-                    logger.error(
-                        f"[API][FOLLOW_USER] Error: {response.status} - {response_text}"
-                    )
-                    raise APIError(
-                        f"Failed to follow user: {response_text}", response.status
-                    )
-        except aiohttp.ClientError as e:
-            logger.error(f"Error in follow_user: {str(e)}")
-            raise APIError(f"API client error: {str(e)}")
-
-        finally:
-            if need_to_close and self.session:
-                await self.session.close()
-                self.session = None
-
-
+        return await self._post_json(
+            "users",
+            f"api/users/{user_id}/follow/",
+            {"follower_id": bot_id},
+            "follow user",
+        )
@@ -61,8 +61,8 @@ class GeminiClient(BaseLLMClient):
                 model_name=self.model, generation_config=generation_config
             )
 
-            # Generate content
-            response = model.generate_content(prompt)
+            # Generate content without blocking the event loop
+            response = await model.generate_content_async(prompt)
 
             # Extract and return text
             if response.text:
@@ -31,7 +31,7 @@ class OpenAIClient(BaseLLMClient):
         self.api_key = api_key
         self.api_base = api_base
         self.model = model
-        self.client = openai.OpenAI(api_key=self.api_key, base_url=self.api_base)
+        self.client = openai.AsyncOpenAI(api_key=self.api_key, base_url=self.api_base)
 
     async def generate_text(
         self, prompt: str, max_tokens: int = 1024, temperature: float = 0.7
@@ -48,7 +48,7 @@ class OpenAIClient(BaseLLMClient):
             Generated text
         """
         try:
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
                     {"role": "user", "content": prompt}
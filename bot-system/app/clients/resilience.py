@@ -0,0 +1,194 @@
+"""
+Resilience primitives for the BlackWave API client.
+Provides per-endpoint circuit breakers and request metrics shared by all client instances.
+"""
+
+import time
+from collections import deque
+from typing import Dict, Any, Deque, Optional, Tuple
+
+from app.core.settings import (
+    API_BREAKER_FAILURE_THRESHOLD,
+    API_BREAKER_RESET_TIMEOUT,
+    API_METRICS_WINDOW,
+)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one endpoint class.
+
+    The breaker opens after a run of consecutive failures and rejects calls until
+    the reset timeout has passed, or as long as the server asked for with
+    Retry-After. It then lets a single probe request through (half-open) and
+    closes again if that probe succeeds.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = API_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = API_BREAKER_RESET_TIMEOUT,
+    ):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            name: Endpoint class name
+            failure_threshold: Consecutive failures that open the breaker
+            reset_timeout: Seconds to stay open before allowing a probe
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures = 0
+        self.retry_at = 0.0
+        self._state = self.CLOSED
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Current breaker state, moving from open to half-open once the timeout expires."""
+        if self._state == self.OPEN and time.monotonic() >= self.retry_at:
+            self._state = self.HALF_OPEN
+        return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be sent.
+
+        Returns:
+            True if the request may proceed
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Record a successful call and close the breaker."""
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+        self._state = self.CLOSED
+
+    def record_failure(self, retry_after: Optional[float] = None) -> None:
+        """
+        Record a failed call, opening the breaker when the threshold is reached.
+
+        Args:
+            retry_after: Seconds the server asked clients to wait (Retry-After);
+                opens the breaker for that long
+        """
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if (
+            retry_after is not None
+            or self._state == self.HALF_OPEN
+            or self.consecutive_failures >= self.failure_threshold
+        ):
+            self._state = self.OPEN
+            if retry_after is None:
+                retry_after = self.reset_timeout
+            self.retry_at = time.monotonic() + retry_after
+
+    def release(self) -> None:
+        """Release a half-open probe slot without recording an outcome (e.g. on cancellation)."""
+        self._probe_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the breaker state for monitoring."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+        }
+
+
+class EndpointMetrics:
+    """Request counters and latency window for one endpoint class."""
+
+    def __init__(self, window: int = API_METRICS_WINDOW):
+        """
+        Initialize the metrics.
+
+        Args:
+            window: Number of recent requests used for error rate and latency
+        """
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.rejected = 0
+        self.hedged = 0
+        self._recent: Deque[Tuple[float, bool]] = deque(maxlen=window)
+
+    def record(self, latency: float, ok: bool) -> None:
+        """
+        Record a completed request.
+
+        Args:
+            latency: Request latency in seconds
+            ok: Whether the request succeeded
+        """
+        self.requests += 1
+        if not ok:
+            self.failures += 1
+        self._recent.append((latency, ok))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the metrics for monitoring."""
+        latencies = sorted(latency for latency, _ in self._recent)
+        errors = sum(1 for _, ok in self._recent if not ok)
+        count = len(latencies)
+        return {
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "hedged": self.hedged,
+            "error_rate": errors / count if count else 0.0,
+            "latency_avg_ms": sum(latencies) / count * 1000 if count else 0.0,
+            "latency_p95_ms": (
+                latencies[min(count - 1, int(count * 0.95))] * 1000 if count else 0.0
+            ),
+        }
+
+
+# Shared across client instances so that all bot tasks back off together
+_breakers: Dict[str, CircuitBreaker] = {}
+_metrics: Dict[str, EndpointMetrics] = {}
+
+
+def get_breaker(endpoint: str) -> CircuitBreaker:
+    """Get or create the circuit breaker for an endpoint class."""
+    if endpoint not in _breakers:
+        _breakers[endpoint] = CircuitBreaker(endpoint)
+    return _breakers[endpoint]
+
+
+def get_metrics(endpoint: str) -> EndpointMetrics:
+    """Get or create the metrics for an endpoint class."""
+    if endpoint not in _metrics:
+        _metrics[endpoint] = EndpointMetrics()
+    return _metrics[endpoint]
+
+
+def get_client_metrics() -> Dict[str, Dict[str, Any]]:
+    """
+    Get metrics and breaker state for every endpoint class seen so far.
+
+    Returns:
+        Dictionary keyed by endpoint class
+    """
+    return {
+        endpoint: {
+            **metrics.snapshot(),
+            "circuit": get_breaker(endpoint).snapshot(),
+        }
+        for endpoint, metrics in _metrics.items()
+    }
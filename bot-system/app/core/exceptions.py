@@ -3,6 +3,8 @@ Exception handling for the Blackwave Bot Service.
 Defines custom exceptions and exception handlers.
 """
 
+from typing import Optional
+
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
@@ -24,6 +26,23 @@ class APIError(BlackwaveException):
         super().__init__(message, status_code)
 
 
+class CircuitOpenError(APIError):
+    """Exception raised when a circuit breaker rejects a request without sending it."""
+
+    def __init__(self, message: str, status_code: int = 503):
+        super().__init__(message, status_code)
+
+
+class RateLimitedError(APIError):
+    """Exception raised when the API answers 429 Too Many Requests."""
+
+    def __init__(
+        self, message: str, retry_after: Optional[float] = None, status_code: int = 429
+    ):
+        super().__init__(message, status_code)
+        self.retry_after = retry_after
+
+
 class LLMError(BlackwaveException):
     """Exception raised for errors in LLM interactions."""
 
@@ -0,0 +1,322 @@
+"""
+Log reading for the Blackwave Bot Service.
+Tails, filters and follows the rotating log file without loading it into memory.
+"""
+
+import os
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Iterator, List, Optional, Tuple
+
+# Bytes read per seek when scanning a log file backwards
+TAIL_CHUNK_SIZE = 64 * 1024
+
+# Upper bound on the bytes read by one follow call
+FOLLOW_MAX_BYTES = 1024 * 1024
+
+
+def level_filter(level: Optional[str]) -> Callable[[str], bool]:
+    """
+    Build a predicate matching log lines of one level.
+
+    Args:
+        level: Level name (None matches every line)
+
+    Returns:
+        Predicate taking a log line
+    """
+    if not level:
+        return lambda line: True
+    # Text lines ("... | INFO     | ...") and JSON lines (LOG_FORMAT=json)
+    text_marker = f"| {level}"
+    json_marker = f'"level": "{level}"'
+    return lambda line: text_marker in line or json_marker in line
+
+
+def log_files(log_file: str) -> List[Path]:
+    """
+    Get the current log file followed by its rotated files, newest first.
+
+    loguru renames rotated files to "<stem>.<timestamp><suffix>" next to the
+    current file.
+
+    Args:
+        log_file: Path of the current log file
+
+    Returns:
+        Existing log files, newest first
+    """
+    path = Path(log_file)
+    rotated = [
+        p
+        for p in path.parent.glob(f"{path.stem}.*{path.suffix}")
+        if p.name != path.name
+    ]
+    rotated.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+    return ([path] if path.exists() else []) + rotated
+
+
+def _reverse_lines(path: Path, chunk_size: int = TAIL_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Yield the lines of a file from last to first, reading it backwards in chunks.
+
+    Args:
+        path: File path
+        chunk_size: Bytes read per seek
+
+    Yields:
+        Lines (with their trailing newline), last line first
+    """
+    with open(path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        remainder = b""
+        while position > 0:
+            size = min(chunk_size, position)
+            position -= size
+            f.seek(position)
+            parts = (f.read(size) + remainder).split(b"\n")
+            # The first part may continue in the previous chunk
+            remainder = parts[0]
+            for part in reversed(parts[1:]):
+                if part:
+                    yield part.decode("utf-8", errors="replace") + "\n"
+        if remainder:
+            yield remainder.decode("utf-8", errors="replace") + "\n"
+
+
+def tail(
+    log_file: str, lines: int, predicate: Callable[[str], bool] = lambda line: True
+) -> List[str]:
+    """
+    Get the last matching lines of the log, continuing into rotated files.
+
+    Reading stops as soon as enough matching lines are found, so the cost
+    depends on how far back they are rather than on the size of the log.
+
+    Args:
+        log_file: Path of the current log file
+        lines: Maximum number of lines to return
+        predicate: Filter applied to each line
+
+    Returns:
+        Matching lines in file order
+    """
+    found: List[str] = []
+    for path in log_files(log_file):
+        try:
+            for line in _reverse_lines(path):
+                if predicate(line):
+                    found.append(line)
+                    if len(found) >= lines:
+                        return found[::-1]
+        except FileNotFoundError:
+            # Removed by retention while we were reading
+            continue
+    return found[::-1]
+
+
+def encode_position(inode: int, offset: int) -> str:
+    """
+    Encode a read position as a follow cursor.
+
+    Args:
+        inode: Inode of the file being read
+        offset: Byte offset in that file
+
+    Returns:
+        Cursor string
+    """
+    return f"{inode}-{offset}"
+
+
+def decode_position(cursor: str) -> Tuple[int, int]:
+    """
+    Decode a follow cursor.
+
+    Args:
+        cursor: Cursor string
+
+    Returns:
+        (inode, offset) pair
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    inode, _, offset = cursor.partition("-")
+    inode, offset = int(inode), int(offset)
+    if inode < 0 or offset < 0:
+        raise ValueError("Malformed cursor")
+    return inode, offset
+
+
+def end_position(log_file: str) -> str:
+    """
+    Get a follow cursor pointing at the end of the current log file.
+
+    Args:
+        log_file: Path of the current log file
+
+    Returns:
+        Cursor string
+    """
+    try:
+        stat = os.stat(log_file)
+    except FileNotFoundError:
+        return encode_position(0, 0)
+    return encode_position(stat.st_ino, stat.st_size)
+
+
+def _read_lines(
+    path: Path, offset: int, max_bytes: int, complete: bool
+) -> Tuple[List[str], int]:
+    """
+    Read whole lines of a file from an offset.
+
+    Args:
+        path: File path
+        offset: Byte offset to start at
+        max_bytes: Maximum number of bytes to read
+        complete: Whether the file is no longer written (a trailing line
+            without newline is then returned as well)
+
+    Returns:
+        Lines read and the offset after the last one
+    """
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read(max_bytes)
+    at_end = len(data) < max_bytes
+    if not (complete and at_end):
+        # Keep a partially written last line for the next read, unless a
+        # single line fills the whole read
+        cut = data.rfind(b"\n") + 1
+        if cut or at_end:
+            data = data[:cut]
+    lines = [
+        line.decode("utf-8", errors="replace") + "\n"
+        for line in data.split(b"\n")
+        if line
+    ]
+    return lines, offset + len(data)
+
+
+def read_since(
+    log_file: str,
+    cursor: str,
+    predicate: Callable[[str], bool] = lambda line: True,
+    max_bytes: int = FOLLOW_MAX_BYTES,
+) -> Tuple[List[str], str]:
+    """
+    Get the log lines written after a follow cursor.
+
+    A cursor names the file by inode, so lines written just before a rotation
+    are still read from the rotated file before moving on to the new one.
+
+    Args:
+        log_file: Path of the current log file
+        cursor: Cursor returned by a previous call or by end_position()
+        predicate: Filter applied to each line
+        max_bytes: Maximum number of bytes to read
+
+    Returns:
+        Matching lines in file order and the cursor to continue from
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    inode, offset = decode_position(cursor)
+    try:
+        current = os.stat(log_file)
+    except FileNotFoundError:
+        return [], cursor
+
+    lines: List[str] = []
+    if inode != current.st_ino:
+        rotated = next(
+            (p for p in log_files(log_file)[1:] if p.stat().st_ino == inode), None
+        )
+        if rotated is not None:
+            lines, offset = _read_lines(rotated, offset, max_bytes, complete=True)
+            if offset < rotated.stat().st_size:
+                return [line for line in lines if predicate(line)], encode_position(
+                    inode, offset
+                )
+        inode, offset = current.st_ino, 0
+    elif offset > current.st_size:
+        # Truncated in place
+        offset = 0
+
+    new_lines, offset = _read_lines(Path(log_file), offset, max_bytes, complete=False)
+    lines.extend(new_lines)
+    return [line for line in lines if predicate(line)], encode_position(inode, offset)
+
+
+class RingBufferSink:
+    """
+    loguru sink keeping the most recent formatted log lines in memory.
+
+    Each line gets a sequence number, so readers can follow the buffer by
+    asking for lines after the last number they saw.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Initialize the buffer.
+
+        Args:
+            capacity: Maximum number of lines kept
+        """
+        self.capacity = capacity
+        self._lines: Deque[Tuple[int, str, str]] = deque(maxlen=capacity)
+        self._sequence = 0
+
+    def write(self, message) -> None:
+        """
+        Store a formatted log message (loguru sink interface).
+
+        Args:
+            message: loguru message
+        """
+        self._sequence += 1
+        self._lines.append((self._sequence, message.record["level"].name, message))
+
+    @property
+    def last_sequence(self) -> int:
+        """Sequence number of the newest line."""
+        return self._sequence
+
+    def tail(self, lines: int, level: Optional[str] = None) -> List[str]:
+        """
+        Get the last lines of a level.
+
+        Args:
+            lines: Maximum number of lines to return
+            level: Level name (None for every level)
+
+        Returns:
+            Lines, oldest first
+        """
+        found = []
+        for _, line_level, line in reversed(self._lines):
+            if level is None or line_level == level:
+                found.append(str(line))
+                if len(found) >= lines:
+                    break
+        return found[::-1]
+
+    def since(self, sequence: int, level: Optional[str] = None) -> List[str]:
+        """
+        Get the lines logged after a sequence number.
+
+        Args:
+            sequence: Last sequence number seen
+            level: Level name (None for every level)
+
+        Returns:
+            Lines, oldest first
+        """
+        return [
+            str(line)
+            for line_sequence, line_level, line in self._lines
+            if line_sequence > sequence and (level is None or line_level == level)
+        ]
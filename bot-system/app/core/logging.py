@@ -4,11 +4,121 @@ Sets up structured logging with loguru.
 """
 
 import sys
-import os
+import json
+import traceback
+from collections import Counter
 from pathlib import Path
 from loguru import logger
 
-from app.core.settings import LOG_LEVEL, LOG_FILE
+from app.core.settings import (
+    LOG_LEVEL,
+    LOG_LEVELS,
+    LOG_FORMAT,
+    LOG_SAMPLE_RATE,
+    LOG_FILE,
+    LOG_BUFFER_SIZE,
+)
+from app.core.log_reader import RingBufferSink
+
+# Format of the file and in-memory log lines, parsed by the /logs endpoints
+LOG_LINE_FORMAT = (
+    "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}"
+)
+CONSOLE_FORMAT = "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+
+# Recent log lines kept in memory, shared by every setup_logging() call
+log_buffer = RingBufferSink(LOG_BUFFER_SIZE) if LOG_BUFFER_SIZE > 0 else None
+
+_configured = False
+_module_levels = {}
+_sample_counts = Counter()
+
+
+def _module_level(name: str) -> int:
+    """
+    Get the minimum level number for a module.
+
+    The most specific LOG_LEVELS prefix wins; other modules use LOG_LEVEL.
+
+    Args:
+        name: Module name of the record
+
+    Returns:
+        Level number
+    """
+    level = _module_levels.get(name)
+    if level is None:
+        matches = [
+            prefix
+            for prefix in LOG_LEVELS
+            if name == prefix or name.startswith(prefix + ".")
+        ]
+        level_name = LOG_LEVELS[max(matches, key=len)] if matches else LOG_LEVEL
+        level = _module_levels[name] = logger.level(level_name).no
+    return level
+
+
+def _sample(record) -> None:
+    """
+    Mark all but one in LOG_SAMPLE_RATE records of each sampled call site as dropped.
+
+    Runs once per record, before the record is passed to the sinks.
+
+    Args:
+        record: loguru record
+    """
+    if record["extra"].get("sampled") and LOG_SAMPLE_RATE > 1:
+        key = (record["name"], record["line"])
+        count = _sample_counts[key]
+        _sample_counts[key] = count + 1
+        if count % LOG_SAMPLE_RATE:
+            record["extra"]["_dropped"] = True
+
+
+def _filter(record) -> bool:
+    """
+    Apply per-module levels and sampling.
+
+    Args:
+        record: loguru record
+
+    Returns:
+        True if the record is emitted
+    """
+    if record["extra"].get("_dropped"):
+        return False
+    return record["level"].no >= _module_level(record["name"])
+
+
+def _json_format(record) -> str:
+    """
+    Format a record as one JSON object per line.
+
+    Args:
+        record: loguru record
+
+    Returns:
+        loguru format string
+    """
+    entry = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "name": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        "message": record["message"],
+    }
+    extra = {
+        key: value
+        for key, value in record["extra"].items()
+        if key != "sampled" and not key.startswith("_")
+    }
+    if extra:
+        entry["extra"] = extra
+    if record["exception"]:
+        entry["exception"] = "".join(traceback.format_exception(*record["exception"]))
+    record["extra"]["_json"] = json.dumps(entry, default=str)
+    return "{extra[_json]}\n"
 
 
 def setup_logging():
@@ -16,29 +126,59 @@ def setup_logging():
     Configure logging for the application.
     - Console output with colors
     - File output with rotation
+    - Optional in-memory buffer of recent lines
+
+    Sinks are configured by the first call only; later calls return the
+    configured logger. Every sink writes through a queue, so log calls do not
+    block on I/O. High-frequency messages logged through a logger bound with
+    sampled=True are emitted once every LOG_SAMPLE_RATE times per call site.
     """
+    global _configured
+    if _configured:
+        return logger
+    _configured = True
+
     # Ensure log directory exists
     log_file_path = Path(LOG_FILE)
     log_file_path.parent.mkdir(parents=True, exist_ok=True)
 
     # Remove default logger
     logger.remove()
+    logger.configure(patcher=_sample)
+
+    # Sinks accept the lowest configured level; _filter applies the per-module ones
+    level = min(logger.level(name).no for name in [LOG_LEVEL, *LOG_LEVELS.values()])
+    json_output = LOG_FORMAT == "json"
 
     # Add console logger
     logger.add(
         sys.stderr,
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-        level=LOG_LEVEL,
-        colorize=True,
+        format=_json_format if json_output else CONSOLE_FORMAT,
+        level=level,
+        filter=_filter,
+        colorize=not json_output,
+        enqueue=True,
     )
 
     # Add file logger with rotation
     logger.add(
         LOG_FILE,
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-        level=LOG_LEVEL,
+        format=_json_format if json_output else LOG_LINE_FORMAT,
+        level=level,
+        filter=_filter,
         rotation="10 MB",
         retention="1 week",
+        enqueue=True,
     )
 
+    # Add in-memory buffer of recent lines
+    if log_buffer is not None:
+        logger.add(
+            log_buffer.write,
+            format=_json_format if json_output else LOG_LINE_FORMAT,
+            level=level,
+            filter=_filter,
+            enqueue=True,
+        )
+
     return logger
@@ -15,6 +15,16 @@ if env_path.exists():
 # API Configuration
 SOCIAL_NETWORK_URL = os.getenv("SOCIAL_NETWORK_URL", "")
 API_KEY = os.getenv("API_KEY", "")
+API_REQUEST_TIMEOUT = float(os.getenv("API_REQUEST_TIMEOUT", "30"))
+API_BREAKER_FAILURE_THRESHOLD = int(os.getenv("API_BREAKER_FAILURE_THRESHOLD", "5"))
+API_BREAKER_RESET_TIMEOUT = float(os.getenv("API_BREAKER_RESET_TIMEOUT", "30"))
+API_HEDGE_DELAY = float(
+    os.getenv("API_HEDGE_DELAY", "0")
+)  # seconds before a hedged GET is sent, 0 disables hedging
+API_METRICS_WINDOW = int(os.getenv("API_METRICS_WINDOW", "200"))
+API_POOL_SIZE = int(
+    os.getenv("API_POOL_SIZE", "100")
+)  # connections kept by the shared HTTP session
 
 # LLM Configuration
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY", None)
@@ -31,6 +41,12 @@ MAX_TOKENS = int(os.getenv("MAX_TOKENS", "1024"))
 
 # Database Configuration
 DB_PATH = os.getenv("DB_PATH", "data/blackwave.db")
+DB_JOURNAL_MODE = os.getenv("DB_JOURNAL_MODE", "WAL").upper()
+DB_SYNCHRONOUS = os.getenv("DB_SYNCHRONOUS", "NORMAL").upper()
+DB_CACHE_SIZE = int(
+    os.getenv("DB_CACHE_SIZE", "-20000")
+)  # pages if positive, KiB if negative (SQLite convention)
+DB_BUSY_TIMEOUT = int(os.getenv("DB_BUSY_TIMEOUT", "5000"))  # milliseconds
 
 # Qdrant Configuration
 QDRANT_HOST = os.getenv("QDRANT_HOST", None)
@@ -42,6 +58,15 @@ DAILY_BOTS_GROWTH_MIN = int(os.getenv("DAILY_BOTS_GROWTH_MIN", "20"))
 DAILY_BOTS_GROWTH_MAX = int(os.getenv("DAILY_BOTS_GROWTH_MAX", "50"))
 MAX_BOTS_COUNT = int(os.getenv("MAX_BOTS_COUNT", "5000"))
 MAX_COMMENTS_PER_POST = int(os.getenv("MAX_COMMENTS_PER_POST", "3"))
+BOT_CREATION_BATCH_SIZE = int(os.getenv("BOT_CREATION_BATCH_SIZE", "50"))
+BOT_CREATION_CONCURRENCY = int(os.getenv("BOT_CREATION_CONCURRENCY", "10"))
+SYNC_PAGE_SIZE = int(os.getenv("SYNC_PAGE_SIZE", "500"))
+SYNC_FULL_RECONCILE_INTERVAL = int(
+    os.getenv("SYNC_FULL_RECONCILE_INTERVAL", "86400")
+)  # seconds between full bot deletion reconciliations
+INTERACTION_INDEX_MAX_BOTS = int(
+    os.getenv("INTERACTION_INDEX_MAX_BOTS", "1000")
+)  # bots whose likes/follows/comments are cached in memory
 
 # Content Theme Configuration
 SOCIAL_NETWORK_THEMES = os.getenv(
@@ -57,12 +82,64 @@ THEME_DIVERSITY_LEVEL = float(
 
 # Monitoring Configuration
 MONITORING_INTERVAL = 60  # in seconds
+STATS_CACHE_TTL = float(
+    os.getenv("STATS_CACHE_TTL", "5")
+)  # seconds a /stats snapshot is reused
+STATS_REFRESH_INTERVAL = int(
+    os.getenv("STATS_REFRESH_INTERVAL", "300")
+)  # seconds between recounts of the /stats counters from the database
+ACTIVITY_FLUSH_INTERVAL = float(
+    os.getenv("ACTIVITY_FLUSH_INTERVAL", "5")
+)  # seconds between write-behind flushes of activities and last_active
+ACTIVITY_FLUSH_MAX_ROWS = int(
+    os.getenv("ACTIVITY_FLUSH_MAX_ROWS", "500")
+)  # buffered activities that trigger an early flush
+ACTIVITY_BUFFER_MAX_ROWS = int(
+    os.getenv("ACTIVITY_BUFFER_MAX_ROWS", "10000")
+)  # activities kept for retry while writes fail; the oldest are dropped beyond this
+ACTIVITY_WRITE_ATTEMPTS = int(
+    os.getenv("ACTIVITY_WRITE_ATTEMPTS", "3")
+)  # failed writes of one activity before it is dropped
+# Bots react to posts from the last REACTION_WINDOW_DAYS calendar days, today included
+REACTION_WINDOW_DAYS = 3
+# Raw likes and comments must outlive every post a bot can still react to; the
+# extra day covers the calendar-day boundary and post dates in other time zones
+MIN_ACTIVITY_RETENTION_DAYS = REACTION_WINDOW_DAYS + 1
+ACTIVITY_RETENTION_DAYS = int(
+    os.getenv("ACTIVITY_RETENTION_DAYS", "30")
+)  # raw activities older than this are compacted into daily rollups
+ACTIVITY_COMPACTION_INTERVAL = int(
+    os.getenv("ACTIVITY_COMPACTION_INTERVAL", "3600")
+)  # seconds between compaction runs
+ACTIVITY_COMPACTION_BATCH_SIZE = int(
+    os.getenv("ACTIVITY_COMPACTION_BATCH_SIZE", "5000")
+)  # raw activities compacted per transaction
+EXPORT_PAGE_SIZE = int(
+    os.getenv("EXPORT_PAGE_SIZE", "1000")
+)  # rows fetched per query by the NDJSON export endpoints
 REACTION_DELAY_MIN = float(os.getenv("REACTION_DELAY_MIN", "5"))
 REACTION_DELAY_MAX = float(os.getenv("REACTION_DELAY_MAX", "30"))
 
 # Logging Configuration
-LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()  # text or json
+LOG_LEVELS = {
+    module.strip(): level.strip().upper()
+    for module, _, level in (
+        item.partition("=") for item in os.getenv("LOG_LEVELS", "").split(",")
+    )
+    if module.strip()
+}  # per-module levels, e.g. "app.services.scheduler=WARNING,app.clients=DEBUG"
+LOG_SAMPLE_RATE = int(
+    os.getenv("LOG_SAMPLE_RATE", "10")
+)  # high-frequency tick messages are logged once every LOG_SAMPLE_RATE times
 LOG_FILE = os.getenv("LOG_FILE", "logs/blackwave.log")
+LOG_BUFFER_SIZE = int(
+    os.getenv("LOG_BUFFER_SIZE", "0")
+)  # recent log lines kept in memory for /logs?source=memory, 0 disables
+LOG_FOLLOW_INTERVAL = float(
+    os.getenv("LOG_FOLLOW_INTERVAL", "1")
+)  # seconds between checks for new lines in the /logs/stream endpoint
 
 # Bot categories and their base probabilities
 BOT_CATEGORIES = {
@@ -164,6 +241,16 @@ def validate_settings():
         errors.append("SOCIAL_NETWORK_URL is required.")
     if not API_KEY:
         errors.append("API_KEY for django is required.")
+    if API_REQUEST_TIMEOUT <= 0:
+        errors.append("API_REQUEST_TIMEOUT must be positive.")
+    if API_BREAKER_FAILURE_THRESHOLD <= 0:
+        errors.append("API_BREAKER_FAILURE_THRESHOLD must be positive.")
+    if API_BREAKER_RESET_TIMEOUT < 0 or API_HEDGE_DELAY < 0:
+        errors.append("API_BREAKER_RESET_TIMEOUT and API_HEDGE_DELAY must not be negative.")
+    if API_METRICS_WINDOW <= 0:
+        errors.append("API_METRICS_WINDOW must be positive.")
+    if API_POOL_SIZE <= 0:
+        errors.append("API_POOL_SIZE must be positive.")
     # LLM Configuration
     if DEFAULT_LLM_PROVIDER not in ("gemini", "openai", "ollama"):
         errors.append(
@@ -199,6 +286,14 @@ def validate_settings():
     # Database
     if not DB_PATH:
         errors.append("DB_PATH is required.")
+    if DB_JOURNAL_MODE not in ("WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY"):
+        errors.append(
+            "DB_JOURNAL_MODE must be one of WAL, DELETE, TRUNCATE, PERSIST, MEMORY."
+        )
+    if DB_SYNCHRONOUS not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+        errors.append("DB_SYNCHRONOUS must be one of OFF, NORMAL, FULL, EXTRA.")
+    if DB_BUSY_TIMEOUT < 0:
+        errors.append("DB_BUSY_TIMEOUT must be >= 0.")
     # Qdrant
     if not QDRANT_HOST:
         errors.append("QDRANT_HOST is required.")
@@ -211,6 +306,16 @@ def validate_settings():
         errors.append("DAILY_BOTS_GROWTH_MIN must be <= DAILY_BOTS_GROWTH_MAX.")
     if MAX_BOTS_COUNT <= 0:
         errors.append("MAX_BOTS_COUNT must be positive.")
+    if not (0 < BOT_CREATION_BATCH_SIZE <= 500):
+        errors.append("BOT_CREATION_BATCH_SIZE must be between 1 and 500.")
+    if BOT_CREATION_CONCURRENCY <= 0:
+        errors.append("BOT_CREATION_CONCURRENCY must be positive.")
+    if not (0 < SYNC_PAGE_SIZE <= 1000):
+        errors.append("SYNC_PAGE_SIZE must be between 1 and 1000.")
+    if SYNC_FULL_RECONCILE_INTERVAL <= 0:
+        errors.append("SYNC_FULL_RECONCILE_INTERVAL must be positive.")
+    if INTERACTION_INDEX_MAX_BOTS <= 0:
+        errors.append("INTERACTION_INDEX_MAX_BOTS must be positive.")
     # Monitoring
     if not isinstance(REACTION_DELAY_MIN, (int, float)) or not isinstance(
         REACTION_DELAY_MAX, (int, float)
@@ -223,11 +328,54 @@ def validate_settings():
         or not float(REACTION_DELAY_MAX).is_integer()
     ):
         errors.append("REACTION_DELAY_MIN and REACTION_DELAY_MAX must be integers.")
+    if ACTIVITY_FLUSH_INTERVAL <= 0:
+        errors.append("ACTIVITY_FLUSH_INTERVAL must be positive.")
+    if ACTIVITY_FLUSH_MAX_ROWS <= 0:
+        errors.append("ACTIVITY_FLUSH_MAX_ROWS must be positive.")
+    if ACTIVITY_BUFFER_MAX_ROWS < ACTIVITY_FLUSH_MAX_ROWS:
+        errors.append("ACTIVITY_BUFFER_MAX_ROWS must be at least ACTIVITY_FLUSH_MAX_ROWS.")
+    if ACTIVITY_WRITE_ATTEMPTS <= 0:
+        errors.append("ACTIVITY_WRITE_ATTEMPTS must be positive.")
+    if ACTIVITY_RETENTION_DAYS < MIN_ACTIVITY_RETENTION_DAYS:
+        errors.append(
+            f"ACTIVITY_RETENTION_DAYS must be at least {MIN_ACTIVITY_RETENTION_DAYS} "
+            f"(bots react to posts from the last {REACTION_WINDOW_DAYS} days)."
+        )
+    if ACTIVITY_COMPACTION_INTERVAL <= 0:
+        errors.append("ACTIVITY_COMPACTION_INTERVAL must be positive.")
+    if ACTIVITY_COMPACTION_BATCH_SIZE <= 0:
+        errors.append("ACTIVITY_COMPACTION_BATCH_SIZE must be positive.")
+    if EXPORT_PAGE_SIZE <= 0:
+        errors.append("EXPORT_PAGE_SIZE must be positive.")
+    if STATS_CACHE_TTL < 0:
+        errors.append("STATS_CACHE_TTL must not be negative.")
+    if STATS_REFRESH_INTERVAL <= 0:
+        errors.append("STATS_REFRESH_INTERVAL must be positive.")
     # Logging
     if not LOG_LEVEL:
         errors.append("LOG_LEVEL is required.")
+    log_level_names = (
+        "TRACE",
+        "DEBUG",
+        "INFO",
+        "SUCCESS",
+        "WARNING",
+        "ERROR",
+        "CRITICAL",
+    )
+    for module, level in {"LOG_LEVEL": LOG_LEVEL, **LOG_LEVELS}.items():
+        if level not in log_level_names:
+            errors.append(f"Invalid log level '{level}' for {module}.")
+    if LOG_FORMAT not in ("text", "json"):
+        errors.append("LOG_FORMAT must be 'text' or 'json'.")
+    if LOG_SAMPLE_RATE < 1:
+        errors.append("LOG_SAMPLE_RATE must be at least 1.")
     if not LOG_FILE:
         errors.append("LOG_FILE is required.")
+    if LOG_BUFFER_SIZE < 0:
+        errors.append("LOG_BUFFER_SIZE must not be negative.")
+    if LOG_FOLLOW_INTERVAL <= 0:
+        errors.append("LOG_FOLLOW_INTERVAL must be positive.")
     if errors:
         raise RuntimeError("\n".join(errors))
 
@@ -0,0 +1,54 @@
+"""
+Schema upgrades for the BlackWave Bot Service.
+Brings databases created by older versions up to the current models.
+"""
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+from app.db.session import Base
+from app.db import models  # noqa: F401  (registers the models on Base)
+from app.core.logging import setup_logging
+
+# Setup logging
+logger = setup_logging()
+
+
+def create_missing_indexes(engine: Engine) -> int:
+    """
+    Create indexes declared on the models that are missing from existing tables.
+
+    Base.metadata.create_all only creates indexes together with new tables, so
+    databases created before an index was added never get it.
+
+    Args:
+        engine: Database engine
+
+    Returns:
+        Number of indexes created
+    """
+    inspector = inspect(engine)
+    created = 0
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                logger.info(f"Creating index {index.name} on {table.name}")
+                index.create(bind=engine)
+                created += 1
+    return created
+
+
+def upgrade_schema(engine: Engine) -> None:
+    """
+    Create missing tables and indexes.
+
+    Args:
+        engine: Database engine
+    """
+    Base.metadata.create_all(bind=engine)
+    created = create_missing_indexes(engine)
+    if created:
+        logger.info(f"Schema upgrade created {created} indexes")
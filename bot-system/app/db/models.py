@@ -8,17 +8,26 @@ from sqlalchemy import (
     Column,
     Integer,
     String,
+    Date,
     Boolean,
     Float,
     DateTime,
     ForeignKey,
     Text,
     JSON,
+    Index,
+    UniqueConstraint,
+    column,
 )
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
 
+# Activity types kept as raw rows forever: follows stay dedup keys for as long
+# as the followed user exists, unlike likes and comments on posts, which bots
+# only react to while the post is recent
+RETAINED_TYPES = ("follow",)
+
 
 class Bot(Base):
     """Bot model representing an AI user in the system."""
@@ -48,24 +57,66 @@ class Bot(Base):
     activities = relationship(
         "BotActivity", back_populates="bot", cascade="all, delete-orphan"
     )
+    activity_rollups = relationship(
+        "BotActivityRollup", back_populates="bot", cascade="all, delete-orphan"
+    )
 
 
 class BotActivity(Base):
     """Record of bot activities for tracking and preventing duplicates."""
 
     __tablename__ = "bot_activities"
+    __table_args__ = (
+        # Duplicate checks and per-bot listings by type
+        Index(
+            "ix_bot_activities_bot_type_target", "bot_id", "activity_type", "target_id"
+        ),
+        # Newest-first keyset pages of a bot's activities; SQLite appends the
+        # rowid (id) to every index, so ties on created_at are ordered too
+        Index("ix_bot_activities_bot_created", "bot_id", "created_at"),
+        # Oldest-first compaction batches; leaving out the retained rows keeps
+        # every batch from stepping over the same old follows again
+        Index(
+            "ix_bot_activities_compactable",
+            "created_at",
+            sqlite_where=column("activity_type").notin_(RETAINED_TYPES),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     bot_id = Column(Integer, ForeignKey("bots.id"))
     activity_type = Column(String)  # like, comment, follow, unfollow, post
     target_id = Column(String)  # ID of the target (post ID, user ID)
     content = Column(Text, nullable=True)  # For comments
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
 
     # Relationships
     bot = relationship("Bot", back_populates="activities")
 
 
+class BotActivityRollup(Base):
+    """Daily activity counts per bot and type, kept after raw activities are compacted."""
+
+    __tablename__ = "bot_activity_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "bot_id",
+            "day",
+            "activity_type",
+            name="uq_bot_activity_rollups_bot_day_type",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    bot_id = Column(Integer, ForeignKey("bots.id"))
+    day = Column(Date, index=True)
+    activity_type = Column(String)
+    count = Column(Integer, default=0)
+
+    # Relationships
+    bot = relationship("Bot", back_populates="activity_rollups")
+
+
 class LLMConfig(Base):
     """Configuration for LLM providers."""
 
@@ -3,13 +3,19 @@ Activity repository for the Blackwave Bot Service.
 Handles database operations for bot activities.
 """
 
-from typing import List, Optional, Dict, Any
+from collections import Counter
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import func, desc, insert, or_, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
-from app.db.models import BotActivity
+from app.db.models import RETAINED_TYPES, BotActivity, BotActivityRollup
 from app.core.exceptions import DatabaseError
+from app.db.repositories.base import AsyncRepository
+
+# Activity types that count as interactions with a post or user
+INTERACTION_TYPES = ("like", "follow", "comment")
 
 
 class ActivityRepository:
@@ -47,6 +53,64 @@ class ActivityRepository:
             .all()
         )
 
+    def get_activities_before(
+        self,
+        bot_id: int,
+        before: Optional[Tuple[datetime, int]] = None,
+        limit: int = 100,
+        activity_type: Optional[str] = None,
+    ) -> List[BotActivity]:
+        """
+        Get a keyset page of a bot's activities, newest first.
+
+        Args:
+            bot_id: Bot ID
+            before: (created_at, id) of the last activity of the previous page
+            limit: Maximum number of records to return
+            activity_type: Only return activities of this type
+
+        Returns:
+            List of activities
+        """
+        query = self.db.query(BotActivity).filter(BotActivity.bot_id == bot_id)
+        if activity_type:
+            query = query.filter(BotActivity.activity_type == activity_type)
+        if before is not None:
+            query = query.filter(
+                tuple_(BotActivity.created_at, BotActivity.id) < tuple_(*before)
+            )
+        return (
+            query.order_by(desc(BotActivity.created_at), desc(BotActivity.id))
+            .limit(limit)
+            .all()
+        )
+
+    def get_activities_after(
+        self,
+        after_id: int = 0,
+        limit: int = 1000,
+        bot_id: Optional[int] = None,
+        activity_type: Optional[str] = None,
+    ) -> List[BotActivity]:
+        """
+        Get a keyset page of activities ordered by ID, for exports.
+
+        Args:
+            after_id: Return only activities with a greater ID
+            limit: Maximum number of records to return
+            bot_id: Only return activities of this bot
+            activity_type: Only return activities of this type
+
+        Returns:
+            List of activities
+        """
+        query = self.db.query(BotActivity).filter(BotActivity.id > after_id)
+        if bot_id is not None:
+            query = query.filter(BotActivity.bot_id == bot_id)
+        if activity_type:
+            query = query.filter(BotActivity.activity_type == activity_type)
+        return query.order_by(BotActivity.id).limit(limit).all()
+
     def get_activity_by_id(self, activity_id: int) -> Optional[BotActivity]:
         """
         Get an activity by ID.
@@ -82,6 +146,29 @@ class ActivityRepository:
             self.db.rollback()
             raise DatabaseError(f"Failed to create activity: {str(e)}")
 
+    def create_activities(self, activities_data: List[Dict[str, Any]]) -> int:
+        """
+        Insert a batch of activities in a single transaction.
+
+        Args:
+            activities_data: Activity data dictionaries
+
+        Returns:
+            Number of activities inserted
+
+        Raises:
+            DatabaseError: If the insert fails
+        """
+        if not activities_data:
+            return 0
+        try:
+            self.db.execute(insert(BotActivity), activities_data)
+            self.db.commit()
+            return len(activities_data)
+        except Exception as e:
+            self.db.rollback()
+            raise DatabaseError(f"Failed to create activities: {str(e)}")
+
     def delete_activity(self, activity_id: int) -> bool:
         """
         Delete an activity.
@@ -178,9 +265,36 @@ class ActivityRepository:
             is not None
         )
 
+    def get_interaction_targets(
+        self, bot_id: int, since: Optional[datetime] = None
+    ) -> List[Tuple[str, str]]:
+        """
+        Get the (activity_type, target_id) pairs of a bot's likes, follows and comments.
+
+        Args:
+            bot_id: Bot ID
+            since: Only likes and comments created from this time on (follows
+                of RETAINED_TYPES are always included); None for all
+
+        Returns:
+            List of (activity_type, target_id) tuples
+        """
+        query = self.db.query(BotActivity.activity_type, BotActivity.target_id).filter(
+            BotActivity.bot_id == bot_id,
+            BotActivity.activity_type.in_(INTERACTION_TYPES),
+        )
+        if since is not None:
+            query = query.filter(
+                or_(
+                    BotActivity.activity_type.in_(RETAINED_TYPES),
+                    BotActivity.created_at >= since,
+                )
+            )
+        return query.all()
+
     def count_activities_by_bot(self, bot_id: int) -> int:
         """
-        Count activities for a specific bot.
+        Count activities for a specific bot, including compacted ones.
 
         Args:
             bot_id: Bot ID
@@ -188,15 +302,21 @@ class ActivityRepository:
         Returns:
             Activity count
         """
-        return (
+        raw = (
             self.db.query(func.count(BotActivity.id))
             .filter(BotActivity.bot_id == bot_id)
             .scalar()
         )
+        compacted = (
+            self.db.query(func.coalesce(func.sum(BotActivityRollup.count), 0))
+            .filter(BotActivityRollup.bot_id == bot_id)
+            .scalar()
+        )
+        return raw + compacted
 
     def count_activities_by_type(self, bot_id: int, activity_type: str) -> int:
         """
-        Count activities by type for a specific bot.
+        Count activities by type for a specific bot, including compacted ones.
 
         Args:
             bot_id: Bot ID
@@ -205,13 +325,114 @@ class ActivityRepository:
         Returns:
             Activity count
         """
-        return (
+        raw = (
             self.db.query(func.count(BotActivity.id))
             .filter(
                 BotActivity.bot_id == bot_id, BotActivity.activity_type == activity_type
             )
             .scalar()
         )
+        compacted = (
+            self.db.query(func.coalesce(func.sum(BotActivityRollup.count), 0))
+            .filter(
+                BotActivityRollup.bot_id == bot_id,
+                BotActivityRollup.activity_type == activity_type,
+            )
+            .scalar()
+        )
+        return raw + compacted
+
+    def count_all_activities_by_type(self) -> Dict[str, int]:
+        """
+        Count activities of all bots by type, including compacted ones.
+
+        Returns:
+            Dictionary with activity type counts
+        """
+        counts = Counter(
+            dict(
+                self.db.query(BotActivity.activity_type, func.count(BotActivity.id))
+                .group_by(BotActivity.activity_type)
+                .all()
+            )
+        )
+        counts.update(
+            dict(
+                self.db.query(
+                    BotActivityRollup.activity_type, func.sum(BotActivityRollup.count)
+                )
+                .group_by(BotActivityRollup.activity_type)
+                .all()
+            )
+        )
+        return dict(counts)
+
+    def compact_activities(self, before: datetime, batch_size: int = 5000) -> int:
+        """
+        Fold one batch of old raw activities into daily rollups and delete them.
+
+        Rows of RETAINED_TYPES are never compacted; the batch is read from a
+        partial index without them. It is rolled up and deleted in a single
+        transaction, oldest rows first.
+
+        Args:
+            before: Activities created before this time are compacted
+            batch_size: Maximum number of activities compacted
+
+        Returns:
+            Number of activities compacted
+
+        Raises:
+            DatabaseError: If compaction fails
+        """
+        try:
+            rows = (
+                self.db.query(
+                    BotActivity.id,
+                    BotActivity.bot_id,
+                    BotActivity.activity_type,
+                    BotActivity.created_at,
+                )
+                .filter(
+                    BotActivity.created_at < before,
+                    BotActivity.activity_type.notin_(RETAINED_TYPES),
+                )
+                .order_by(BotActivity.created_at)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                return 0
+
+            counts = Counter(
+                (bot_id, activity_type, created_at.date())
+                for _, bot_id, activity_type, created_at in rows
+            )
+            stmt = sqlite_insert(BotActivityRollup).values(
+                [
+                    {
+                        "bot_id": bot_id,
+                        "activity_type": activity_type,
+                        "day": day,
+                        "count": count,
+                    }
+                    for (bot_id, activity_type, day), count in counts.items()
+                ]
+            )
+            self.db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["bot_id", "day", "activity_type"],
+                    set_={"count": BotActivityRollup.count + stmt.excluded.count},
+                )
+            )
+            self.db.query(BotActivity).filter(
+                BotActivity.id.in_([row[0] for row in rows])
+            ).delete(synchronize_session=False)
+            self.db.commit()
+            return len(rows)
+        except Exception as e:
+            self.db.rollback()
+            raise DatabaseError(f"Failed to compact activities: {str(e)}")
 
     def get_recent_activities(self, limit: int = 100) -> List[BotActivity]:
         """
@@ -229,3 +450,125 @@ class ActivityRepository:
             .limit(limit)
             .all()
         )
+
+
+class AsyncActivityRepository(AsyncRepository):
+    """Async variant of ActivityRepository."""
+
+    repository_class = ActivityRepository
+
+    async def get_activities_by_bot_id(
+        self, bot_id: int, skip: int = 0, limit: int = 100
+    ) -> List[BotActivity]:
+        """Get activities for a specific bot."""
+        return await self._run(
+            ActivityRepository.get_activities_by_bot_id, bot_id, skip, limit
+        )
+
+    async def get_activities_before(
+        self,
+        bot_id: int,
+        before: Optional[Tuple[datetime, int]] = None,
+        limit: int = 100,
+        activity_type: Optional[str] = None,
+    ) -> List[BotActivity]:
+        """Get a keyset page of a bot's activities, newest first."""
+        return await self._run(
+            ActivityRepository.get_activities_before,
+            bot_id,
+            before,
+            limit,
+            activity_type,
+        )
+
+    async def get_activities_after(
+        self,
+        after_id: int = 0,
+        limit: int = 1000,
+        bot_id: Optional[int] = None,
+        activity_type: Optional[str] = None,
+    ) -> List[BotActivity]:
+        """Get a keyset page of activities ordered by ID, for exports."""
+        return await self._run(
+            ActivityRepository.get_activities_after,
+            after_id,
+            limit,
+            bot_id,
+            activity_type,
+        )
+
+    async def get_activity_by_id(self, activity_id: int) -> Optional[BotActivity]:
+        """Get an activity by ID."""
+        return await self._run(ActivityRepository.get_activity_by_id, activity_id)
+
+    async def create_activity(self, activity_data: Dict[str, Any]) -> BotActivity:
+        """Create a new activity."""
+        return await self._run(ActivityRepository.create_activity, activity_data)
+
+    async def create_activities(self, activities_data: List[Dict[str, Any]]) -> int:
+        """Insert a batch of activities in a single transaction."""
+        return await self._run(ActivityRepository.create_activities, activities_data)
+
+    async def delete_activity(self, activity_id: int) -> bool:
+        """Delete an activity."""
+        return await self._run(ActivityRepository.delete_activity, activity_id)
+
+    async def get_activities_by_type(
+        self, bot_id: int, activity_type: str, skip: int = 0, limit: int = 100
+    ) -> List[BotActivity]:
+        """Get activities by type."""
+        return await self._run(
+            ActivityRepository.get_activities_by_type,
+            bot_id,
+            activity_type,
+            skip,
+            limit,
+        )
+
+    async def get_activities_by_target(
+        self, bot_id: int, target_id: str
+    ) -> List[BotActivity]:
+        """Get activities by target."""
+        return await self._run(
+            ActivityRepository.get_activities_by_target, bot_id, target_id
+        )
+
+    async def check_activity_exists(
+        self, bot_id: int, activity_type: str, target_id: str
+    ) -> bool:
+        """Check if an activity exists."""
+        return await self._run(
+            ActivityRepository.check_activity_exists, bot_id, activity_type, target_id
+        )
+
+    async def get_interaction_targets(
+        self, bot_id: int, since: Optional[datetime] = None
+    ) -> List[Tuple[str, str]]:
+        """Get the (activity_type, target_id) pairs of a bot's likes, follows and comments."""
+        return await self._run(
+            ActivityRepository.get_interaction_targets, bot_id, since
+        )
+
+    async def count_activities_by_bot(self, bot_id: int) -> int:
+        """Count activities for a specific bot."""
+        return await self._run(ActivityRepository.count_activities_by_bot, bot_id)
+
+    async def count_activities_by_type(self, bot_id: int, activity_type: str) -> int:
+        """Count activities by type for a specific bot."""
+        return await self._run(
+            ActivityRepository.count_activities_by_type, bot_id, activity_type
+        )
+
+    async def count_all_activities_by_type(self) -> Dict[str, int]:
+        """Count activities of all bots by type, including compacted ones."""
+        return await self._run(ActivityRepository.count_all_activities_by_type)
+
+    async def compact_activities(self, before: datetime, batch_size: int = 5000) -> int:
+        """Fold one batch of old raw activities into daily rollups and delete them."""
+        return await self._run(
+            ActivityRepository.compact_activities, before, batch_size
+        )
+
+    async def get_recent_activities(self, limit: int = 100) -> List[BotActivity]:
+        """Get recent activities across all bots."""
+        return await self._run(ActivityRepository.get_recent_activities, limit)
@@ -0,0 +1,44 @@
+"""
+Base class for async repositories of the Blackwave Bot Service.
+Runs the synchronous repositories' queries on an AsyncSession.
+"""
+
+from typing import Any, Callable, Type
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class AsyncRepository:
+    """
+    Async variant of a synchronous repository.
+
+    Queries are executed through AsyncSession.run_sync, so the repository logic is
+    shared with the synchronous variant while the SQLite I/O runs on the aiosqlite
+    worker thread instead of blocking the event loop.
+    """
+
+    repository_class: Type = None
+
+    def __init__(self, db: AsyncSession):
+        """
+        Initialize the repository.
+
+        Args:
+            db: Async database session
+        """
+        self.db = db
+
+    async def _run(self, method: Callable, *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a method of the synchronous repository on the async session.
+
+        Args:
+            method: Unbound method of the synchronous repository class
+            *args: Positional arguments for the method
+            **kwargs: Keyword arguments for the method
+
+        Returns:
+            Method result
+        """
+        return await self.db.run_sync(
+            lambda session: method(self.repository_class(session), *args, **kwargs)
+        )
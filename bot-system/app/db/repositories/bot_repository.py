@@ -3,13 +3,15 @@ Bot repository for the Blackwave Bot Service.
 Handles database operations for bots.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, update, bindparam
+from sqlalchemy.dialects.sqlite import insert
 
 from app.core.exceptions import DatabaseError
-from app.db.models import Bot
+from app.db.repositories.base import AsyncRepository
+from app.db.models import Bot, BotActivity, BotActivityRollup
 
 
 class BotRepository:
@@ -37,6 +39,25 @@ class BotRepository:
         """
         return self.db.query(Bot).offset(skip).limit(limit).all()
 
+    def get_bots_after(self, after_id: int = 0, limit: int = 100) -> List[Bot]:
+        """
+        Get a keyset page of bots ordered by ID.
+
+        Args:
+            after_id: Return only bots with a greater ID
+            limit: Maximum number of records to return
+
+        Returns:
+            List of bots
+        """
+        return (
+            self.db.query(Bot)
+            .filter(Bot.id > after_id)
+            .order_by(Bot.id)
+            .limit(limit)
+            .all()
+        )
+
     def get_bot_by_id(self, bot_id: int) -> Optional[Bot]:
         """
         Get a bot by ID.
@@ -61,6 +82,53 @@ class BotRepository:
         """
         return self.db.query(Bot).filter(Bot.name == name).first()
 
+    def get_bots_by_names(self, names: Iterable[str]) -> Dict[str, Bot]:
+        """
+        Get bots by a batch of names in a single query.
+
+        Args:
+            names: Bot names
+
+        Returns:
+            Dictionary of found bots keyed by name
+        """
+        names = list(names)
+        if not names:
+            return {}
+        return {
+            bot.name: bot for bot in self.db.query(Bot).filter(Bot.name.in_(names))
+        }
+
+    def get_bot_names_after(
+        self, after_id: int = 0, limit: int = 500
+    ) -> List[Tuple[int, str]]:
+        """
+        Get a keyset page of (id, name) pairs ordered by ID.
+
+        Args:
+            after_id: Return only bots with a greater ID
+            limit: Maximum number of records to return
+
+        Returns:
+            List of (id, name) tuples
+        """
+        return [
+            (bot_id, name)
+            for bot_id, name in self.db.query(Bot.id, Bot.name)
+            .filter(Bot.id > after_id)
+            .order_by(Bot.id)
+            .limit(limit)
+        ]
+
+    def get_all_bot_ids(self) -> List[int]:
+        """
+        Get the IDs of all bots without loading full rows.
+
+        Returns:
+            List of bot IDs
+        """
+        return [bot_id for (bot_id,) in self.db.query(Bot.id)]
+
     def create_bot(self, bot_data: Dict[str, Any]) -> Bot:
         """
         Create a new bot.
@@ -84,6 +152,63 @@ class BotRepository:
             self.db.rollback()
             raise DatabaseError(f"Failed to create bot: {str(e)}")
 
+    def create_bots(self, bots_data: List[Dict[str, Any]]) -> List[Bot]:
+        """
+        Create a batch of bots in a single transaction.
+
+        Args:
+            bots_data: Bot data dictionaries
+
+        Returns:
+            Created bots
+
+        Raises:
+            DatabaseError: If bot creation fails
+        """
+        try:
+            bots = [Bot(**bot_data) for bot_data in bots_data]
+            self.db.add_all(bots)
+            self.db.commit()
+            return bots
+        except Exception as e:
+            self.db.rollback()
+            raise DatabaseError(f"Failed to create bots: {str(e)}")
+
+    def upsert_bots(self, bots_data: List[Dict[str, Any]]) -> List[str]:
+        """
+        Insert or update a batch of bots keyed by name in a single transaction.
+
+        Args:
+            bots_data: Bot data dictionaries, each including "name"
+
+        Returns:
+            Names of the bots that did not exist before
+
+        Raises:
+            DatabaseError: If the upsert fails
+        """
+        if not bots_data:
+            return []
+        try:
+            names = [data["name"] for data in bots_data]
+            existing = {
+                name for (name,) in self.db.query(Bot.name).filter(Bot.name.in_(names))
+            }
+            statement = insert(Bot).values(bots_data)
+            update_columns = {
+                key: statement.excluded[key] for key in bots_data[0] if key != "name"
+            }
+            self.db.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[Bot.name], set_=update_columns
+                )
+            )
+            self.db.commit()
+            return [name for name in names if name not in existing]
+        except Exception as e:
+            self.db.rollback()
+            raise DatabaseError(f"Failed to upsert bots: {str(e)}")
+
     def update_bot(self, bot_id: int, bot_data: Dict[str, Any]) -> Bot:
         """
         Update a bot.
@@ -138,6 +263,39 @@ class BotRepository:
             self.db.rollback()
             raise DatabaseError(f"Failed to delete bot: {str(e)}")
 
+    def delete_bots(self, bot_ids: List[int]) -> int:
+        """
+        Delete a batch of bots, their activities and rollups in a single transaction.
+
+        Args:
+            bot_ids: Bot IDs
+
+        Returns:
+            Number of bots deleted
+
+        Raises:
+            DatabaseError: If deletion fails
+        """
+        if not bot_ids:
+            return 0
+        try:
+            self.db.query(BotActivity).filter(BotActivity.bot_id.in_(bot_ids)).delete(
+                synchronize_session=False
+            )
+            self.db.query(BotActivityRollup).filter(
+                BotActivityRollup.bot_id.in_(bot_ids)
+            ).delete(synchronize_session=False)
+            deleted = (
+                self.db.query(Bot)
+                .filter(Bot.id.in_(bot_ids))
+                .delete(synchronize_session=False)
+            )
+            self.db.commit()
+            return deleted
+        except Exception as e:
+            self.db.rollback()
+            raise DatabaseError(f"Failed to delete bots: {str(e)}")
+
     def update_last_active(self, bot_id: int) -> Bot:
         """
         Update the last active timestamp of a bot.
@@ -164,6 +322,37 @@ class BotRepository:
             self.db.rollback()
             raise DatabaseError(f"Failed to update bot last active: {str(e)}")
 
+    def set_last_active_many(self, last_active: Dict[int, datetime]) -> int:
+        """
+        Set the last active timestamp of several bots in a single transaction.
+
+        Args:
+            last_active: Mapping of bot ID to timestamp
+
+        Returns:
+            Number of bots updated
+
+        Raises:
+            DatabaseError: If the update fails
+        """
+        if not last_active:
+            return 0
+        try:
+            result = self.db.execute(
+                update(Bot.__table__)
+                .where(Bot.__table__.c.id == bindparam("bot_id"))
+                .values(last_active=bindparam("timestamp")),
+                [
+                    {"bot_id": bot_id, "timestamp": timestamp}
+                    for bot_id, timestamp in last_active.items()
+                ],
+            )
+            self.db.commit()
+            return result.rowcount
+        except Exception as e:
+            self.db.rollback()
+            raise DatabaseError(f"Failed to update bots last active: {str(e)}")
+
     def get_bots_by_category(
         self, category: str, skip: int = 0, limit: int = 100
     ) -> List[Bot]:
@@ -229,3 +418,93 @@ class BotRepository:
             self.db.query(Bot.category, func.count(Bot.id)).group_by(Bot.category).all()
         )
         return {category: count for category, count in result}
+
+
+class AsyncBotRepository(AsyncRepository):
+    """Async variant of BotRepository."""
+
+    repository_class = BotRepository
+
+    async def get_all_bots(self, skip: int = 0, limit: int = 100) -> List[Bot]:
+        """Get all bots with pagination."""
+        return await self._run(BotRepository.get_all_bots, skip, limit)
+
+    async def get_bots_after(self, after_id: int = 0, limit: int = 100) -> List[Bot]:
+        """Get a keyset page of bots ordered by ID."""
+        return await self._run(BotRepository.get_bots_after, after_id, limit)
+
+    async def get_bot_by_id(self, bot_id: int) -> Optional[Bot]:
+        """Get a bot by ID."""
+        return await self._run(BotRepository.get_bot_by_id, bot_id)
+
+    async def get_bot_by_name(self, name: str) -> Optional[Bot]:
+        """Get a bot by name."""
+        return await self._run(BotRepository.get_bot_by_name, name)
+
+    async def get_bots_by_names(self, names: Iterable[str]) -> Dict[str, Bot]:
+        """Get bots by a batch of names in a single query."""
+        return await self._run(BotRepository.get_bots_by_names, names)
+
+    async def get_bot_names_after(
+        self, after_id: int = 0, limit: int = 500
+    ) -> List[Tuple[int, str]]:
+        """Get a keyset page of (id, name) pairs ordered by ID."""
+        return await self._run(BotRepository.get_bot_names_after, after_id, limit)
+
+    async def get_all_bot_ids(self) -> List[int]:
+        """Get the IDs of all bots without loading full rows."""
+        return await self._run(BotRepository.get_all_bot_ids)
+
+    async def create_bot(self, bot_data: Dict[str, Any]) -> Bot:
+        """Create a new bot."""
+        return await self._run(BotRepository.create_bot, bot_data)
+
+    async def create_bots(self, bots_data: List[Dict[str, Any]]) -> List[Bot]:
+        """Create a batch of bots in a single transaction."""
+        return await self._run(BotRepository.create_bots, bots_data)
+
+    async def upsert_bots(self, bots_data: List[Dict[str, Any]]) -> List[str]:
+        """Insert or update a batch of bots keyed by name in a single transaction."""
+        return await self._run(BotRepository.upsert_bots, bots_data)
+
+    async def update_bot(self, bot_id: int, bot_data: Dict[str, Any]) -> Bot:
+        """Update a bot."""
+        return await self._run(BotRepository.update_bot, bot_id, bot_data)
+
+    async def delete_bot(self, bot_id: int) -> bool:
+        """Delete a bot."""
+        return await self._run(BotRepository.delete_bot, bot_id)
+
+    async def delete_bots(self, bot_ids: List[int]) -> int:
+        """Delete a batch of bots, their activities and rollups in a single transaction."""
+        return await self._run(BotRepository.delete_bots, bot_ids)
+
+    async def update_last_active(self, bot_id: int) -> Bot:
+        """Update the last active timestamp of a bot."""
+        return await self._run(BotRepository.update_last_active, bot_id)
+
+    async def set_last_active_many(self, last_active: Dict[int, datetime]) -> int:
+        """Set the last active timestamp of several bots in a single transaction."""
+        return await self._run(BotRepository.set_last_active_many, last_active)
+
+    async def get_bots_by_category(
+        self, category: str, skip: int = 0, limit: int = 100
+    ) -> List[Bot]:
+        """Get bots by category."""
+        return await self._run(
+            BotRepository.get_bots_by_category, category, skip, limit
+        )
+
+    async def get_active_bots(
+        self, hours: int = 24, skip: int = 0, limit: int = 100
+    ) -> List[Bot]:
+        """Get bots active within the last N hours."""
+        return await self._run(BotRepository.get_active_bots, hours, skip, limit)
+
+    async def count_bots(self) -> int:
+        """Count total number of bots."""
+        return await self._run(BotRepository.count_bots)
+
+    async def count_bots_by_category(self) -> Dict[str, int]:
+        """Count bots by category."""
+        return await self._run(BotRepository.count_bots_by_category)
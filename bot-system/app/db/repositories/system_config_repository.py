@@ -0,0 +1,88 @@
+"""
+System configuration repository for the Blackwave Bot Service.
+Handles database operations for system-wide key/value settings.
+"""
+
+from typing import Optional
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import DatabaseError
+from app.db.repositories.base import AsyncRepository
+from app.db.models import SystemConfig
+
+
+class SystemConfigRepository:
+    """Repository for system configuration operations."""
+
+    def __init__(self, db: Session):
+        """
+        Initialize the repository.
+
+        Args:
+            db: Database session
+        """
+        self.db = db
+
+    def get_value(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """
+        Get a configuration value.
+
+        Args:
+            key: Configuration key
+            default: Value returned when the key is not set
+
+        Returns:
+            Configuration value or default
+        """
+        config = self.db.query(SystemConfig).filter(SystemConfig.key == key).first()
+        return config.value if config else default
+
+    def set_value(
+        self, key: str, value: str, description: Optional[str] = None
+    ) -> SystemConfig:
+        """
+        Create or update a configuration value.
+
+        Args:
+            key: Configuration key
+            value: Configuration value
+            description: Optional description stored with a new key
+
+        Returns:
+            Stored configuration
+
+        Raises:
+            DatabaseError: If the update fails
+        """
+        try:
+            config = (
+                self.db.query(SystemConfig).filter(SystemConfig.key == key).first()
+            )
+            if config:
+                config.value = value
+            else:
+                config = SystemConfig(key=key, value=value, description=description)
+                self.db.add(config)
+            self.db.commit()
+            return config
+        except Exception as e:
+            self.db.rollback()
+            raise DatabaseError(f"Failed to set system config {key}: {str(e)}")
+
+
+class AsyncSystemConfigRepository(AsyncRepository):
+    """Async variant of SystemConfigRepository."""
+
+    repository_class = SystemConfigRepository
+
+    async def get_value(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Get a configuration value."""
+        return await self._run(SystemConfigRepository.get_value, key, default)
+
+    async def set_value(
+        self, key: str, value: str, description: Optional[str] = None
+    ) -> SystemConfig:
+        """Create or update a configuration value."""
+        return await self._run(
+            SystemConfigRepository.set_value, key, value, description
+        )
@@ -5,18 +5,26 @@ Sets up SQLAlchemy connection and session handling.
 
 import os
 from pathlib import Path
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-from app.core.settings import DB_PATH
+from app.core.settings import (
+    DB_PATH,
+    DB_JOURNAL_MODE,
+    DB_SYNCHRONOUS,
+    DB_CACHE_SIZE,
+    DB_BUSY_TIMEOUT,
+)
 
 # Ensure database directory exists
 db_path = Path(DB_PATH)
 db_path.parent.mkdir(parents=True, exist_ok=True)
 
-# Create SQLite database URL
+# Create SQLite database URLs
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{DB_PATH}"
+ASYNC_SQLALCHEMY_DATABASE_URL = f"sqlite+aiosqlite:///{DB_PATH}"
 
 # Create SQLAlchemy engine
 engine = create_engine(
@@ -26,8 +34,29 @@ engine = create_engine(
     max_overflow=10,  # Number of connections that can be opened beyond pool_size
 )
 
-# Create sessionmaker
+# Create async engine used by the service and API routes
+async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply journal, durability and cache pragmas to every new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={DB_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={DB_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA cache_size={DB_CACHE_SIZE}")
+    cursor.execute(f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT}")
+    cursor.close()
+
+
+for _engine in (engine, async_engine.sync_engine):
+    event.listen(_engine, "connect", _set_sqlite_pragmas)
+
+# Create sessionmakers
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects stay usable after commit: expired attributes cannot be lazy-loaded outside the async context
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
 
 # Create base class for models
 Base = declarative_base()
@@ -43,3 +72,12 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    Dependency for async database session.
+    Yields an async database session and ensures it's closed after use.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -7,17 +7,20 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.logging import setup_logging
 from app.core.exceptions import setup_exception_handlers
-from app.db.session import get_db, engine, Base, SessionLocal
+from app.db.session import engine, AsyncSessionLocal
+from app.db.migrations import upgrade_schema
 from app.services.scheduler import Scheduler
 from app.api.routes import router
-from app.core.settings import MONITORING_INTERVAL
+from app.core.settings import (
+    MONITORING_INTERVAL,
+    ACTIVITY_FLUSH_INTERVAL,
+    ACTIVITY_COMPACTION_INTERVAL,
+    STATS_REFRESH_INTERVAL,
+)
 
-from app.services.bot_manager import BotManager
-from app.services.content_generator import ContentGenerator
-from app.clients.blackwave_api import BlackwaveAPIClient
-from app.db.repositories.bot_repository import BotRepository
-from app.db.repositories.activity_repository import ActivityRepository
-from app.services.memory_service import MemoryService
+from app.services.container import ServiceContainer
+from app.db.repositories.activity_repository import AsyncActivityRepository
+from app.services.activity_retention import ActivityRetention
 
 # Setup logging
 logger = setup_logging()
@@ -36,6 +39,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Setup exception handlers
@@ -53,8 +57,12 @@ async def startup_event():
     """Initialize the application on startup."""
     logger.info("Starting BlackWave Bot Service")
 
-    # Create database tables
-    Base.metadata.create_all(bind=engine)
+    # Create database tables and any indexes missing from older databases
+    upgrade_schema(engine)
+
+    # Create shared services
+    app.state.container = ServiceContainer()
+    await app.state.container.start()
 
     # Start scheduler
     await scheduler.start()
@@ -71,9 +79,29 @@ async def shutdown_event():
     # Stop scheduler
     await scheduler.stop()
 
+    # Write buffered activities and close connections
+    await app.state.container.close()
+
+    # Drain queued log messages
+    await logger.complete()
+
 
 async def initialize_background_tasks():
     """Initialize background tasks with sequential startup, then schedule periodic tasks."""
+    # Batched activity writes run throughout, including the startup sequence
+    scheduler.schedule_task(
+        app.state.container.activity_writer.flush,
+        delay=ACTIVITY_FLUSH_INTERVAL,
+        interval=ACTIVITY_FLUSH_INTERVAL,
+        task_id="flush_activity_log",
+    )
+    # Seed the /stats counters now, then correct their drift periodically
+    scheduler.schedule_task(
+        refresh_stats_task,
+        delay=0,
+        interval=STATS_REFRESH_INTERVAL,
+        task_id="refresh_stats",
+    )
     # 1. First, synchronize with the external API
     await sync_bots_with_external_api_task()
     # 2. Then initialize bots
@@ -106,132 +134,102 @@ async def initialize_background_tasks():
         interval=MONITORING_INTERVAL,  # Every MONITORING_INTERVAL seconds
         task_id="run_due_bot_activities",
     )
+    scheduler.schedule_task(
+        compact_activities_task,
+        delay=300,  # In 5 minutes
+        interval=ACTIVITY_COMPACTION_INTERVAL,  # Every ACTIVITY_COMPACTION_INTERVAL seconds
+        task_id="compact_activities",
+    )
 
 
 # Background Task Session Management:
 # The following asynchronous functions are periodically executed as background tasks.
-# Unlike FastAPI path operations that use dependency injection (e.g., Depends(get_db)),
+# Shared services come from the application's ServiceContainer (app.state.container).
+# Unlike FastAPI path operations that use dependency injection (e.g., Depends(get_async_db)),
 # these tasks require manual database session management.
-# Each task obtains a session directly using SessionLocal() and ensures it's closed
+# Each task obtains an async session directly using AsyncSessionLocal() and ensures it's closed
 # in a try/finally block to prevent connection leaks.
 
 
 async def initialize_bots():
     """Initialize bot population."""
-    db = SessionLocal()
+    db = AsyncSessionLocal()
     try:
-        # Create services
-        content_generator = ContentGenerator()
-        api_client = BlackwaveAPIClient()
-        bot_repository = BotRepository(db)
-        activity_repository = ActivityRepository(db)
-        memory_service = MemoryService()
-
-        # Create bot manager
-        bot_manager = BotManager(
-            bot_repository=bot_repository,
-            activity_repository=activity_repository,
-            content_generator=content_generator,
-            api_client=api_client,
-            memory_service=memory_service,
-        )
-
+        bot_manager = app.state.container.bot_manager(db)
         # Initialize bots
-        async with api_client:
-            created_count = await bot_manager.initialize_bots()
-            logger.info(f"Initialized {created_count} bots")
-
+        created_count = await bot_manager.initialize_bots()
+        logger.info(f"Initialized {created_count} bots")
     except Exception as e:
         logger.error(f"Failed to initialize bots: {str(e)}")
     finally:
-        db.close()
+        await db.close()
 
 
 async def daily_bot_growth():
     """Handle daily growth of bot population."""
-    db = SessionLocal()
+    db = AsyncSessionLocal()
     try:
-        # Create services
-        content_generator = ContentGenerator()
-        api_client = BlackwaveAPIClient()
-        bot_repository = BotRepository(db)
-        activity_repository = ActivityRepository(db)
-        memory_service = MemoryService()
-
-        # Create bot manager
-        bot_manager = BotManager(
-            bot_repository=bot_repository,
-            activity_repository=activity_repository,
-            content_generator=content_generator,
-            api_client=api_client,
-            memory_service=memory_service,
-        )
-
+        bot_manager = app.state.container.bot_manager(db)
         # Handle daily growth
-        async with api_client:
-            created_count = await bot_manager.daily_growth()
-            logger.info(f"Daily growth: created {created_count} bots")
-
+        created_count = await bot_manager.daily_growth()
+        logger.info(f"Daily growth: created {created_count} bots")
     except Exception as e:
         logger.error(f"Failed to handle daily bot growth: {str(e)}")
     finally:
-        db.close()
+        await db.close()
 
 
 async def run_due_bot_activities():
     """Run due bot activities for all bots whose time has come."""
-    db = SessionLocal()
+    db = AsyncSessionLocal()
     try:
-        content_generator = ContentGenerator()
-        api_client = BlackwaveAPIClient()
-        bot_repository = BotRepository(db)
-        activity_repository = ActivityRepository(db)
-        memory_service = MemoryService()
-
-        bot_manager = BotManager(
-            bot_repository=bot_repository,
-            activity_repository=activity_repository,
-            content_generator=content_generator,
-            api_client=api_client,
-            memory_service=memory_service,
-        )
-
-        async with api_client:
-            await bot_manager.run_due_bot_activities()
-            logger.info("Ran due bot activities for all bots")
+        bot_manager = app.state.container.bot_manager(db)
+        await bot_manager.run_due_bot_activities()
+        logger.info("Ran due bot activities for all bots")
     except Exception as e:
         logger.error(f"Failed to run due bot activities: {str(e)}")
     finally:
-        db.close()
+        await db.close()
 
 
 async def sync_bots_with_external_api_task():
     """
     Background task for syncing bots with external API.
     """
-    db = SessionLocal()
+    db = AsyncSessionLocal()
     try:
-        content_generator = ContentGenerator()
-        api_client = BlackwaveAPIClient()
-        bot_repository = BotRepository(db)
-        activity_repository = ActivityRepository(db)
-        memory_service = MemoryService()
-
-        bot_manager = BotManager(
-            bot_repository=bot_repository,
-            activity_repository=activity_repository,
-            content_generator=content_generator,
-            api_client=api_client,
-            memory_service=memory_service,
-        )
-
-        async with api_client:
-            synced = await bot_manager.sync_bots_with_external_api()
-            logger.info(f"Synchronized {synced} bots with external API")
+        bot_manager = app.state.container.bot_manager(db)
+        synced = await bot_manager.sync_bots_with_external_api()
+        logger.info(f"Synchronized {synced} bots with external API")
     except Exception as e:
         logger.error(f"Failed to sync bots with external API: {str(e)}")
     finally:
-        db.close()
+        await db.close()
+
+
+async def compact_activities_task():
+    """
+    Background task for compacting old activities into daily rollups.
+    """
+    db = AsyncSessionLocal()
+    try:
+        retention = ActivityRetention(AsyncActivityRepository(db))
+        await retention.compact()
+    except Exception as e:
+        logger.error(f"Failed to compact activities: {str(e)}")
+    finally:
+        await db.close()
+
+
+async def refresh_stats_task():
+    """
+    Background task for recounting the monitoring counters from the database.
+    """
+    container = app.state.container
+    try:
+        await container.stats.refresh(container.activity_writer)
+    except Exception as e:
+        logger.error(f"Failed to refresh stats: {str(e)}")
 
 
 @app.get("/")
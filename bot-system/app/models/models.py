@@ -103,7 +103,7 @@ class ActivityCreate(ActivityBase):
 class ActivityResponse(ActivityBase):
     """Model for activity responses."""
 
-    id: int
+    id: Optional[int] = None  # None while the activity is buffered for writing
     bot_id: int
     created_at: datetime
 
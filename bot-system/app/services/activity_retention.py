@@ -0,0 +1,75 @@
+"""
+Activity retention for the BlackWave Bot Service.
+Compacts old raw bot activities into daily rollups so the activity table stays bounded.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+from app.db.repositories.activity_repository import AsyncActivityRepository
+from app.core.settings import ACTIVITY_RETENTION_DAYS, ACTIVITY_COMPACTION_BATCH_SIZE
+from app.core.logging import setup_logging
+
+# Setup logging
+logger = setup_logging()
+
+
+class ActivityRetention:
+    """Service that folds raw activities past the retention window into rollups."""
+
+    def __init__(
+        self,
+        activity_repository: AsyncActivityRepository,
+        retention_days: int = ACTIVITY_RETENTION_DAYS,
+        batch_size: int = ACTIVITY_COMPACTION_BATCH_SIZE,
+    ):
+        """
+        Initialize the retention service.
+
+        Args:
+            activity_repository: Activity repository
+            retention_days: Days raw activities are kept
+            batch_size: Raw activities compacted per transaction
+        """
+        self.activity_repository = activity_repository
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+
+    def cutoff(self, now: datetime) -> datetime:
+        """
+        Get the creation time before which raw activities are compacted.
+
+        Args:
+            now: Current UTC time
+
+        Returns:
+            Compaction cutoff
+        """
+        return now - timedelta(days=self.retention_days)
+
+    async def compact(self) -> int:
+        """
+        Compact every raw activity older than the retention window, batch by batch.
+
+        Each batch is its own short transaction, so bot ticks can write between
+        batches and a large backlog is worked off incrementally.
+
+        Returns:
+            Number of activities compacted
+        """
+        cutoff = self.cutoff(datetime.utcnow())
+        total = 0
+        while True:
+            compacted = await self.activity_repository.compact_activities(
+                cutoff, self.batch_size
+            )
+            total += compacted
+            if compacted < self.batch_size:
+                break
+            # Let other tasks use the database between batches
+            await asyncio.sleep(0)
+        if total:
+            logger.info(
+                f"Compacted {total} activities older than {self.retention_days} days"
+            )
+        return total
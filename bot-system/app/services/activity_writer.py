@@ -0,0 +1,246 @@
+"""
+Write-behind activity log for the BlackWave Bot Service.
+Buffers bot activities and last-active timestamps and writes them in periodic batches.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.core.settings import (
+    ACTIVITY_FLUSH_MAX_ROWS,
+    ACTIVITY_BUFFER_MAX_ROWS,
+    ACTIVITY_WRITE_ATTEMPTS,
+)
+from app.db.session import AsyncSessionLocal
+from app.db.repositories.activity_repository import AsyncActivityRepository
+from app.db.repositories.bot_repository import AsyncBotRepository
+from app.core.logging import setup_logging
+
+# Setup logging
+logger = setup_logging()
+
+# Failed single-row writes of a buffered activity, stripped before inserting
+ATTEMPTS_KEY = "_attempts"
+
+
+def _rows(activities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Column values of buffered activities."""
+    return [{k: v for k, v in a.items() if k != ATTEMPTS_KEY} for a in activities]
+
+
+class ActivityWriter:
+    """
+    Buffer for activity inserts and last_active updates.
+
+    Activities are appended to an in-memory log and last_active updates are
+    coalesced per bot, so repeated updates in one interval cost a single row
+    write. flush() writes everything buffered in one bulk insert and one bulk
+    update. It runs periodically, early when the log reaches max_rows, and on
+    shutdown. Readers merge the buffered rows into what they read from the
+    database (pending_activities, pending_last_active) instead of flushing.
+
+    When a batch fails, its rows are retried one by one. Rows that keep failing
+    are dropped after max_attempts writes, and at most max_buffered rows are
+    kept for retry; dropped rows are logged and counted in dropped_rows.
+    """
+
+    def __init__(
+        self,
+        max_rows: int = ACTIVITY_FLUSH_MAX_ROWS,
+        session_factory=None,
+        max_buffered: int = ACTIVITY_BUFFER_MAX_ROWS,
+        max_attempts: int = ACTIVITY_WRITE_ATTEMPTS,
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            max_rows: Buffered activities that trigger an early flush
+            session_factory: Async session factory (defaults to AsyncSessionLocal)
+            max_buffered: Activities kept for retry while writes fail
+            max_attempts: Failed writes of one activity before it is dropped
+        """
+        self.max_rows = max_rows
+        self.session_factory = session_factory or AsyncSessionLocal
+        self.max_buffered = max_buffered
+        self.max_attempts = max_attempts
+        self._activities: List[Dict[str, Any]] = []
+        self._last_active: Dict[int, datetime] = {}
+        # Rows handed to the current flush, still visible to readers until committed
+        self._flushing: List[Dict[str, Any]] = []
+        self._flushing_last_active: Dict[int, datetime] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self.flushed_rows = 0
+        self.dropped_rows = 0
+
+    def add_activity(self, activity_data: Dict[str, Any]) -> None:
+        """
+        Buffer an activity.
+
+        Args:
+            activity_data: Activity data dictionary
+        """
+        activity = dict(activity_data)
+        activity.setdefault("content", None)
+        activity.setdefault("created_at", datetime.utcnow())
+        self._activities.append(activity)
+        if len(self._activities) >= self.max_rows and (
+            self._flush_task is None or self._flush_task.done()
+        ):
+            self._flush_task = asyncio.create_task(self.flush())
+
+    def set_last_active(
+        self, bot_id: int, timestamp: Optional[datetime] = None
+    ) -> None:
+        """
+        Buffer a last_active update, replacing any earlier buffered value for the bot.
+
+        Args:
+            bot_id: Bot ID
+            timestamp: New last active time (defaults to now)
+        """
+        self._last_active[bot_id] = timestamp or datetime.utcnow()
+
+    def pending_activities(
+        self, bot_id: Optional[int] = None, activity_type: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the activities that are not yet committed, oldest first.
+
+        Args:
+            bot_id: Only activities of this bot (None for all bots)
+            activity_type: Only activities of this type
+
+        Returns:
+            Buffered activity dictionaries
+        """
+        return [
+            activity
+            for activity in self._flushing + self._activities
+            if (bot_id is None or activity["bot_id"] == bot_id)
+            and (activity_type is None or activity["activity_type"] == activity_type)
+        ]
+
+    def pending_last_active(self, bot_id: int) -> Optional[datetime]:
+        """
+        Get the last_active update of a bot that is not yet committed.
+
+        Args:
+            bot_id: Bot ID
+
+        Returns:
+            Buffered last active time, or None
+        """
+        return self._last_active.get(bot_id) or self._flushing_last_active.get(bot_id)
+
+    def discard_bot(self, bot_id: int) -> None:
+        """
+        Drop buffered writes of a deleted bot.
+
+        Args:
+            bot_id: Bot ID
+        """
+        self._activities = [a for a in self._activities if a["bot_id"] != bot_id]
+        self._last_active.pop(bot_id, None)
+
+    async def flush(self) -> int:
+        """
+        Write all buffered activities and last_active updates.
+
+        Returns:
+            Number of activities written
+        """
+        async with self._flush_lock:
+            if not self._activities and not self._last_active:
+                return 0
+            self._flushing, self._activities = self._activities, []
+            last_active, self._last_active = self._last_active, {}
+            self._flushing_last_active = last_active
+            written = 0
+            async with self.session_factory() as db:
+                activity_repository = AsyncActivityRepository(db)
+                try:
+                    written = await activity_repository.create_activities(
+                        _rows(self._flushing)
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to flush buffered activities: {str(e)}")
+                    written = await self._write_each(
+                        activity_repository, self._flushing
+                    )
+                finally:
+                    self._flushing = []
+                try:
+                    await AsyncBotRepository(db).set_last_active_many(last_active)
+                except Exception as e:
+                    logger.error(f"Failed to flush buffered last_active: {str(e)}")
+                    for bot_id, timestamp in last_active.items():
+                        self._last_active.setdefault(bot_id, timestamp)
+                finally:
+                    self._flushing_last_active = {}
+            self.flushed_rows += written
+            return written
+
+    async def _write_each(
+        self, activity_repository, activities: List[Dict[str, Any]]
+    ) -> int:
+        """
+        Retry the activities of a failed batch one by one.
+
+        A row that fails on its own is kept for the next flush until it has
+        failed max_attempts times. When a row fails before any was written, the
+        database itself is likely failing, so the rest are kept without trying.
+
+        Args:
+            activity_repository: Async activity repository of the flush
+            activities: Activities of the failed batch
+
+        Returns:
+            Number of activities written
+        """
+        written = 0
+        retry = []
+        for i, activity in enumerate(activities):
+            try:
+                written += await activity_repository.create_activities(
+                    _rows([activity])
+                )
+            except Exception as e:
+                attempts = activity.get(ATTEMPTS_KEY, 0) + 1
+                if attempts >= self.max_attempts:
+                    self._drop([activity], f"after {attempts} failed writes ({e})")
+                    continue
+                retry.append({**activity, ATTEMPTS_KEY: attempts})
+                if not written:
+                    retry.extend(activities[i + 1 :])
+                    break
+        self._requeue(retry)
+        return written
+
+    def _requeue(self, activities: List[Dict[str, Any]]) -> None:
+        """Put activities back in front of the buffer, keeping at most max_buffered."""
+        self._activities = activities + self._activities
+        overflow = len(self._activities) - self.max_buffered
+        if overflow > 0:
+            self._drop(self._activities[:overflow], "because the retry buffer is full")
+            del self._activities[:overflow]
+
+    def _drop(self, activities: List[Dict[str, Any]], reason: str) -> None:
+        """Give up on buffered activities."""
+        self.dropped_rows += len(activities)
+        logger.error(f"Dropped {len(activities)} buffered activities {reason}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get buffer sizes for monitoring."""
+        return {
+            "buffered_activities": len(self._activities) + len(self._flushing),
+            "buffered_last_active": len(self._last_active),
+            "flushed_rows": self.flushed_rows,
+            "dropped_rows": self.dropped_rows,
+        }
+
+
+# Shared by every bot manager in the process
+activity_writer = ActivityWriter()
@@ -3,19 +3,20 @@ Bot manager service for the BlackWave Bot Service.
 Handles creation, management, and scheduling of bots.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
+import calendar
 import random
-import uuid
 import datetime as dt
 from datetime import datetime, timedelta
-import aiohttp
-from sqlalchemy.exc import SQLAlchemyError
 
-from app.db.repositories.bot_repository import BotRepository
-from app.db.repositories.activity_repository import ActivityRepository
+from app.db.repositories.bot_repository import AsyncBotRepository
+from app.db.repositories.activity_repository import AsyncActivityRepository
+from app.db.repositories.system_config_repository import AsyncSystemConfigRepository
 from app.services.content_generator import ContentGenerator
 from app.utils.avatar_generator import AvatarGenerator
 from app.utils.username_generator import UsernameGenerator
+from app.utils.username_registry import UsernameRegistry, username_registry
 from app.clients.blackwave_api import BlackwaveAPIClient
 from app.core.settings import (
     BOT_CATEGORIES,
@@ -27,15 +28,30 @@ from app.core.settings import (
     BOT_PROMPTS,
     REACTION_DELAY_MIN,
     REACTION_DELAY_MAX,
+    REACTION_WINDOW_DAYS,
     MAX_COMMENTS_PER_POST,
+    BOT_CREATION_BATCH_SIZE,
+    BOT_CREATION_CONCURRENCY,
+    SYNC_PAGE_SIZE,
+    SYNC_FULL_RECONCILE_INTERVAL,
 )
+from app.db.models import Bot
 from app.models.models import BotResponse
 from app.core.exceptions import BotError
 from app.core.logging import setup_logging
 from app.services.memory_service import MemoryService
+from app.services.interaction_index import InteractionIndex, interaction_index
+from app.services.activity_writer import ActivityWriter, activity_writer
+from app.services.stats_collector import StatsCollector, stats_collector
 
 # Setup logging
 logger = setup_logging()
+# Per-bot messages of the activity loop that repeat every tick, sampled (see LOG_SAMPLE_RATE)
+tick_logger = logger.bind(sampled=True)
+
+# System config keys used by the bot synchronization
+SYNC_WATERMARK_KEY = "bots_sync_watermark"
+SYNC_LAST_FULL_KEY = "bots_sync_last_full_reconcile"
 
 
 class BotManager:
@@ -43,11 +59,16 @@ class BotManager:
 
     def __init__(
         self,
-        bot_repository: BotRepository,
-        activity_repository: ActivityRepository,
+        bot_repository: AsyncBotRepository,
+        activity_repository: AsyncActivityRepository,
         content_generator: ContentGenerator,
         api_client: BlackwaveAPIClient,
         memory_service: MemoryService,
+        config_repository: Optional[AsyncSystemConfigRepository] = None,
+        registry: Optional[UsernameRegistry] = None,
+        interactions: Optional[InteractionIndex] = None,
+        writer: Optional[ActivityWriter] = None,
+        stats: Optional[StatsCollector] = None,
     ):
         """
         Initialize the bot manager.
@@ -57,12 +78,25 @@ class BotManager:
             activity_repository: Activity repository
             content_generator: Content generator
             api_client: API client
+            memory_service: Memory service
+            config_repository: System config repository (defaults to one on the bot repository's session)
+            registry: Username registry (defaults to the process-wide registry)
+            interactions: Interaction index (defaults to the process-wide index)
+            writer: Write-behind activity log (defaults to the process-wide writer)
+            stats: Monitoring counters (defaults to the process-wide collector)
         """
         self.bot_repository = bot_repository
         self.activity_repository = activity_repository
         self.content_generator = content_generator
         self.api_client = api_client
         self.memory_service = memory_service
+        self.config_repository = config_repository or AsyncSystemConfigRepository(
+            bot_repository.db
+        )
+        self.username_registry = registry or username_registry
+        self.interaction_index = interactions or interaction_index
+        self.activity_writer = writer or activity_writer
+        self.stats = stats or stats_collector
 
     async def initialize_bots(self) -> int:
         """
@@ -71,21 +105,12 @@ class BotManager:
         Returns:
             Number of bots created
         """
-        bot_count = self.bot_repository.count_bots()
+        bot_count = await self.bot_repository.count_bots()
 
         if bot_count < INITIAL_BOTS_COUNT:
             bots_to_create = INITIAL_BOTS_COUNT - bot_count
             logger.info(f"Initializing {bots_to_create} bots")
-
-            created_count = 0
-            for _ in range(bots_to_create):
-                try:
-                    await self.create_random_bot()
-                    created_count += 1
-                except Exception as e:
-                    logger.error(f"Failed to create bot: {str(e)}")
-
-            return created_count
+            return len(await self.create_random_bots(bots_to_create))
 
         return 0
 
@@ -96,7 +121,7 @@ class BotManager:
         Returns:
             Number of bots created
         """
-        bot_count = self.bot_repository.count_bots()
+        bot_count = await self.bot_repository.count_bots()
 
         if bot_count >= MAX_BOTS_COUNT:
             logger.info(f"Maximum bot count reached: {bot_count}")
@@ -107,15 +132,7 @@ class BotManager:
 
         logger.info(f"Daily growth: creating {growth} new bots")
 
-        created_count = 0
-        for _ in range(growth):
-            try:
-                await self.create_random_bot()
-                created_count += 1
-            except Exception as e:
-                logger.error(f"Failed to create bot: {str(e)}")
-
-        return created_count
+        return len(await self.create_random_bots(growth))
 
     async def create_random_bot(self) -> Dict[str, Any]:
         """
@@ -127,17 +144,99 @@ class BotManager:
         Raises:
             BotError: If bot creation fails
         """
+        created = await self.create_random_bots(1)
+        if not created:
+            raise BotError("Failed to create random bot")
+        return created[0].__dict__
+
+    async def create_random_bots(self, count: int) -> List[Bot]:
+        """
+        Create random bots in batches.
+
+        Each batch generates names, bios and avatars concurrently (bounded by
+        BOT_CREATION_CONCURRENCY), creates all users and profiles in the external
+        API with one bulk request, and stores the batch locally in one transaction.
+
+        Args:
+            count: Number of bots to create
+
+        Returns:
+            Created bots
+        """
+        await self.username_registry.ensure_loaded(self.bot_repository, self.api_client)
+        semaphore = asyncio.Semaphore(BOT_CREATION_CONCURRENCY)
+
+        async def generate() -> Dict[str, Any]:
+            async with semaphore:
+                return await self._generate_random_bot()
+
+        created: List[Bot] = []
+        for batch_start in range(0, count, BOT_CREATION_BATCH_SIZE):
+            batch_size = min(BOT_CREATION_BATCH_SIZE, count - batch_start)
+            results = await asyncio.gather(
+                *(generate() for _ in range(batch_size)), return_exceptions=True
+            )
+            generated = []
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"Failed to generate bot: {str(result)}")
+                else:
+                    generated.append(result)
+            if not generated:
+                continue
+
+            try:
+                response = await self.api_client.add_bots_bulk(
+                    [bot["api_data"] for bot in generated]
+                )
+            except Exception as e:
+                logger.error(f"Failed to create bot batch: {str(e)}")
+                self.username_registry.release(
+                    bot["bot_data"]["name"] for bot in generated
+                )
+                continue
+
+            # Skipped names stay reserved: they are already taken in the external API
+            created_names = {item["username"] for item in response.get("created", [])}
+            for username in response.get("skipped", []):
+                logger.warning(f"Bot {username} already exists in external API")
+            try:
+                stored = await self.bot_repository.create_bots(
+                    [
+                        bot["bot_data"]
+                        for bot in generated
+                        if bot["bot_data"]["name"] in created_names
+                    ]
+                )
+                created.extend(stored)
+                self.stats.bots_added(bot.category for bot in stored)
+            except Exception as e:
+                logger.error(f"Failed to store bot batch: {str(e)}")
+
+        logger.info(f"Created {len(created)} of {count} requested bots")
+        return created
+
+    async def _generate_random_bot(self) -> Dict[str, Any]:
+        """
+        Generate attributes for a random bot.
+
+        Returns:
+            Dictionary with "bot_data" for the local database and "api_data" for the bulk API
+
+        Raises:
+            BotError: If generation fails
+        """
+        username = await UsernameGenerator.generate_username(self.username_registry)
         try:
             # Generate random attributes
             category = random.choice(list(BOT_CATEGORIES.keys()))
             gender = random.choice(["Male", "Female"])
             age = random.randint(18, 65)
 
-            # Generate unique username and description
-            username = await UsernameGenerator.generate_username(self.bot_repository)
-            full_name = await self.content_generator.generate_full_name(gender, age)
-            description = await self.content_generator.generate_bot_description(
-                category, age, gender
+            # Generate full name and description concurrently
+            full_name, description = await asyncio.gather(
+                self.content_generator.generate_full_name(gender, age),
+                self.content_generator.generate_bot_description(category, age, gender),
             )
 
             # Generate avatar
@@ -166,7 +265,6 @@ class BotManager:
             unfollow_probability = max(0.1, min(0.9, unfollow_probability))
             post_probability = max(0.0, min(0.3, post_probability))
 
-            # Create bot in local database
             bot_data = {
                 "name": username,
                 "full_name": full_name,
@@ -183,17 +281,21 @@ class BotManager:
                 "post_probability": post_probability,
             }
 
-            bot = self.bot_repository.create_bot(bot_data)
-
             # Handle names that might not have spaces safely
             name_parts = full_name.split(" ", 1)
             first_name = name_parts[0] if name_parts else "Unknown"
             last_name = name_parts[1] if len(name_parts) > 1 else ""
 
-            api_bot_data = {
+            # Random date of birth matching the age
+            birth_year = dt.datetime.utcnow().year - age
+            birth_month = random.randint(1, 12)
+            birth_day = random.randint(
+                1, calendar.monthrange(birth_year, birth_month)[1]
+            )
+            dob = dt.date(birth_year, birth_month, birth_day).isoformat()
+
+            api_data = {
                 "username": username,
-                "password": str(uuid.uuid4()),
-                "is_bot": True,
                 "first_name": first_name,
                 "last_name": last_name,
                 "category": category,
@@ -204,47 +306,42 @@ class BotManager:
                 "follow_probability": follow_probability,
                 "unfollow_probability": unfollow_probability,
                 "repost_probability": post_probability,
+                "profile": {
+                    "name": full_name,
+                    "image": avatar,
+                    "dob": dob,
+                    "bio": description or "",
+                },
             }
 
-            # Create bot in external API
-            user_response = await self.api_client.add_bot(api_bot_data)
-            user_id = user_response.get("id")
+            return {"bot_data": bot_data, "api_data": api_data}
 
-            # Create profile in external API
-            birth_year = dt.datetime.utcnow().year - age
-            birth_month = random.randint(1, 12)
-            if birth_month == 2:
-                if (birth_year % 4 == 0 and birth_year % 100 != 0) or (birth_year % 400 == 0):
-                    max_day = 29
-                else:
-                    max_day = 28
-            elif birth_month in [4, 6, 9, 11]:
-                max_day = 30
-            else:
-                max_day = 31
-            birth_day = random.randint(1, max_day)
-            dob = dt.date(birth_year, birth_month, birth_day).isoformat()
-            profile_data = {
-                "user_id": user_id,
-                "name": full_name,
-                "image": avatar,
-                "dob": dob,
-                "bio": description or "",
-            }
-            await self.api_client.add_profile(profile_data)
+        except Exception as e:
+            self.username_registry.release([username])
+            logger.error(f"Failed to generate random bot: {str(e)}")
+            raise BotError(f"Failed to generate random bot: {str(e)}")
 
-            return bot.__dict__
+    async def _record_activity(self, activity_data: Dict[str, Any]) -> None:
+        """
+        Buffer an activity for the next batched write and apply it to the interaction index.
 
-        except Exception as e:
-            logger.error(f"Failed to create random bot: {str(e)}")
-            raise BotError(f"Failed to create random bot: {str(e)}")
+        Args:
+            activity_data: Activity data
+        """
+        self.activity_writer.add_activity(activity_data)
+        self.interaction_index.record(
+            activity_data["bot_id"],
+            activity_data["activity_type"],
+            activity_data["target_id"],
+        )
+        self.stats.activity_recorded(activity_data["activity_type"])
 
     async def schedule_bot_activities(self) -> None:
         """
         Schedule activities for all bots.
         This should be called periodically to ensure bots remain active.
         """
-        bots = self.bot_repository.get_all_bots(limit=MAX_BOTS_COUNT)
+        bots = await self.bot_repository.get_all_bots(limit=MAX_BOTS_COUNT)
 
         for bot in bots:
             # Schedule next activity time
@@ -252,7 +349,7 @@ class BotManager:
             next_activity = datetime.utcnow() + timedelta(hours=hours_delay)
 
             # Update bot's last active time
-            self.bot_repository.update_bot(bot.id, {"last_active": next_activity})
+            self.activity_writer.set_last_active(bot.id, next_activity)
 
     async def process_bot_activity(self, bot_id: int) -> Dict[str, Any]:
         """
@@ -269,24 +366,25 @@ class BotManager:
         """
         try:
             bot_id_val = int(bot_id) if not isinstance(bot_id, int) else bot_id
-            bot = self.bot_repository.get_bot_by_id(bot_id_val)
+            bot = await self.bot_repository.get_bot_by_id(bot_id_val)
             if not bot:
                 raise BotError(f"Bot with ID {bot_id} not found")
 
             # Update last active time
-            self.bot_repository.update_last_active(bot_id_val)
+            self.activity_writer.set_last_active(bot_id_val)
 
             # Get recent posts
             posts = await self.api_client.get_posts()
             if not posts:
-                logger.info(
-                    f"No posts available for bot {getattr(bot, 'name', '')} to react to"
+                tick_logger.info(
+                    "No posts available for bot {} to react to",
+                    getattr(bot, "name", ""),
                 )
                 return {"status": "no_posts", "bot_id": bot_id_val}
 
-            # Filter posts from the last 3 days (including today)
+            # Filter posts from the last REACTION_WINDOW_DAYS days (including today)
             now = datetime.utcnow()
-            three_days_ago = now - timedelta(days=2)
+            window_start = now - timedelta(days=REACTION_WINDOW_DAYS - 1)
             recent_posts = []
             for post in posts:
                 on_date_str = post.get("date")
@@ -300,13 +398,15 @@ class BotManager:
                         continue
                 if (
                     post_date
-                    and three_days_ago.date() <= post_date.date() <= now.date()
+                    and window_start.date() <= post_date.date() <= now.date()
                 ):
                     recent_posts.append(post)
 
             if not recent_posts:
-                logger.info(
-                    f"No recent posts (last 3 days) for bot {getattr(bot, 'name', '')} to react to"
+                tick_logger.info(
+                    "No recent posts (last {} days) for bot {} to react to",
+                    REACTION_WINDOW_DAYS,
+                    getattr(bot, "name", ""),
                 )
                 return {"status": "no_recent_posts", "bot_id": bot_id_val}
 
@@ -338,27 +438,17 @@ class BotManager:
 
             post_info = f"Author: {author}\nDate: {date}\nText: {text}\nComments:\n{formatted_comments}\nLikes: {likes}"
 
-            # Check if bot has already interacted with this post
-            has_liked = bool(
-                self.activity_repository.check_activity_exists(
-                    bot_id_val, "like", post_id
-                )
-            )
-            comment_activities = self.activity_repository.get_activities_by_type(
-                bot_id_val, "comment", 0, 1000
-            )
-            comment_count_on_post = sum(
-                1 for a in comment_activities if str(a.target_id) == str(post_id)
+            # Check if bot has already interacted with this post and its author
+            state = await self.interaction_index.get_state(
+                self.activity_repository, bot_id_val, post_id, author_id
             )
+            has_liked = state["liked"]
+            has_followed = state["followed"]
+            comment_count_on_post = state["comment_count"]
 
             comment_probability = float(getattr(bot, "comment_probability", 0.3)) * (
                 0.5**comment_count_on_post
             )
-            has_followed = bool(
-                self.activity_repository.check_activity_exists(
-                    bot_id_val, "follow", author_id
-                )
-            )
 
             action_taken = False
 
@@ -368,7 +458,7 @@ class BotManager:
             ):
                 try:
                     await self.api_client.like_post(post_id, bot_id_val)
-                    self.activity_repository.create_activity(
+                    await self._record_activity(
                         {
                             "bot_id": bot_id_val,
                             "activity_type": "like",
@@ -406,7 +496,7 @@ class BotManager:
                         "user_id": bot_id_val,
                     }
                     await self.api_client.add_comment(post_id, comment_data)
-                    self.activity_repository.create_activity(
+                    await self._record_activity(
                         {
                             "bot_id": bot_id_val,
                             "activity_type": "comment",
@@ -430,7 +520,7 @@ class BotManager:
                 ):
                     try:
                         await self.api_client.follow_user(author_id, bot_id_val)
-                        self.activity_repository.create_activity(
+                        await self._record_activity(
                             {
                                 "bot_id": bot_id_val,
                                 "activity_type": "follow",
@@ -449,8 +539,10 @@ class BotManager:
                         logger.error(f"Failed to follow user: {str(e)}")
 
             if not action_taken:
-                logger.info(
-                    f"Bot {getattr(bot, 'name', '')} decided not to interact with post {post_id}"
+                tick_logger.info(
+                    "Bot {} decided not to interact with post {}",
+                    getattr(bot, "name", ""),
+                    post_id,
                 )
                 return {"status": "no_action", "bot_id": bot_id_val}
 
@@ -475,7 +567,7 @@ class BotManager:
         """
         try:
             bot_id_val = int(bot_id) if not isinstance(bot_id, int) else bot_id
-            bot = self.bot_repository.get_bot_by_id(bot_id_val)
+            bot = await self.bot_repository.get_bot_by_id(bot_id_val)
             if not bot:
                 raise BotError(f"Bot with ID {bot_id} not found")
 
@@ -494,7 +586,7 @@ class BotManager:
             response = await self.api_client.add_post(post_data)
 
             # Record activity
-            self.activity_repository.create_activity(
+            await self._record_activity(
                 {
                     "bot_id": bot_id_val,
                     "activity_type": "post",
@@ -516,8 +608,10 @@ class BotManager:
         Run activities for all bots whose scheduled activity time has come.
         This should be called periodically to make bots act autonomously.
         """
+        # Make buffered last_active updates visible to the due check
+        await self.activity_writer.flush()
         now = datetime.utcnow()
-        bots = self.bot_repository.get_all_bots(limit=10000)
+        bots = await self.bot_repository.get_all_bots(limit=10000)
         for bot in bots:
             last_active = getattr(bot, "last_active", None)
             if last_active is None or last_active <= now:
@@ -533,101 +627,188 @@ class BotManager:
                 # Reschedule the next activity time
                 minutes_delay = random.uniform(REACTION_DELAY_MIN, REACTION_DELAY_MAX)
                 next_activity = now + timedelta(minutes=minutes_delay)
-                self.bot_repository.update_bot(
-                    int(getattr(bot, "id")), {"last_active": next_activity}
+                self.activity_writer.set_last_active(
+                    int(getattr(bot, "id")), next_activity
                 )
 
+    @staticmethod
+    def _bot_data_from_profile(ext: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Map an exported Django profile to local bot columns.
+
+        Args:
+            ext: Profile dictionary from the profile export
+
+        Returns:
+            Bot data dictionary
+        """
+        # Calculate age from dob
+        dob = ext.get("dob")
+        age = 0
+        if dob:
+            try:
+                birth_year = int(dob.split("-")[0])
+                age = datetime.utcnow().year - birth_year
+            except Exception:
+                age = 0
+        return {
+            "name": ext["username"],
+            "full_name": ext.get("name", ""),
+            "avatar": ext.get("image", ""),
+            "age": age,
+            "gender": ext.get("gender", ""),
+            "prompt": ext.get("prompt", ""),
+            "category": ext.get("category", ""),
+            "description": ext.get("bio", ""),
+            "like_probability": ext.get("like_probability", 0.0),
+            "comment_probability": ext.get("comment_probability", 0.0),
+            "follow_probability": ext.get("follow_probability", 0.0),
+            "unfollow_probability": ext.get("unfollow_probability", 0.0),
+            "post_probability": ext.get("repost_probability", 0.0),
+        }
+
     async def sync_bots_with_external_api(self) -> int:
         """
-        Synchronize bots with the main API (fetch all bots and update local DB).
+        Synchronize bots with the main API.
+
+        Only profiles changed since the previous sync (the stored watermark) are
+        fetched and upserted in bulk, page by page. Deleted bots are detected by a
+        separate reconciliation pass that only pages through remote usernames when
+        the remote and local bot counts disagree, or when a periodic full check is due.
+
         Returns:
             Number of bots synchronized
         """
-        from app.core.settings import (
-            API_KEY as API_TOKEN,
-            SOCIAL_NETWORK_URL as API_BASE_URL,
+        watermark = await self.config_repository.get_value(SYNC_WATERMARK_KEY)
+        logger.info(
+            f"Starting {'incremental' if watermark else 'full'} bot synchronization with external API..."
         )
+        updated = 0
+        next_watermark = None
+        try:
+            async for page in self.api_client.iter_bot_profiles(
+                SYNC_PAGE_SIZE, updated_since=watermark
+            ):
+                # Taken by the server before the first page was read
+                next_watermark = next_watermark or page.get("server_time")
+                bots_data = [
+                    self._bot_data_from_profile(ext) for ext in page.get("results", [])
+                ]
+                if not bots_data:
+                    continue
+                new_names = await self.bot_repository.upsert_bots(bots_data)
+                self.username_registry.add(new_names)
+                new_name_set = set(new_names)
+                self.stats.bots_added(
+                    bot["category"] for bot in bots_data if bot["name"] in new_name_set
+                )
+                for bot in (
+                    await self.bot_repository.get_bots_by_names(new_names)
+                ).values():
+                    self.memory_service._get_bot_vector_store(int(getattr(bot, "id")))
+                updated += len(bots_data)
+        except Exception as e:
+            # The watermark only advances after a complete stream
+            logger.error(f"Error synchronizing bots from API: {str(e)}")
+            return updated
+
+        if next_watermark:
+            await self.config_repository.set_value(
+                SYNC_WATERMARK_KEY,
+                next_watermark,
+                "Server time of the last successful bot sync",
+            )
 
-        endpoint = 'api/profiles/?is_bot=true'
-        url = f"{API_BASE_URL.rstrip('/')}/{endpoint}"
-        headers = {"X-API-KEY": API_TOKEN}
-        logger.info("Starting bot synchronization with external API...")
+        last_full = await self.config_repository.get_value(SYNC_LAST_FULL_KEY)
+        full_due = not watermark or not last_full
+        if last_full:
+            try:
+                full_due = full_due or datetime.utcnow() - datetime.fromisoformat(
+                    last_full
+                ) >= timedelta(seconds=SYNC_FULL_RECONCILE_INTERVAL)
+            except ValueError:
+                full_due = True
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers) as response:
-                    if response.status != 200:
-                        logger.error(
-                            f"Failed to fetch bots from API: {response.status}"
-                        )
-                        return 0
-                    data = await response.json()
+            deleted = await self._reconcile_deleted_bots(force=full_due)
+            if full_due:
+                await self.config_repository.set_value(
+                    SYNC_LAST_FULL_KEY,
+                    datetime.utcnow().isoformat(),
+                    "Time of the last full bot deletion reconciliation",
+                )
+                await self._cleanup_orphan_collections()
         except Exception as e:
-            logger.error(f"Error fetching bots from API: {str(e)}")
-            return 0
+            logger.error(f"Failed to reconcile deleted bots: {str(e)}")
+            deleted = 0
 
-        # Build external bots dict by username
-        external_bots = {item["username"]: item for item in data}
-        local_bots = {b.name: b for b in self.bot_repository.get_all_bots(limit=10000)}
+        logger.info(
+            f"Bot synchronization with external API and local DB complete. Synced {updated} bots, removed {deleted}."
+        )
+        return updated
 
-        updated = 0
-        for username, ext in external_bots.items():
-            # Calculate age from dob
-            dob = ext.get("dob")
-            age = 0
-            if dob:
-                try:
-                    birth_year = int(dob.split("-")[0])
-                    age = datetime.utcnow().year - birth_year
-                except Exception:
-                    age = 0
-            bot_data = {
-                "name": ext["username"],
-                "full_name": ext.get("name", ""),
-                "avatar": ext.get("image", ""),
-                "age": age,
-                "gender": ext.get("gender", ""),
-                "prompt": ext.get("prompt", ""),
-                "category": ext.get("category", ""),
-                "description": ext.get("bio", ""),
-                "like_probability": ext.get("like_probability", 0.0),
-                "comment_probability": ext.get("comment_probability", 0.0),
-                "follow_probability": ext.get("follow_probability", 0.0),
-                "unfollow_probability": ext.get("unfollow_probability", 0.0),
-                "post_probability": ext.get("repost_probability", 0.0),
-            }
-            if username in local_bots:
-                try:
-                    self.bot_repository.update_bot(
-                        int(getattr(local_bots[username], "id")), bot_data
-                    )
-                    self.memory_service._get_bot_vector_store(
-                        int(getattr(local_bots[username], "id"))
-                    )
-                    updated += 1
-                except SQLAlchemyError as e:
-                    logger.error(f"Failed to update bot {username}: {str(e)}")
-            else:
-                try:
-                    new_bot = self.bot_repository.create_bot(bot_data)
-                    self.memory_service._get_bot_vector_store(
-                        int(getattr(new_bot, "id"))
-                    )
-                    updated += 1
-                except SQLAlchemyError as e:
-                    logger.error(f"Failed to create bot {username}: {str(e)}")
+    async def _reconcile_deleted_bots(self, force: bool = False) -> int:
+        """
+        Delete local bots that no longer exist in the main API.
 
-        for name, bot in local_bots.items():
-            if name not in external_bots:
-                self.bot_repository.delete_bot(int(getattr(bot, "id")))
+        Args:
+            force: Page through remote usernames even when the bot counts match
 
-        logger.info(
-            f"Bot synchronization with external API and local DB complete. Synced {updated} bots."
-        )
+        Returns:
+            Number of bots deleted
+        """
+        if not force:
+            probe = await self.api_client.get_usernames_page(limit=1, is_bot=True)
+            if probe.get("count") == await self.bot_repository.count_bots():
+                return 0
+
+        # Local bots are checked against the API one keyset page at a time
+        deleted = 0
+        after_id = 0
+        while True:
+            batch = await self.bot_repository.get_bot_names_after(
+                after_id, SYNC_PAGE_SIZE
+            )
+            if not batch:
+                break
+            after_id = batch[-1][0]
+            remote_names = await self.api_client.find_usernames(
+                [name for _, name in batch], is_bot=True
+            )
+            stale = [
+                (bot_id, name) for bot_id, name in batch if name not in remote_names
+            ]
+            if stale:
+                await self._delete_stale_bots(stale)
+                deleted += len(stale)
+        return deleted
+
+    async def _delete_stale_bots(self, stale: List[Tuple[int, str]]) -> None:
+        """
+        Delete local bots, with their cached state and memories.
+
+        Args:
+            stale: (bot_id, name) pairs of the bots to delete
+        """
+        stale_ids = [bot_id for bot_id, _ in stale]
+        await self.bot_repository.delete_bots(stale_ids)
+        self.stats.bots_removed(len(stale_ids))
+        for bot_id in stale_ids:
+            self.interaction_index.evict(bot_id)
+            self.activity_writer.discard_bot(bot_id)
+        self.username_registry.release(name for _, name in stale)
+        for bot_id in stale_ids:
+            try:
+                await self.memory_service.delete_bot_memories(bot_id)
+            except Exception as e:
+                logger.error(
+                    f"Failed to delete qDrant collection for bot_id {bot_id}: {str(e)}"
+                )
 
+    async def _cleanup_orphan_collections(self) -> None:
+        """Delete qDrant collections whose bot no longer exists in the local DB."""
         try:
             logger.info("Starting qDrant collections cleanup...")
-            local_db_bots = self.bot_repository.get_all_bots(limit=10000)
-            local_bot_ids = [int(getattr(bot, "id")) for bot in local_db_bots]
+            local_bot_ids = set(await self.bot_repository.get_all_bot_ids())
 
             qdrant_bot_ids = self.memory_service.get_all_bot_collection_names()
 
@@ -658,5 +839,3 @@ class BotManager:
             logger.error(
                 f"An error occurred during qDrant collections cleanup: {str(e)}"
             )
-
-        return updated
@@ -0,0 +1,95 @@
+"""
+Service container for the BlackWave Bot Service.
+Holds the application-scoped services shared by API routes and background tasks.
+"""
+
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import async_engine, get_async_db
+from app.db.repositories.bot_repository import AsyncBotRepository
+from app.db.repositories.activity_repository import AsyncActivityRepository
+from app.db.repositories.system_config_repository import AsyncSystemConfigRepository
+from app.services.bot_manager import BotManager
+from app.services.content_generator import ContentGenerator
+from app.services.memory_service import MemoryService
+from app.services.interaction_index import interaction_index
+from app.services.activity_writer import activity_writer
+from app.services.stats_collector import stats_collector
+from app.utils.username_registry import username_registry
+from app.clients.blackwave_api import BlackwaveAPIClient
+from app.core.logging import setup_logging
+
+# Setup logging
+logger = setup_logging()
+
+
+class ServiceContainer:
+    """
+    Application-scoped services.
+
+    The LLM client (inside the content generator), the pooled API client, the
+    memory service and the in-process indexes are created once at startup.
+    Database sessions are not shareable between concurrent tasks, so
+    repositories are bound per unit of work with bot_manager().
+    """
+
+    def __init__(self):
+        """Create the shared services."""
+        self.content_generator = ContentGenerator()
+        self.api_client = BlackwaveAPIClient()
+        self.memory_service = MemoryService()
+        self.username_registry = username_registry
+        self.interaction_index = interaction_index
+        self.activity_writer = activity_writer
+        self.stats = stats_collector
+
+    async def start(self) -> None:
+        """Open the shared HTTP connection pool."""
+        await self.api_client.open()
+
+    async def close(self) -> None:
+        """Write buffered activities and release the HTTP pool and database connections."""
+        await self.activity_writer.flush()
+        await self.api_client.close()
+        await async_engine.dispose()
+
+    def bot_manager(self, db: AsyncSession) -> BotManager:
+        """
+        Build a bot manager whose repositories use the given session.
+
+        Args:
+            db: Async database session
+
+        Returns:
+            Bot manager
+        """
+        return BotManager(
+            bot_repository=AsyncBotRepository(db),
+            activity_repository=AsyncActivityRepository(db),
+            content_generator=self.content_generator,
+            api_client=self.api_client,
+            memory_service=self.memory_service,
+            config_repository=AsyncSystemConfigRepository(db),
+            registry=self.username_registry,
+            interactions=self.interaction_index,
+            writer=self.activity_writer,
+            stats=self.stats,
+        )
+
+
+def get_container(request: Request) -> ServiceContainer:
+    """
+    Dependency for the application's service container.
+    """
+    return request.app.state.container
+
+
+def get_bot_manager(
+    db: AsyncSession = Depends(get_async_db),
+    container: ServiceContainer = Depends(get_container),
+) -> BotManager:
+    """
+    Dependency for a bot manager bound to the request's database session.
+    """
+    return container.bot_manager(db)
@@ -0,0 +1,211 @@
+"""
+Interaction index for the BlackWave Bot Service.
+Caches which posts each bot liked or commented on and which users it followed.
+"""
+
+import asyncio
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.core.settings import INTERACTION_INDEX_MAX_BOTS, MIN_ACTIVITY_RETENTION_DAYS
+from app.services.activity_writer import ActivityWriter, activity_writer
+
+
+class BotInteractions:
+    """Likes, follows and per-post comment counts of one bot."""
+
+    __slots__ = ("liked", "followed", "comments")
+
+    def __init__(self):
+        """Initialize empty interaction sets."""
+        self.liked: Set[str] = set()
+        self.followed: Set[str] = set()
+        self.comments: Dict[str, int] = {}
+
+    def add(self, activity_type: str, target_id: str) -> None:
+        """
+        Apply one activity.
+
+        Args:
+            activity_type: Activity type
+            target_id: Target ID
+        """
+        if activity_type == "like":
+            self.liked.add(target_id)
+        elif activity_type == "follow":
+            self.followed.add(target_id)
+        elif activity_type == "comment":
+            self.comments[target_id] = self.comments.get(target_id, 0) + 1
+
+
+class InteractionIndex:
+    """
+    In-process index of bot interactions used for duplicate-action checks.
+
+    A bot's interactions are loaded from bot_activities (plus rows still buffered
+    by the activity writer) the first time the bot is checked and then kept
+    current by record(). Loads read every follow but only the likes and
+    comments of the last window_days days, which cover every post a bot can
+    still react to. The least recently used bots
+    are evicted once more than max_bots are cached; an evicted bot is simply
+    reloaded on its next check.
+    """
+
+    def __init__(
+        self,
+        max_bots: int = INTERACTION_INDEX_MAX_BOTS,
+        writer: Optional[ActivityWriter] = None,
+        window_days: int = MIN_ACTIVITY_RETENTION_DAYS,
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            max_bots: Maximum number of bots kept in memory
+            writer: Activity writer whose buffered rows are merged into loads
+            window_days: Days of likes and comments read when a bot is loaded
+        """
+        self.max_bots = max_bots
+        self.writer = writer
+        self.window_days = window_days
+        self._bots: "OrderedDict[int, BotInteractions]" = OrderedDict()
+        self._loading: Dict[int, asyncio.Future] = {}
+        # Activities recorded while a bot's load query was in flight
+        self._pending: Dict[int, List[Tuple[str, str]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._bots)
+
+    async def _get(self, activity_repository, bot_id: int) -> BotInteractions:
+        """
+        Get a bot's interactions, loading them on first use.
+
+        Args:
+            activity_repository: Async activity repository used to load the bot
+            bot_id: Bot ID
+
+        Returns:
+            Bot interactions
+        """
+        interactions = self._bots.get(bot_id)
+        if interactions is not None:
+            self._bots.move_to_end(bot_id)
+            self.hits += 1
+            return interactions
+
+        loading = self._loading.get(bot_id)
+        if loading is not None:
+            return await asyncio.shield(loading)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._loading[bot_id] = future
+        self._pending[bot_id] = []
+        try:
+            # Snapshot the writer's buffer before querying: a row flushed while
+            # the query runs may be missing from its result, and it is no longer
+            # buffered afterwards.
+            buffered = (
+                self.writer.pending_activities(bot_id)
+                if self.writer is not None
+                else []
+            )
+            since = datetime.utcnow() - timedelta(days=self.window_days)
+            targets = await activity_repository.get_interaction_targets(bot_id, since)
+            interactions = BotInteractions()
+            for activity_type, target_id in targets:
+                interactions.add(activity_type, str(target_id))
+            for activity in buffered:
+                interactions.add(activity["activity_type"], str(activity["target_id"]))
+            # Rows committed after the load query started may be missing from it.
+            # Replaying them (like merging the writer's buffer) can only overcount
+            # comments, which errs on the safe side.
+            for activity_type, target_id in self._pending[bot_id]:
+                interactions.add(activity_type, target_id)
+            self._store(bot_id, interactions)
+            future.set_result(interactions)
+            return interactions
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else is waiting
+            future.exception()
+            raise
+        finally:
+            del self._loading[bot_id]
+            del self._pending[bot_id]
+
+    def _store(self, bot_id: int, interactions: BotInteractions) -> None:
+        """Cache a bot's interactions, evicting the least recently used bots."""
+        self._bots[bot_id] = interactions
+        self._bots.move_to_end(bot_id)
+        while len(self._bots) > self.max_bots:
+            self._bots.popitem(last=False)
+
+    async def get_state(
+        self,
+        activity_repository,
+        bot_id: int,
+        post_id: Any,
+        author_id: Optional[Any] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get what a bot has already done with a post and its author.
+
+        Args:
+            activity_repository: Async activity repository used on a cache miss
+            bot_id: Bot ID
+            post_id: Post ID
+            author_id: Post author's user ID (None to skip the follow check)
+
+        Returns:
+            Dictionary with "liked", "followed" and "comment_count"
+        """
+        interactions = await self._get(activity_repository, bot_id)
+        post_id = str(post_id)
+        return {
+            "liked": post_id in interactions.liked,
+            "followed": author_id is not None
+            and str(author_id) in interactions.followed,
+            "comment_count": interactions.comments.get(post_id, 0),
+        }
+
+    def record(self, bot_id: int, activity_type: str, target_id: Any) -> None:
+        """
+        Apply a newly stored activity to the index.
+
+        Args:
+            bot_id: Bot ID
+            activity_type: Activity type
+            target_id: Target ID
+        """
+        target_id = str(target_id)
+        interactions = self._bots.get(bot_id)
+        if interactions is not None:
+            interactions.add(activity_type, target_id)
+        elif bot_id in self._pending:
+            self._pending[bot_id].append((activity_type, target_id))
+
+    def evict(self, bot_id: int) -> None:
+        """
+        Drop a bot from the index (e.g. after it was deleted).
+
+        Args:
+            bot_id: Bot ID
+        """
+        self._bots.pop(bot_id, None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the index size and hit counters for monitoring."""
+        return {
+            "bots": len(self._bots),
+            "max_bots": self.max_bots,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Shared by every bot manager in the process
+interaction_index = InteractionIndex(writer=activity_writer)
@@ -11,6 +11,8 @@ from app.core.logging import setup_logging
 
 # Setup logging
 logger = setup_logging()
+# Per-tick messages, sampled (see LOG_SAMPLE_RATE)
+tick_logger = logger.bind(sampled=True)
 
 
 class Scheduler:
@@ -82,9 +84,9 @@ class Scheduler:
             task: Task data
         """
         try:
-            logger.debug(f"Executing task {task_id}")
+            tick_logger.debug("Executing task {}", task_id)
             await task["callback"](*task["args"], **task["kwargs"])
-            logger.debug(f"Task {task_id} completed")
+            tick_logger.debug("Task {} completed", task_id)
         except Exception as e:
             logger.error(f"Error executing task {task_id}: {str(e)}")
 
@@ -0,0 +1,176 @@
+"""
+Statistics collector for the BlackWave Bot Service.
+Keeps bot and activity counters current in memory so /stats does not query the database.
+"""
+
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+import psutil
+
+from app.core.settings import STATS_CACHE_TTL
+from app.db.session import AsyncSessionLocal
+from app.db.repositories.bot_repository import AsyncBotRepository
+from app.db.repositories.activity_repository import AsyncActivityRepository
+from app.core.logging import setup_logging
+
+# Setup logging
+logger = setup_logging()
+
+
+class StatsCollector:
+    """
+    In-memory bot and activity counters for monitoring.
+
+    Counters are seeded by refresh(), which recounts from the database, and
+    are then kept current by the code paths that create and delete bots or
+    record activities. Deletions whose category is unknown and profile
+    updates that change a bot's category only show up after the next
+    refresh, which runs periodically in the background.
+
+    snapshot() rebuilds its result, including the psutil readings, at most
+    once per cache_ttl seconds, so polling it costs no database access.
+    """
+
+    def __init__(self, cache_ttl: float = STATS_CACHE_TTL, session_factory=None):
+        """
+        Initialize the collector.
+
+        Args:
+            cache_ttl: Seconds a built snapshot is reused
+            session_factory: Async session factory (defaults to AsyncSessionLocal)
+        """
+        self.cache_ttl = cache_ttl
+        self.session_factory = session_factory or AsyncSessionLocal
+        self.total_bots = 0
+        self.bot_categories: Counter = Counter()
+        self.activities_by_type: Counter = Counter()
+        self.recorded_since_start = 0
+        self.refreshed_at: Optional[datetime] = None
+        # Changes made while a refresh query is in flight, applied on top of its counts
+        self._refreshing = False
+        self._delta_bots = 0
+        self._delta_categories: Counter = Counter()
+        self._delta_activities: Counter = Counter()
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._snapshot_at = 0.0
+
+    def bots_added(self, categories: Iterable[Optional[str]]) -> None:
+        """
+        Count newly stored bots.
+
+        Args:
+            categories: Category of each new bot
+        """
+        for category in categories:
+            self.total_bots += 1
+            self.bot_categories[category] += 1
+            if self._refreshing:
+                self._delta_bots += 1
+                self._delta_categories[category] += 1
+
+    def bots_removed(
+        self, count: int, categories: Optional[Iterable[Optional[str]]] = None
+    ) -> None:
+        """
+        Count deleted bots.
+
+        Args:
+            count: Number of deleted bots
+            categories: Category of each deleted bot, if known
+        """
+        self.total_bots = max(self.total_bots - count, 0)
+        if self._refreshing:
+            self._delta_bots -= count
+        for category in categories or ():
+            self.bot_categories[category] -= 1
+            if self._refreshing:
+                self._delta_categories[category] -= 1
+        # Drop categories that reached zero
+        self.bot_categories = +self.bot_categories
+
+    def activity_recorded(self, activity_type: str) -> None:
+        """
+        Count a recorded activity.
+
+        Args:
+            activity_type: Activity type
+        """
+        self.activities_by_type[activity_type] += 1
+        self.recorded_since_start += 1
+        if self._refreshing:
+            self._delta_activities[activity_type] += 1
+
+    async def refresh(self, writer=None) -> None:
+        """
+        Recount bots and activities from the database.
+
+        Args:
+            writer: Activity writer flushed first so buffered rows are counted
+        """
+        if writer is not None:
+            await writer.flush()
+        self._refreshing = True
+        self._delta_bots = 0
+        self._delta_categories = Counter()
+        self._delta_activities = Counter()
+        try:
+            async with self.session_factory() as db:
+                bot_repository = AsyncBotRepository(db)
+                total_bots = await bot_repository.count_bots()
+                categories = await bot_repository.count_bots_by_category()
+                by_type = await AsyncActivityRepository(
+                    db
+                ).count_all_activities_by_type()
+        finally:
+            self._refreshing = False
+        # Activities recorded during the queries are still in the writer's buffer;
+        # bots stored during them may be counted twice until the next refresh
+        self.total_bots = max(total_bots + self._delta_bots, 0)
+        bot_categories = Counter(categories)
+        bot_categories.update(self._delta_categories)
+        self.bot_categories = +bot_categories
+        self.activities_by_type = Counter(by_type)
+        self.activities_by_type.update(self._delta_activities)
+        self.refreshed_at = datetime.utcnow()
+        self._snapshot = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the bot, activity and system statistics.
+
+        Returns:
+            Statistics dictionary, rebuilt at most once per cache_ttl seconds
+        """
+        now = time.monotonic()
+        if self._snapshot is None or now - self._snapshot_at >= self.cache_ttl:
+            memory_info = psutil.virtual_memory()
+            disk_info = psutil.disk_usage("/")
+            self._snapshot = {
+                "bot_stats": {
+                    "total_bots": self.total_bots,
+                    "categories": dict(self.bot_categories),
+                },
+                "activity_stats": {
+                    "total_activities": sum(self.activities_by_type.values()),
+                    "by_type": dict(self.activities_by_type),
+                    "recorded_since_start": self.recorded_since_start,
+                },
+                "system_stats": {
+                    # Usage since the previous call, without blocking
+                    "cpu_percent": psutil.cpu_percent(),
+                    "memory_percent": memory_info.percent,
+                    "disk_percent": disk_info.percent,
+                },
+                "refreshed_at": (
+                    self.refreshed_at.isoformat() if self.refreshed_at else None
+                ),
+            }
+            self._snapshot_at = now
+        return self._snapshot
+
+
+# Shared by every bot manager in the process
+stats_collector = StatsCollector()
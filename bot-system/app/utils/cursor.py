@@ -0,0 +1,88 @@
+"""
+Pagination cursors for the BlackWave Bot Service.
+Encodes the sort key of the last row of a page as an opaque token.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Tuple
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the sort key of a row as a cursor.
+
+    Args:
+        *values: Sort key values (datetimes are stored as ISO strings)
+
+    Returns:
+        URL-safe cursor string
+    """
+    key = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(key, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """
+    Decode a cursor into its sort key values.
+
+    Args:
+        cursor: Cursor string
+
+    Returns:
+        Sort key values
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(raw)
+    except Exception:
+        raise ValueError("Malformed cursor")
+    if not isinstance(key, list):
+        raise ValueError("Malformed cursor")
+    return key
+
+
+def decode_id_cursor(cursor: str) -> int:
+    """
+    Decode a cursor over an ID column.
+
+    Args:
+        cursor: Cursor string
+
+    Returns:
+        Last seen ID
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    key = decode_cursor(cursor)
+    if len(key) != 1 or not isinstance(key[0], int):
+        raise ValueError("Malformed cursor")
+    return key[0]
+
+
+def decode_time_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor over (created_at, id).
+
+    Args:
+        cursor: Cursor string
+
+    Returns:
+        Last seen (created_at, id) pair
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    key = decode_cursor(cursor)
+    if len(key) != 2 or not isinstance(key[1], int):
+        raise ValueError("Malformed cursor")
+    try:
+        return datetime.fromisoformat(key[0]), key[1]
+    except (TypeError, ValueError):
+        raise ValueError("Malformed cursor")
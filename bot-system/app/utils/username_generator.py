@@ -1,7 +1,10 @@
 import coolname
-from app.db.repositories.bot_repository import BotRepository
+from app.utils.username_registry import UsernameRegistry
 import random
 
+# Mutations tried on a taken name before starting over with a fresh one
+MAX_MUTATIONS = 20
+
 
 class UsernameGenerator:
     """Generates a random username using the coolname library."""
@@ -15,14 +18,16 @@ class UsernameGenerator:
         return username
 
     @staticmethod
-    async def generate_username(bot_repository: BotRepository) -> str:
-        """Generate a unique username. If taken, mutate one character to a digit until unique."""
-        username = await UsernameGenerator.generate()
-        while bot_repository.get_bot_by_name(username):
-            username_list = list(username)
-            for i in range(len(username_list)):
-                if not username_list[i].isdigit():
-                    username_list[i] = str(random.randint(0, 9))
-                    break
-            username = "".join(username_list)
-        return username
+    async def generate_username(registry: UsernameRegistry) -> str:
+        """Generate and reserve a unique username. If taken, mutate one character to a digit until unique."""
+        while True:
+            username = await UsernameGenerator.generate()
+            for _ in range(MAX_MUTATIONS):
+                if registry.reserve(username):
+                    return username
+                username_list = list(username)
+                for i in range(len(username_list)):
+                    if not username_list[i].isdigit():
+                        username_list[i] = str(random.randint(0, 9))
+                        break
+                username = "".join(username_list)
@@ -0,0 +1,101 @@
+"""
+Username registry for the Blackwave Bot Service.
+Keeps an in-memory index of taken usernames so new bot names can be checked without queries.
+"""
+
+import asyncio
+from typing import Iterable, Set
+
+from app.core.settings import SYNC_PAGE_SIZE
+from app.core.logging import setup_logging
+
+# Setup logging
+logger = setup_logging()
+
+
+class UsernameRegistry:
+    """
+    Set of usernames already taken locally or in the social network.
+
+    The registry is built once from the local bot table and the social network's
+    username listing, then kept in sync by bot creation and synchronization.
+    Reservations happen without awaiting, so concurrent bot factories running on
+    the same event loop can never hand out the same name twice.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._names: Set[str] = set()
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the registry has been loaded from both local and remote sources."""
+        return self._loaded
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._names
+
+    async def ensure_loaded(self, bot_repository, api_client) -> None:
+        """
+        Load the registry once from the local database and the social network API.
+
+        If the remote listing fails, local names are still indexed and loading is
+        retried on the next call.
+
+        Args:
+            bot_repository: Async bot repository for local names
+            api_client: API client for remote usernames
+        """
+        if self._loaded:
+            return
+        async with self._lock:
+            if self._loaded:
+                return
+            after_id = 0
+            while True:
+                batch = await bot_repository.get_bot_names_after(
+                    after_id, SYNC_PAGE_SIZE
+                )
+                if not batch:
+                    break
+                after_id = batch[-1][0]
+                self._names.update(name for _, name in batch)
+            try:
+                async for names in api_client.iter_usernames(SYNC_PAGE_SIZE):
+                    self._names.update(names)
+                self._loaded = True
+                logger.info(f"Username registry loaded with {len(self._names)} names")
+            except Exception as e:
+                logger.error(f"Failed to load remote usernames: {str(e)}")
+
+    def reserve(self, name: str) -> bool:
+        """
+        Reserve a username if it is free.
+
+        Args:
+            name: Username
+
+        Returns:
+            True if the name was free and is now reserved
+        """
+        if name in self._names:
+            return False
+        self._names.add(name)
+        return True
+
+    def add(self, names: Iterable[str]) -> None:
+        """Mark usernames as taken."""
+        self._names.update(names)
+
+    def release(self, names: Iterable[str]) -> None:
+        """Free usernames (reservations that were never used, or deleted bots)."""
+        self._names.difference_update(names)
+
+
+# Shared by every bot manager in the process
+username_registry = UsernameRegistry()
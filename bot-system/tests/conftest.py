@@ -0,0 +1,29 @@
+import os
+import tempfile
+
+import pytest
+
+# app.core.settings validates these on import
+_tmp = tempfile.mkdtemp(prefix="blackwave-tests-")
+os.environ.setdefault("SOCIAL_NETWORK_URL", "http://social-network.test")
+os.environ.setdefault("API_KEY", "test-key")
+os.environ.setdefault("GOOGLE_API_KEY", "test-key")
+os.environ.setdefault("QDRANT_HOST", "localhost")
+os.environ.setdefault("DB_PATH", os.path.join(_tmp, "blackwave.db"))
+os.environ.setdefault("LOG_FILE", os.path.join(_tmp, "blackwave.log"))
+
+
+@pytest.fixture
+def db():
+    """A session on an empty in-memory database with every table created."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.db.session import Base
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
@@ -0,0 +1,49 @@
+from datetime import datetime, time, timedelta
+
+from sqlalchemy import event
+
+from app.core.settings import MIN_ACTIVITY_RETENTION_DAYS, REACTION_WINDOW_DAYS
+from app.db.models import BotActivity
+from app.db.repositories.activity_repository import ActivityRepository
+from app.services.activity_retention import ActivityRetention
+
+
+def test_likes_outlive_the_reaction_window(db):
+    # The last moment a bot still sees a post from the first day of the window,
+    # liked as soon as it was posted; post dates may run up to a day ahead of
+    # the bot's UTC clock (time zones, clock skew)
+    now = datetime(2026, 3, 10, 23, 59, 59)
+    first_day = (now - timedelta(days=REACTION_WINDOW_DAYS - 1)).date()
+    liked_at = datetime.combine(first_day, time.min) - timedelta(hours=23)
+    expired_at = liked_at - timedelta(days=1)
+    for created_at in (liked_at, expired_at):
+        db.add(
+            BotActivity(
+                bot_id=1, activity_type="like", target_id="7", created_at=created_at
+            )
+        )
+    db.commit()
+
+    retention = ActivityRetention(None, retention_days=MIN_ACTIVITY_RETENTION_DAYS)
+    assert ActivityRepository(db).compact_activities(retention.cutoff(now)) == 1
+    remaining = db.query(BotActivity.created_at).all()
+    assert remaining == [(liked_at,)]
+
+
+def test_compaction_scans_only_compactable_rows(db):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    ActivityRepository(db).compact_activities(datetime(2026, 3, 10))
+    event.remove(engine, "before_cursor_execute", capture)
+
+    statement, parameters = statements[0]
+    cursor = db.connection().connection.cursor()
+    plan = cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    # Old follows are never compacted, so the batch scan must not walk them
+    assert "ix_bot_activities_compactable" in str(plan)
@@ -0,0 +1,130 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import pytest
+
+from app.core.exceptions import DatabaseError
+from app.services import activity_writer as writer_module
+from app.services.activity_writer import ActivityWriter
+
+
+class FakeDatabase:
+    """Stores activity rows, failing poison rows or every write while down."""
+
+    def __init__(self):
+        self.rows = []
+        self.last_active = {}
+        self.down = False
+        self.poison = set()
+        self.release = None
+
+    def write(self, rows):
+        if self.down or any(row["target_id"] in self.poison for row in rows):
+            raise DatabaseError("Failed to create activities")
+        self.rows.extend(rows)
+        return len(rows)
+
+
+@pytest.fixture
+def database(monkeypatch):
+    database = FakeDatabase()
+
+    class ActivityRepository:
+        def __init__(self, db):
+            pass
+
+        async def create_activities(self, rows):
+            if database.release is not None:
+                await database.release.wait()
+            return database.write(rows)
+
+    class BotRepository:
+        def __init__(self, db):
+            pass
+
+        async def set_last_active_many(self, last_active):
+            database.last_active.update(last_active)
+
+    monkeypatch.setattr(writer_module, "AsyncActivityRepository", ActivityRepository)
+    monkeypatch.setattr(writer_module, "AsyncBotRepository", BotRepository)
+    return database
+
+
+@asynccontextmanager
+async def no_session():
+    yield None
+
+
+def make_writer(**kwargs):
+    return ActivityWriter(max_rows=1000, session_factory=no_session, **kwargs)
+
+
+def add(writer, *targets, bot_id=1, activity_type="like"):
+    for target in targets:
+        writer.add_activity(
+            {"bot_id": bot_id, "activity_type": activity_type, "target_id": target}
+        )
+
+
+async def test_flush_writes_the_buffer(database):
+    writer = make_writer()
+    add(writer, "1", "2")
+    writer.set_last_active(1, datetime(2026, 1, 1))
+    assert await writer.flush() == 2
+    assert [row["target_id"] for row in database.rows] == ["1", "2"]
+    assert database.last_active == {1: datetime(2026, 1, 1)}
+    assert writer.snapshot()["buffered_activities"] == 0
+
+
+async def test_poison_row_is_dropped_after_max_attempts(database):
+    writer = make_writer(max_attempts=2)
+    database.poison = {"bad"}
+    add(writer, "1", "bad", "2")
+
+    assert await writer.flush() == 2
+    assert [row["target_id"] for row in database.rows] == ["1", "2"]
+    assert [a["target_id"] for a in writer.pending_activities()] == ["bad"]
+    assert "_attempts" not in database.rows[0]
+
+    add(writer, "3")
+    assert await writer.flush() == 1
+    assert writer.pending_activities() == []
+    assert writer.snapshot()["dropped_rows"] == 1
+
+
+async def test_outage_keeps_rows_up_to_the_buffer_limit(database):
+    writer = make_writer(max_buffered=3, max_attempts=5)
+    database.down = True
+    add(writer, "1", "2")
+    assert await writer.flush() == 0
+    add(writer, "3", "4")
+    assert await writer.flush() == 0
+
+    # Only one row is tried per failed flush; the oldest overflow is dropped
+    assert [a["target_id"] for a in writer.pending_activities()] == ["2", "3", "4"]
+    assert writer.snapshot()["dropped_rows"] == 1
+
+    database.down = False
+    assert await writer.flush() == 3
+    assert writer.snapshot()["buffered_activities"] == 0
+
+
+async def test_buffered_rows_stay_visible_while_flushing(database):
+    writer = make_writer()
+    add(writer, "1")
+    add(writer, "2", bot_id=2, activity_type="comment")
+    writer.set_last_active(2, datetime(2026, 1, 1))
+    database.release = asyncio.Event()
+
+    flush = asyncio.create_task(writer.flush())
+    await asyncio.sleep(0)
+    add(writer, "3", bot_id=2)
+    assert [a["target_id"] for a in writer.pending_activities(2)] == ["2", "3"]
+    assert [a["target_id"] for a in writer.pending_activities(2, "comment")] == ["2"]
+    assert writer.pending_last_active(2) == datetime(2026, 1, 1)
+
+    database.release.set()
+    await flush
+    assert [a["target_id"] for a in writer.pending_activities()] == ["3"]
+    assert writer.pending_last_active(2) is None
@@ -0,0 +1,84 @@
+import pytest
+
+# Pulls in the LLM and qDrant clients
+bot_manager = pytest.importorskip("app.services.bot_manager")
+
+
+class FakeBotRepository:
+    def __init__(self, names):
+        self.bots = dict(enumerate(names, start=1))
+        self.db = None
+
+    async def count_bots(self):
+        return len(self.bots)
+
+    async def get_bot_names_after(self, after_id, limit):
+        ids = sorted(bot_id for bot_id in self.bots if bot_id > after_id)[:limit]
+        return [(bot_id, self.bots[bot_id]) for bot_id in ids]
+
+    async def delete_bots(self, bot_ids):
+        for bot_id in bot_ids:
+            del self.bots[bot_id]
+
+
+class FakeAPIClient:
+    def __init__(self, remote):
+        self.remote = set(remote)
+        self.lookups = []
+
+    async def get_usernames_page(self, limit, is_bot):
+        return {"count": len(self.remote), "results": [], "next_cursor": None}
+
+    async def find_usernames(self, names, is_bot=None):
+        self.lookups.append(list(names))
+        return self.remote.intersection(names)
+
+
+class Recorder:
+    """Accepts any method call and records it."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        def record(*args):
+            self.calls.append((name, *args))
+
+        return record
+
+
+class FakeMemoryService:
+    async def delete_bot_memories(self, bot_id):
+        pass
+
+
+def make_manager(local, remote):
+    return bot_manager.BotManager(
+        bot_repository=FakeBotRepository(local),
+        activity_repository=None,
+        content_generator=None,
+        api_client=FakeAPIClient(remote),
+        memory_service=FakeMemoryService(),
+        config_repository=Recorder(),
+        registry=Recorder(),
+        interactions=Recorder(),
+        writer=Recorder(),
+        stats=Recorder(),
+    )
+
+
+async def test_reconcile_checks_local_pages_against_the_api(monkeypatch):
+    monkeypatch.setattr(bot_manager, "SYNC_PAGE_SIZE", 2)
+    local = ["a", "b", "c", "d", "e"]
+    manager = make_manager(local, remote=["a", "c", "e", "z"])
+
+    assert await manager._reconcile_deleted_bots(force=True) == 2
+    assert sorted(manager.bot_repository.bots.values()) == ["a", "c", "e"]
+    assert manager.api_client.lookups == [["a", "b"], ["c", "d"], ["e"]]
+    assert ("evict", 2) in manager.interaction_index.calls
+
+
+async def test_reconcile_skips_when_counts_match():
+    manager = make_manager(["a", "b"], remote=["a", "b"])
+    assert await manager._reconcile_deleted_bots() == 0
+    assert manager.api_client.lookups == []
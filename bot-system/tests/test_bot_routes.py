@@ -0,0 +1,92 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+# Pulls in the bot manager, and with it the LLM and qDrant clients
+bots = pytest.importorskip("app.api.routes.bots")
+
+from app.services.activity_writer import ActivityWriter  # noqa: E402
+
+
+def stored(activity_id, minute, target_id="1"):
+    return SimpleNamespace(
+        id=activity_id,
+        bot_id=1,
+        activity_type="like",
+        target_id=target_id,
+        content=None,
+        created_at=datetime(2026, 1, 1, 12, minute),
+    )
+
+
+def buffered(minute, target_id="1"):
+    return {
+        "bot_id": 1,
+        "activity_type": "like",
+        "target_id": target_id,
+        "created_at": datetime(2026, 1, 1, 12, minute),
+    }
+
+
+def test_buffered_activities_are_merged_newest_first():
+    pending = bots._pending_responses([buffered(5, "b"), buffered(6, 7)])
+    merged = bots._merge_activities([stored(2, 4), stored(1, 3)], pending, 3)
+    assert [(a.id, a.target_id) for a in merged] == [(None, "7"), (None, "b"), (2, "1")]
+
+
+def test_committed_activity_is_returned_once():
+    pending = bots._pending_responses([buffered(4)])
+    merged = bots._merge_activities([stored(2, 4)], pending, 10)
+    assert [a.id for a in merged] == [2]
+
+
+def test_next_page_skips_buffered_activities_already_listed():
+    pending = bots._pending_responses([buffered(5), buffered(6)])
+    first = bots._merge_activities([], pending, 1)
+    before = bots._sort_key(first[-1])
+    second = bots._merge_activities([stored(1, 3)], pending, 10, before)
+    assert [a.created_at.minute for a in first + second] == [6, 5, 3]
+
+
+def test_bot_response_uses_buffered_last_active():
+    writer = ActivityWriter()
+    bot = SimpleNamespace(
+        id=1,
+        name="bot",
+        full_name="Bot",
+        avatar="https://example.com/a.png",
+        age=30,
+        gender="female",
+        prompt="",
+        category="news",
+        description=None,
+        created_at=datetime(2025, 1, 1),
+        last_active=datetime(2026, 1, 1),
+        like_probability=0.5,
+        comment_probability=0.5,
+        follow_probability=0.5,
+        unfollow_probability=0.5,
+        post_probability=0.5,
+    )
+    writer.set_last_active(1, datetime(2026, 2, 1))
+    assert bots._bot_response(bot, writer).last_active == datetime(2026, 2, 1)
+
+
+async def test_ndjson_stream_fetches_one_page_at_a_time(monkeypatch):
+    monkeypatch.setattr(bots, "EXPORT_PAGE_SIZE", 2)
+    rows = [SimpleNamespace(id=i) for i in range(1, 4)]
+    fetched = []
+
+    async def fetch_page(repositories, after_id):
+        fetched.append(after_id)
+        return [row for row in rows if row.id > after_id][:2]
+
+    chunks = [
+        chunk
+        async for chunk in bots._stream_ndjson(
+            fetch_page, lambda row: f'{{"id": {row.id}}}', lambda: ['{"id": null}']
+        )
+    ]
+    assert chunks == ['{"id": 1}\n{"id": 2}\n', '{"id": 3}\n', '{"id": null}\n']
+    assert fetched == [0, 2]
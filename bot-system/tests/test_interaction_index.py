@@ -0,0 +1,141 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.db.models import BotActivity
+from app.db.repositories.activity_repository import ActivityRepository
+from app.services.interaction_index import InteractionIndex
+
+
+class FakeActivityRepository:
+    """Serves get_interaction_targets, optionally holding it until released."""
+
+    def __init__(self, targets=None):
+        self.targets = targets or {}
+        self.loads = []
+        self.release = None
+
+    async def get_interaction_targets(self, bot_id, since=None):
+        self.loads.append(bot_id)
+        if self.release is not None:
+            await self.release.wait()
+        if isinstance(self.targets, Exception):
+            raise self.targets
+        return list(self.targets.get(bot_id, []))
+
+
+class FakeWriter:
+    def __init__(self, pending=None):
+        self.pending = pending or {}
+
+    def pending_activities(self, bot_id):
+        return self.pending.get(bot_id, [])
+
+
+async def test_cold_load_merges_the_writer_buffer():
+    repository = FakeActivityRepository(
+        {1: [("like", "10"), ("follow", "7"), ("comment", "10")]}
+    )
+    writer = FakeWriter({1: [{"activity_type": "comment", "target_id": 10}]})
+    index = InteractionIndex(writer=writer)
+
+    state = await index.get_state(repository, 1, 10, author_id=7)
+    assert state == {"liked": True, "followed": True, "comment_count": 2}
+    state = await index.get_state(repository, 1, 11, author_id=8)
+    assert state == {"liked": False, "followed": False, "comment_count": 0}
+    assert repository.loads == [1]
+    assert (index.hits, index.misses) == (1, 1)
+
+
+async def test_record_updates_loaded_bots_only():
+    repository = FakeActivityRepository()
+    index = InteractionIndex()
+    index.record(1, "like", 10)
+    await index.get_state(repository, 1, 10)
+    index.record(1, "like", 10)
+    index.record(1, "comment", 10)
+    state = await index.get_state(repository, 1, 10)
+    assert state == {"liked": True, "followed": False, "comment_count": 1}
+
+
+async def test_concurrent_checks_share_one_load():
+    repository = FakeActivityRepository({1: [("like", "10")]})
+    repository.release = asyncio.Event()
+    index = InteractionIndex()
+
+    checks = [asyncio.create_task(index.get_state(repository, 1, 10)) for _ in range(3)]
+    await asyncio.sleep(0)
+    # Recorded while the load query runs, so possibly missing from its result
+    index.record(1, "follow", 7)
+    repository.release.set()
+    states = await asyncio.gather(*checks)
+
+    assert repository.loads == [1]
+    assert all(state["liked"] for state in states)
+    assert (await index.get_state(repository, 1, 10, author_id=7))["followed"]
+
+
+async def test_rows_flushed_during_the_load_are_kept():
+    repository = FakeActivityRepository()
+    repository.release = asyncio.Event()
+    writer = FakeWriter({1: [{"activity_type": "like", "target_id": 10}]})
+    index = InteractionIndex(writer=writer)
+
+    check = asyncio.create_task(index.get_state(repository, 1, 10))
+    await asyncio.sleep(0)
+    # Flushed after the load query took its snapshot
+    writer.pending = {}
+    repository.release.set()
+    assert (await check)["liked"]
+
+
+async def test_least_recently_used_bots_are_evicted():
+    repository = FakeActivityRepository()
+    index = InteractionIndex(max_bots=2)
+    for bot_id in (1, 2, 1, 3):
+        await index.get_state(repository, bot_id, 10)
+    assert len(index) == 2
+    await index.get_state(repository, 1, 10)
+    await index.get_state(repository, 2, 10)
+    assert repository.loads == [1, 2, 3, 2]
+
+    index.evict(1)
+    await index.get_state(repository, 1, 10)
+    assert repository.loads[-1] == 1
+
+
+async def test_failed_load_is_retried():
+    repository = FakeActivityRepository(RuntimeError("database is locked"))
+    index = InteractionIndex()
+    with pytest.raises(RuntimeError):
+        await index.get_state(repository, 1, 10)
+    assert len(index) == 0
+
+    repository.targets = {1: [("like", "10")]}
+    assert (await index.get_state(repository, 1, 10))["liked"]
+
+
+def test_load_skips_likes_and_comments_before_the_window(db):
+    now = datetime(2026, 3, 10, 12, 0)
+    for activity_type, target_id, days_ago in [
+        ("like", "1", 10),
+        ("comment", "1", 10),
+        ("follow", "7", 100),
+        ("like", "2", 1),
+        ("comment", "2", 1),
+    ]:
+        db.add(
+            BotActivity(
+                bot_id=1,
+                activity_type=activity_type,
+                target_id=target_id,
+                created_at=now - timedelta(days=days_ago),
+            )
+        )
+    db.commit()
+
+    targets = ActivityRepository(db).get_interaction_targets(
+        1, since=now - timedelta(days=4)
+    )
+    assert sorted(targets) == [("comment", "2"), ("follow", "7"), ("like", "2")]
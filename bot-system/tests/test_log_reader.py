@@ -0,0 +1,104 @@
+import os
+
+import pytest
+from loguru import logger
+
+from app.core import log_reader
+from app.core.log_reader import RingBufferSink
+
+
+def write(path, text, mode="a"):
+    with open(path, mode) as f:
+        f.write(text)
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "blackwave.log"
+    write(path, "", "w")
+    return path
+
+
+def test_reverse_lines_across_chunks(log_file):
+    lines = [f"line {i} " + "x" * i + "\n" for i in range(20)]
+    write(log_file, "".join(lines))
+    assert list(log_reader._reverse_lines(log_file, chunk_size=7)) == lines[::-1]
+
+
+def test_tail_continues_into_rotated_files(log_file, tmp_path):
+    rotated = tmp_path / "blackwave.2026-01-01_00-00-00_000000.log"
+    write(rotated, "a | INFO | old\nb | ERROR | old\n")
+    os.utime(rotated, (0, 0))
+    write(log_file, "c | ERROR | new\nd | INFO | new\n")
+
+    errors = log_reader.level_filter("ERROR")
+    assert log_reader.tail(str(log_file), 2, errors) == [
+        "b | ERROR | old\n",
+        "c | ERROR | new\n",
+    ]
+    assert log_reader.tail(str(log_file), 1) == ["d | INFO | new\n"]
+
+
+def test_level_filter_matches_text_and_json_lines():
+    errors = log_reader.level_filter("ERROR")
+    assert errors("2026-01-01 | ERROR    | app | boom")
+    assert errors('{"level": "ERROR", "message": "boom"}')
+    assert not errors("2026-01-01 | INFO     | app | fine")
+    assert log_reader.level_filter(None)("anything")
+
+
+def test_follow_returns_complete_new_lines(log_file):
+    write(log_file, "before\n")
+    cursor = log_reader.end_position(str(log_file))
+    write(log_file, "one\ntw")
+    lines, cursor = log_reader.read_since(str(log_file), cursor)
+    assert lines == ["one\n"]
+    write(log_file, "o\n")
+    lines, cursor = log_reader.read_since(str(log_file), cursor)
+    assert lines == ["two\n"]
+    assert log_reader.read_since(str(log_file), cursor) == ([], cursor)
+
+
+def test_follow_across_rotation(log_file, tmp_path):
+    cursor = log_reader.end_position(str(log_file))
+    write(log_file, "last before rotation\n")
+    log_file.rename(tmp_path / "blackwave.2026-01-01_00-00-00_000000.log")
+    write(log_file, "first after rotation\n", "w")
+
+    lines, cursor = log_reader.read_since(str(log_file), cursor)
+    assert lines == ["last before rotation\n", "first after rotation\n"]
+    assert log_reader.decode_position(cursor)[0] == os.stat(log_file).st_ino
+
+
+def test_follow_after_truncation(log_file):
+    write(log_file, "a long line that will be truncated\n")
+    cursor = log_reader.end_position(str(log_file))
+    write(log_file, "new\n", "w")
+    assert log_reader.read_since(str(log_file), cursor)[0] == ["new\n"]
+
+
+@pytest.mark.parametrize("cursor", ["", "12", "a-1", "1--1"])
+def test_malformed_follow_cursor(cursor):
+    with pytest.raises(ValueError):
+        log_reader.decode_position(cursor)
+
+
+def test_ring_buffer_sink():
+    sink = RingBufferSink(3)
+    handler = logger.add(sink, format="{level} {message}", level="DEBUG")
+    try:
+        for i in range(4):
+            logger.info(f"info {i}")
+        logger.error("boom")
+    finally:
+        logger.remove(handler)
+
+    assert [line.strip() for line in sink.tail(10)] == [
+        "INFO info 2",
+        "INFO info 3",
+        "ERROR boom",
+    ]
+    assert [line.strip() for line in sink.tail(1, "INFO")] == ["INFO info 3"]
+    assert [line.strip() for line in sink.since(sink.last_sequence - 1)] == [
+        "ERROR boom"
+    ]
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.db.models import Bot, BotActivity
+from app.db.repositories.activity_repository import ActivityRepository
+from app.db.repositories.bot_repository import BotRepository
+from app.utils.cursor import decode_id_cursor, decode_time_cursor, encode_cursor
+
+
+def test_cursors_round_trip():
+    assert decode_id_cursor(encode_cursor(42)) == 42
+    created_at = datetime(2026, 1, 1, 12, 30, 15, 250)
+    assert decode_time_cursor(encode_cursor(created_at, 7)) == (created_at, 7)
+
+
+@pytest.mark.parametrize(
+    "cursor", ["", "not base64!", encode_cursor("42"), encode_cursor(1, 2)]
+)
+def test_malformed_id_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_id_cursor(cursor)
+
+
+@pytest.mark.parametrize(
+    "cursor", [encode_cursor(42), encode_cursor("yesterday", 1), encode_cursor(1, 2)]
+)
+def test_malformed_time_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_time_cursor(cursor)
+
+
+def test_bots_are_paged_by_id(db):
+    db.add_all(Bot(name=f"bot{i}") for i in range(5))
+    db.commit()
+    repository = BotRepository(db)
+    seen, after_id = [], 0
+    while True:
+        page = repository.get_bots_after(after_id, 2)
+        if not page:
+            break
+        seen.extend(bot.name for bot in page)
+        after_id = decode_id_cursor(encode_cursor(page[-1].id))
+    assert seen == [f"bot{i}" for i in range(5)]
+
+
+def test_activities_are_paged_newest_first_with_ties(db):
+    start = datetime(2026, 1, 1)
+    # Two activities share each timestamp; the ID breaks the tie
+    db.add_all(
+        BotActivity(
+            bot_id=1,
+            activity_type="like" if i % 3 else "comment",
+            target_id=str(i),
+            created_at=start + timedelta(minutes=i // 2),
+        )
+        for i in range(7)
+    )
+    db.add(BotActivity(bot_id=2, activity_type="like", target_id="x"))
+    db.commit()
+    repository = ActivityRepository(db)
+
+    def pages(activity_type=None):
+        seen, before = [], None
+        while True:
+            page = repository.get_activities_before(1, before, 2, activity_type)
+            seen.extend(activity.target_id for activity in page)
+            if len(page) < 2:
+                return seen
+            last = page[-1]
+            before = decode_time_cursor(encode_cursor(last.created_at, last.id))
+
+    assert pages() == ["6", "5", "4", "3", "2", "1", "0"]
+    assert pages("comment") == ["6", "3", "0"]
@@ -0,0 +1,213 @@
+import asyncio
+
+import pytest
+
+from app.clients import blackwave_api, resilience
+from app.clients.blackwave_api import BlackwaveAPIClient
+from app.clients.resilience import CircuitBreaker
+from app.core.exceptions import CircuitOpenError, RateLimitedError
+
+
+class Clock:
+    """Stands in for time.monotonic in the resilience module."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(resilience.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture(autouse=True)
+def fresh_endpoints(monkeypatch):
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setattr(resilience, "_metrics", {})
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("posts", failure_threshold=3, reset_timeout=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+def test_half_open_lets_one_probe_through(clock):
+    breaker = CircuitBreaker("posts", failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 29
+    assert not breaker.allow_request()
+
+    clock.now += 1
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+
+def test_failed_probe_reopens(clock):
+    breaker = CircuitBreaker("posts", failure_threshold=5, reset_timeout=30)
+    for _ in range(5):
+        breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now += 29
+    assert not breaker.allow_request()
+
+
+def test_released_probe_can_be_retried(clock):
+    breaker = CircuitBreaker("posts", failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow_request()
+    breaker.release()
+    assert breaker.allow_request()
+
+
+def test_retry_after_opens_for_as_long_as_asked(clock):
+    breaker = CircuitBreaker("posts", failure_threshold=5, reset_timeout=30)
+    breaker.record_failure(retry_after=60)
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now += 59
+    assert not breaker.allow_request()
+    clock.now += 1
+    assert breaker.allow_request()
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [(None, None), ("", None), ("120", 120.0), ("-5", 0.0), ("soon", None)],
+)
+def test_parse_retry_after(value, expected):
+    assert blackwave_api._parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    assert blackwave_api._parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+class FakeResponse:
+    def __init__(self, status, text="[]", headers=None):
+        self.status = status
+        self._text = text
+        self.headers = headers or {}
+
+    async def text(self):
+        return self._text
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeSession:
+    """Answers requests with the given responses, in order."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = 0
+
+    def request(self, method, url, **kwargs):
+        self.requests += 1
+        return self.responses.pop(0)
+
+
+def client_with(*responses):
+    client = BlackwaveAPIClient(base_url="http://api", token="token")
+    client.session = FakeSession(*responses)
+    return client
+
+
+async def test_rate_limit_is_a_failure():
+    client = client_with(FakeResponse(429, headers={"Retry-After": "60"}))
+    with pytest.raises(RateLimitedError) as info:
+        await client._send("posts", "GET", "http://api/api/posts")
+    assert info.value.retry_after == 60
+    assert resilience.get_breaker("posts").state == CircuitBreaker.OPEN
+    assert resilience.get_metrics("posts").failures == 1
+
+    with pytest.raises(CircuitOpenError):
+        await client._send("posts", "GET", "http://api/api/posts")
+    assert client.session.requests == 1
+
+
+async def test_reads_retry_after_rate_limit():
+    client = client_with(
+        FakeResponse(429, headers={"Retry-After": "0"}),
+        FakeResponse(200, '[{"id": 1}]'),
+    )
+    assert await client.get_posts() == [{"id": 1}]
+    assert client.session.requests == 2
+
+
+async def test_hedged_get_cancels_the_slower_request(monkeypatch):
+    monkeypatch.setattr(blackwave_api, "API_HEDGE_DELAY", 0.01)
+    client = BlackwaveAPIClient(base_url="http://api", token="token")
+    started, cancelled = [], []
+
+    async def send(endpoint_class, method, url, **kwargs):
+        started.append(url)
+        if len(started) == 1:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(url)
+                raise
+        return 200, "hedged"
+
+    monkeypatch.setattr(client, "_send", send)
+    assert await client._dispatch("posts", "GET", "http://api", hedge=True) == (
+        200,
+        "hedged",
+    )
+    await asyncio.sleep(0)
+    assert len(started) == 2
+    assert cancelled == ["http://api"]
+    assert resilience.get_metrics("posts").hedged == 1
+
+
+async def test_cancelled_request_releases_the_probe(clock):
+    breaker = resilience.get_breaker("posts")
+    breaker.record_failure(retry_after=0)
+    client = BlackwaveAPIClient(base_url="http://api", token="token")
+
+    class HangingSession:
+        def request(self, method, url, **kwargs):
+            return Hanging()
+
+    class Hanging(FakeResponse):
+        def __init__(self):
+            super().__init__(200)
+
+        async def __aenter__(self):
+            await asyncio.sleep(10)
+
+    client.session = HangingSession()
+    task = asyncio.create_task(client._send("posts", "GET", "http://api"))
+    await asyncio.sleep(0)
+    assert not breaker.allow_request()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert breaker.allow_request()
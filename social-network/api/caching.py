@@ -0,0 +1,149 @@
+import hashlib
+
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+from network import caching
+
+
+class CachedListMixin:
+    """
+    Caches the `list` responses of a viewset in two layers.
+
+    The page (which rows, in which order, and the pagination links) is keyed
+    by the full query string and the versions of get_cache_namespaces(), which
+    network.signals bumps when rows are added, removed or reordered. The
+    serialized data of each row is cached on its own under
+    get_item_cache_namespaces(row), so a like or a follow re-serializes the
+    rows it touched instead of invalidating every list that shows them.
+    """
+
+    cache_namespaces = []
+
+    def get_cache_namespaces(self):
+        return self.cache_namespaces
+
+    def get_item_cache_namespaces(self, obj):
+        """Namespaces the serialized data of one row depends on."""
+        return []
+
+    def list(self, request, *args, **kwargs):
+        params = sorted(request.query_params.lists())
+        page_key = caching.make_key(
+            "api-list", [request.path, params], self.get_cache_namespaces()
+        )
+        page = cache.get(page_key)
+        objects = {}
+        if page is None:
+            page, objects = self.get_cached_page()
+            cache.set(page_key, page)
+        results = self.get_cached_results(page["rows"], objects)
+        if page["meta"] is None:
+            return Response(results)
+        return Response({**page["meta"], "results": results})
+
+    def get_cached_page(self):
+        """Get the cacheable page and the rows it was built from, by primary key."""
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = self.paginate_queryset(queryset)
+        meta = None
+        if rows is None:
+            rows = list(queryset)
+        else:
+            meta = dict(self.get_paginated_response([]).data)
+            del meta["results"]
+        page = {
+            "rows": [[obj.pk, self.get_item_cache_namespaces(obj)] for obj in rows],
+            "meta": meta,
+        }
+        return page, {obj.pk: obj for obj in rows}
+
+    def get_cached_results(self, rows, objects):
+        """Serialized rows of a page, from the cache, `objects` or the database."""
+        serializer = self.get_serializer()
+        # Sparse fieldsets and compact views serialize the same row differently
+        variant = hashlib.md5(
+            repr([type(serializer).__name__, *serializer.fields]).encode()
+        ).hexdigest()
+        names = sorted({name for _, namespaces in rows for name in namespaces})
+        versions = dict(zip(names, caching.versions(*names))) if names else {}
+        keys = {
+            pk: ":".join(
+                ["api-item", variant, str(pk)]
+                + [str(versions[name]) for name in namespaces]
+            )
+            for pk, namespaces in rows
+        }
+        found = cache.get_many(list(keys.values()))
+
+        missing = [pk for pk, key in keys.items() if key not in found]
+        unloaded = [pk for pk in missing if pk not in objects]
+        if unloaded:
+            objects = {**objects, **self.get_queryset().in_bulk(unloaded)}
+        # Rows deleted since the page was cached are skipped
+        loaded = [pk for pk in missing if pk in objects]
+        if loaded:
+            data = self.get_serializer([objects[pk] for pk in loaded], many=True).data
+            fresh = {keys[pk]: item for pk, item in zip(loaded, data)}
+            cache.set_many(fresh)
+            found.update(fresh)
+        return [found[keys[pk]] for pk, _ in rows if keys[pk] in found]
+
+
+class ConditionalGetMixin:
+    """
+    ETag and Last-Modified for the `list` and `retrieve` responses of a viewset.
+
+    get_validators() returns the state the response is built from, read with a
+    few indexed aggregates (latest updated_at and counters_changed_at, highest
+    id, stored counts) instead of from the rows themselves. A request whose If-None-Match or
+    If-Modified-Since matches gets a 304 before the queryset is evaluated or
+    serialized. The ETag is authoritative: Last-Modified has one-second
+    resolution and does not move when a row is deleted.
+    """
+
+    def get_validators(self):
+        """
+        Get (last modified datetimes, values) describing what the response shows.
+
+        Returns None to skip conditional handling, e.g. for a missing object.
+        """
+        return None
+
+    def conditional(self, request, respond):
+        validators = self.get_validators()
+        if validators is None:
+            return respond()
+        timestamps, values = validators
+        timestamps = [timestamp for timestamp in timestamps if timestamp is not None]
+        last_modified = int(max(timestamps).timestamp()) if timestamps else None
+        # The same data renders differently per URL and format
+        key = [request.get_full_path(), request.accepted_renderer.format, *values]
+        etag = quote_etag(hashlib.md5(repr(key).encode()).hexdigest())
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = respond()
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+            # Clients must revalidate instead of guessing a freshness lifetime
+            patch_cache_control(response, no_cache=True)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(
+            request,
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(
+            request,
+            lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs),
+        )
@@ -0,0 +1,73 @@
+FIELDS_PARAM = "fields"
+OMIT_PARAM = "omit"
+VIEW_PARAM = "view"
+
+
+def requested_fields(request, available):
+    """
+    Names of `available` kept by the `?fields=` and `?omit=` of a request.
+
+    Both take comma-separated field names; unknown names are ignored. Only
+    reads are narrowed, so writes always see every field.
+    """
+    if request is None or request.method not in ("GET", "HEAD"):
+        return list(available)
+    fields = request.query_params.get(FIELDS_PARAM)
+    omit = request.query_params.get(OMIT_PARAM)
+    kept = list(available)
+    if fields:
+        wanted = {name.strip() for name in fields.split(",")}
+        kept = [name for name in kept if name in wanted]
+    if omit:
+        unwanted = {name.strip() for name in omit.split(",")}
+        kept = [name for name in kept if name not in unwanted]
+    return kept
+
+
+def reads_relation(fields, relation):
+    """Whether any of the serializer `fields` reads `relation` of the instance."""
+    return any(
+        name == relation or field.source.split(".")[0] == relation
+        for name, field in fields.items()
+    )
+
+
+class SparseFieldsMixin:
+    """Serializer that drops the fields left out by `?fields=` / `?omit=`."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        kept = set(requested_fields(self.context.get("request"), self.fields))
+        for name in list(self.fields):
+            if name not in kept:
+                self.fields.pop(name)
+
+
+class SparseFieldsetViewMixin:
+    """
+    Sparse fieldsets and compact serializers for a viewset.
+
+    `?view=compact` reads with `compact_serializer_class`, a lighter
+    representation for bots. get_fields() tells get_queryset() which fields
+    the response needs, so it can skip joins nobody asked for.
+    """
+
+    compact_serializer_class = None
+
+    def is_compact(self):
+        request = getattr(self, "request", None)
+        return (
+            self.compact_serializer_class is not None
+            and request is not None
+            and request.method in ("GET", "HEAD")
+            and request.query_params.get(VIEW_PARAM) == "compact"
+        )
+
+    def get_serializer_class(self):
+        if self.is_compact():
+            return self.compact_serializer_class
+        return super().get_serializer_class()
+
+    def get_fields(self):
+        """The serializer fields of the response, after `?fields=` / `?omit=`."""
+        return self.get_serializer().fields
@@ -0,0 +1,42 @@
+from django.db.models import Case, IntegerField, When
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.settings import api_settings
+
+from network import search
+from network.models import Post, Profile
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    `?search=` over posts and profiles through network.search.
+
+    Matches are ordered by relevance unless the list is cursor-paginated,
+    in which case the pagination ordering applies to the matches.
+    """
+
+    search_param = api_settings.SEARCH_PARAM
+    searches = {Post: search.search_posts, Profile: search.search_profiles}
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "").strip()
+        if not query:
+            return queryset
+        ids = self.searches[queryset.model](query)
+        if not ids:
+            return queryset.none()
+        rank = Case(
+            *[When(pk=pk, then=position) for position, pk in enumerate(ids)],
+            output_field=IntegerField(),
+        )
+        return queryset.filter(pk__in=ids).order_by(rank)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": "Full-text search, results ranked by relevance",
+                "schema": {"type": "string"},
+            }
+        ]
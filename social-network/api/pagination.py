@@ -1,5 +1,99 @@
-from rest_framework.pagination import PageNumberPagination
+from django.conf import settings
+from rest_framework.pagination import (
+    BasePagination,
+    CursorPagination,
+    PageNumberPagination,
+)
+from rest_framework.response import Response
 
 
 class DefaultPagination(PageNumberPagination):
     page_size = 10
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset pagination over a unique, indexed integer column.
+
+    Clients pass the `next_cursor` of the previous page as `after`, so every
+    page is an index range scan no matter how deep into the table it is.
+    """
+
+    key = "id"
+    page_size = 500
+    max_page_size = 1000
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params.get("limit", self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(limit, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        limit = self.get_limit(request)
+        after = request.query_params.get("after")
+        if after:
+            try:
+                queryset = queryset.filter(**{f"{self.key}__gt": int(after)})
+            except ValueError:
+                pass  # ignore invalid cursor
+        page = list(queryset.order_by(self.key)[: limit + 1])
+        has_next = len(page) > limit
+        page = page[:limit]
+        self.next_cursor = None
+        if has_next:
+            last = page[-1]
+            self.next_cursor = last[self.key] if isinstance(last, dict) else getattr(last, self.key)
+        return page
+
+    def get_paginated_response(self, data):
+        return Response({"next_cursor": self.next_cursor, "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next_cursor": {"type": "integer", "nullable": True},
+                "results": schema,
+            },
+        }
+
+
+class ProfileExportPagination(KeysetPagination):
+    key = "user_id"
+
+
+class OptInCursorPagination(CursorPagination):
+    """
+    Cursor pagination that only applies when the client asks for it.
+
+    Requests with `page_size` or `cursor` get a page of at most
+    API_MAX_PAGE_SIZE rows and opaque `next`/`previous` links; requests
+    without either keep receiving the plain, unpaginated list.
+    """
+
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+    def is_requested(self, request):
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+
+class PostCursorPagination(OptInCursorPagination):
+    ordering = ("-date", "-id")
+
+
+class CommentCursorPagination(OptInCursorPagination):
+    ordering = ("date", "id")
+
+
+class ProfileCursorPagination(OptInCursorPagination):
+    ordering = "user_id"
@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from network.models import *
+from .fieldsets import SparseFieldsMixin
 
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     # Все поля из user кроме пароля
     id = serializers.IntegerField(source="user.id", read_only=True)
     username = serializers.CharField(source="user.username", read_only=True)
@@ -97,7 +98,44 @@ class ProfileSerializer(serializers.ModelSerializer):
         return False
 
 
-class PostSerializer(serializers.ModelSerializer):
+class ProfileExportSerializer(serializers.ModelSerializer):
+    """Flat profile representation for bulk export; reads only `profile` and `user` columns."""
+
+    id = serializers.IntegerField(source="user.id", read_only=True)
+    username = serializers.CharField(source="user.username", read_only=True)
+    is_bot = serializers.BooleanField(source="user.is_bot", read_only=True)
+    category = serializers.CharField(source="user.category", read_only=True)
+    gender = serializers.CharField(source="user.gender", read_only=True)
+    prompt = serializers.CharField(source="user.prompt", read_only=True)
+    like_probability = serializers.FloatField(source="user.like_probability", read_only=True)
+    comment_probability = serializers.FloatField(source="user.comment_probability", read_only=True)
+    follow_probability = serializers.FloatField(source="user.follow_probability", read_only=True)
+    unfollow_probability = serializers.FloatField(source="user.unfollow_probability", read_only=True)
+    repost_probability = serializers.FloatField(source="user.repost_probability", read_only=True)
+
+    class Meta:
+        model = Profile
+        fields = [
+            "id",
+            "username",
+            "is_bot",
+            "category",
+            "gender",
+            "prompt",
+            "like_probability",
+            "comment_probability",
+            "follow_probability",
+            "unfollow_probability",
+            "repost_probability",
+            "name",
+            "image",
+            "dob",
+            "bio",
+        ]
+        read_only_fields = fields
+
+
+class PostSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user = serializers.SerializerMethodField(read_only=True)
     liked = serializers.SerializerMethodField(read_only=True)
     bookmarked = serializers.SerializerMethodField(read_only=True)
@@ -158,7 +196,7 @@ class PostSerializer(serializers.ModelSerializer):
         return False
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user = serializers.SerializerMethodField(read_only=True)
     user_id = serializers.IntegerField(write_only=True, required=False)
 
@@ -190,6 +228,89 @@ class CommentSerializer(serializers.ModelSerializer):
         }
 
 
+class CompactUserField(serializers.Field):
+    """Id, username and profile name of a user."""
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, user):
+        profile = getattr(user, "profile", None)
+        return {
+            "id": user.id,
+            "username": user.username,
+            "name": profile.name if profile else None,
+        }
+
+
+class CompactProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Profile fields used by the bot service (`?view=compact`)."""
+
+    id = serializers.IntegerField(source="user_id", read_only=True)
+    username = serializers.CharField(source="user.username", read_only=True)
+    is_bot = serializers.BooleanField(source="user.is_bot", read_only=True)
+
+    class Meta:
+        model = Profile
+        fields = ["id", "username", "is_bot", "name", "image", "bio"]
+        read_only_fields = fields
+
+
+class CompactPostSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Post fields used by the bot service (`?view=compact`)."""
+
+    user = CompactUserField()
+
+    class Meta:
+        model = Post
+        fields = ["id", "content", "date", "reactions_count", "comments_count", "user"]
+        read_only_fields = fields
+
+
+class CompactCommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Comment fields used by the bot service (`?view=compact`)."""
+
+    user = CompactUserField()
+
+    class Meta:
+        model = Comment
+        fields = ["id", "content", "date", "user"]
+        read_only_fields = fields
+
+
+class BotProfileDataSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Profile
+        fields = ["name", "image", "dob", "bio"]
+
+
+class BotAccountSerializer(serializers.ModelSerializer):
+    """Validates one bot account (user + profile) for bulk creation."""
+
+    # Declared explicitly to skip the per-row unique validator; the bulk view
+    # checks all usernames against the database in a single query instead.
+    username = serializers.CharField(max_length=150)
+    profile = BotProfileDataSerializer()
+
+    class Meta:
+        model = User
+        fields = [
+            "username",
+            "first_name",
+            "last_name",
+            "category",
+            "gender",
+            "prompt",
+            "like_probability",
+            "comment_probability",
+            "follow_probability",
+            "unfollow_probability",
+            "repost_probability",
+            "profile",
+        ]
+
+
 class FullUserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -1,3 +1,518 @@
-from django.test import TestCase
+import datetime
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from api.pagination import ProfileCursorPagination
+from network import timelines
+from network.models import (
+    Comment,
+    Connection,
+    Post,
+    Profile,
+    Reaction,
+    SearchToken,
+    TimelineEntry,
+    User,
+)
+
+
+def create_user(username, name=None):
+    user = User.objects.create(username=username, is_bot=True)
+    Profile.objects.create(
+        user=user,
+        name=name or username,
+        image="https://example.com/avatar.png",
+        dob=datetime.date(1990, 1, 1),
+    )
+    return user
+
+
+class QueryCountTestCase(APITestCase):
+    """
+    Guards list endpoints against N+1 queries.
+
+    `assertConstantQueries` requests an endpoint, adds more rows and requests it
+    again; the number of queries must not depend on the number of rows returned.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client.credentials(HTTP_X_API_KEY=settings.STATIC_API_KEY)
+        self.users = [self.create_user(i) for i in range(3)]
+
+    def create_user(self, i):
+        return create_user(f"user{i}", f"User {i}")
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries), response.json()
+
+    def assertConstantQueries(self, url, add_rows, small=2, large=25):
+        # Cache versions are bumped on commit
+        with self.captureOnCommitCallbacks(execute=True):
+            add_rows(small)
+        small_queries, small_data = self.count_queries(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            add_rows(large - small)
+        large_queries, large_data = self.count_queries(url)
+        self.assertEqual(len(small_data), small)
+        self.assertEqual(len(large_data), large)
+        self.assertEqual(
+            small_queries,
+            large_queries,
+            f"{url} ran {small_queries} queries for {small} rows "
+            f"and {large_queries} for {large}",
+        )
+
+
+class PostQueryCountTests(QueryCountTestCase):
+    def add_posts(self, count):
+        for i in range(count):
+            post = Post.objects.create(user=self.users[i % 3], content=f"post {i}")
+            Reaction.objects.create(post=post, user=self.users[(i + 1) % 3])
+            Comment.objects.create(
+                post=post, user=self.users[(i + 2) % 3], content="hi"
+            )
+
+    def test_post_list(self):
+        self.assertConstantQueries("/api/posts/", self.add_posts)
+
+    def test_post_list_counts(self):
+        self.add_posts(1)
+        _, data = self.count_queries("/api/posts/")
+        self.assertEqual(data[0]["reactions_count"], 1)
+        self.assertEqual(data[0]["comments_count"], 1)
+        self.assertEqual(data[0]["user"]["name"], "User 0")
+
+
+class CommentQueryCountTests(QueryCountTestCase):
+    def setUp(self):
+        super().setUp()
+        self.post = Post.objects.create(user=self.users[0], content="post")
+
+    def add_comments(self, count):
+        for i in range(count):
+            Comment.objects.create(
+                post=self.post, user=self.users[i % 3], content=f"comment {i}"
+            )
+
+    def test_comment_list(self):
+        self.assertConstantQueries(
+            f"/api/posts/{self.post.id}/comments/", self.add_comments
+        )
+
+
+class ProfileQueryCountTests(QueryCountTestCase):
+    def setUp(self):
+        super().setUp()
+        Profile.objects.all().delete()
+        User.objects.all().delete()
+        self.users = []
+
+    def add_profiles(self, count):
+        for _ in range(count):
+            user = self.create_user(len(self.users))
+            if self.users:
+                Connection.objects.create(user=user, follower=self.users[0])
+            self.users.append(user)
+
+    def test_profile_list(self):
+        self.assertConstantQueries("/api/profiles/", self.add_profiles)
+
+
+class CursorPaginationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.credentials(HTTP_X_API_KEY=settings.STATIC_API_KEY)
+        users = [create_user(name) for name in ("alice", "bob", "carol")]
+        for i in range(5):
+            Post.objects.create(user=users[i % 3], content=f"post {i}")
+
+    def test_unpaginated_by_default(self):
+        response = self.client.get("/api/posts/")
+        self.assertEqual(len(response.json()), 5)
+
+    def test_pages_follow_cursor(self):
+        seen = []
+        url = "/api/posts/?page_size=2"
+        while url:
+            data = self.client.get(url).json()
+            self.assertLessEqual(len(data["results"]), 2)
+            seen.extend(post["id"] for post in data["results"])
+            url = data["next"]
+        expected = list(
+            Post.objects.order_by("-date", "-id").values_list("id", flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_page_size_is_capped(self):
+        with mock.patch.object(ProfileCursorPagination, "max_page_size", 2):
+            data = self.client.get("/api/profiles/?page_size=100").json()
+        self.assertEqual(len(data["results"]), 2)
+        self.assertIsNotNone(data["next"])
+
+
+class ProfileExportTests(APITestCase):
+    def setUp(self):
+        self.client.credentials(HTTP_X_API_KEY=settings.STATIC_API_KEY)
+        self.bot, self.other = [
+            User.objects.create(username=name, is_bot=True) for name in ("bot", "other")
+        ]
+        for user in (self.bot, self.other):
+            Profile.objects.create(
+                user=user,
+                name=user.username,
+                image="https://example.com/a.png",
+                dob=datetime.date(1990, 1, 1),
+            )
+        self.since = self.client.get("/api/profiles/export/").json()["server_time"]
+
+    def exported(self):
+        data = self.client.get(
+            "/api/profiles/export/", {"updated_since": self.since}
+        ).json()
+        return [profile["username"] for profile in data["results"]]
+
+    def test_counter_changes_are_not_exported(self):
+        Connection.objects.create(user=self.bot, follower=self.other)
+        post = Post.objects.create(user=self.bot, content="post")
+        Reaction.objects.create(post=post, user=self.other)
+        self.assertEqual(self.exported(), [])
+
+    def test_user_and_profile_changes_are_exported(self):
+        self.bot.category = "news"
+        self.bot.save()
+        self.assertEqual(self.exported(), ["bot"])
+        self.other.profile.bio = "Hello"
+        self.other.profile.save()
+        self.assertEqual(self.exported(), ["bot", "other"])
+
+
+class UsernamesTests(APITestCase):
+    def test_filter_by_username(self):
+        self.client.credentials(HTTP_X_API_KEY=settings.STATIC_API_KEY)
+        for name in ("alice", "bob", "carol"):
+            User.objects.create(username=name, is_bot=True)
+        User.objects.create(username="dave")
+        data = self.client.get(
+            "/api/users/usernames/",
+            {"username": ["bob", "dave", "gone"], "is_bot": "true"},
+        ).json()
+        self.assertEqual([user["username"] for user in data["results"]], ["bob"])
+
+
+class TimelineTests(APITestCase):
+    def setUp(self):
+        self.client.credentials(HTTP_X_API_KEY=settings.STATIC_API_KEY)
+        self.reader, self.author, self.other = [
+            create_user(name) for name in ("reader", "author", "other")
+        ]
+
+    def create_posts(self, user, count):
+        # Fan-out runs on commit
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(count):
+                Post.objects.create(user=user, content=f"post {i}")
+
+    def test_timeline_pages(self):
+        reader, author, other = self.reader, self.author, self.other
+        Connection.objects.create(user=author, follower=reader)
+        self.create_posts(author, 5)
+        self.create_posts(other, 1)
+
+        seen = []
+        url = f"/api/users/{reader.id}/timeline/?limit=2"
+        while url:
+            data = self.client.get(url).json()
+            seen.extend(post["id"] for post in data["results"])
+            url = data["next_cursor"] and (
+                f"/api/users/{reader.id}/timeline/?limit=2&cursor={data['next_cursor']}"
+            )
+        expected = Post.objects.filter(user=author).order_by("-date", "-id")
+        self.assertEqual(seen, list(expected.values_list("id", flat=True)))
+
+    def test_fan_out_waits_for_commit(self):
+        Connection.objects.create(user=self.author, follower=self.reader)
+        with self.captureOnCommitCallbacks() as callbacks:
+            Post.objects.create(user=self.author, content="post")
+            self.assertFalse(TimelineEntry.objects.filter(user=self.reader).exists())
+        for callback in callbacks:
+            callback()
+        self.assertTrue(TimelineEntry.objects.filter(user=self.reader).exists())
+
+    @override_settings(TIMELINE_MAX_LENGTH=3)
+    def test_fan_out_and_reads_do_not_trim(self):
+        reader, author = self.reader, self.author
+        Connection.objects.create(user=author, follower=reader)
+        with CaptureQueriesContext(connection) as context:
+            self.create_posts(author, 5)
+            self.client.get(f"/api/users/{reader.id}/timeline/")
+        for query in context.captured_queries:
+            self.assertFalse(
+                query["sql"].startswith('DELETE FROM "network_timelineentry"'),
+                query["sql"],
+            )
+        self.assertEqual(TimelineEntry.objects.filter(user=reader).count(), 5)
+
+    def test_trim_all(self):
+        reader, author, other = self.reader, self.author, self.other
+        for follower in (reader, other):
+            Connection.objects.create(user=author, follower=follower)
+        self.create_posts(author, 5)
+        with override_settings(TIMELINE_MAX_LENGTH=2):
+            self.assertEqual(timelines.trim_all(batch_size=1), 6)
+        newest = Post.objects.order_by("-date", "-id").values_list("id", flat=True)
+        for follower in (reader, other):
+            self.assertEqual(
+                sorted(
+                    TimelineEntry.objects.filter(user=follower).values_list(
+                        "post_id", flat=True
+                    )
+                ),
+                sorted(newest[:2]),
+            )
+
+
+class SearchTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.credentials(HTTP_X_API_KEY=settings.STATIC_API_KEY)
+        self.users = [create_user(f"user{i}") for i in range(3)]
+
+    def test_posts_ranked_by_relevance(self):
+        once = Post.objects.create(user=self.users[0], content="I like python")
+        twice = Post.objects.create(user=self.users[1], content="python, python")
+        both = Post.objects.create(user=self.users[2], content="django and python")
+        Post.objects.create(user=self.users[0], content="unrelated")
+
+        data = self.client.get("/api/posts/?search=python").json()
+        self.assertEqual([post["id"] for post in data], [twice.id, both.id, once.id])
+        data = self.client.get("/api/posts/?search=python django").json()
+        self.assertEqual(data[0]["id"], both.id)
+
+    def test_edited_post_is_reindexed(self):
+        post = Post.objects.create(user=self.users[0], content="python")
+        post.content = "rust"
+        post.save()
+        self.assertEqual(self.client.get("/api/posts/?search=python").json(), [])
+        self.assertEqual(len(self.client.get("/api/posts/?search=rust").json()), 1)
+
+    def test_profiles_by_username(self):
+        data = self.client.get("/api/profiles/?search=user1").json()
+        self.assertEqual([profile["username"] for profile in data], ["user1"])
+
+    def test_stopwords_are_not_indexed(self):
+        post = Post.objects.create(user=self.users[0], content="The news of the day")
+        self.assertFalse(SearchToken.objects.filter(term="the").exists())
+        self.assertEqual(self.client.get("/api/posts/?search=the").json(), [])
+        data = self.client.get("/api/posts/?search=the news").json()
+        self.assertEqual([item["id"] for item in data], [post.id])
+
+    def test_renamed_user_is_reindexed(self):
+        user = self.users[1]
+        user.username = "renamed"
+        user.save()
+        data = self.client.get("/api/profiles/?search=renamed").json()
+        self.assertEqual([profile["username"] for profile in data], ["renamed"])
+
+
+class CachedListTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.credentials(HTTP_X_API_KEY=settings.STATIC_API_KEY)
+        self.author, self.reader = [create_user(name) for name in ("author", "reader")]
+        self.posts = [
+            Post.objects.create(user=self.reader, content=f"post {i}") for i in range(3)
+        ]
+        self.post = Post.objects.create(user=self.author, content="post")
+
+    def first_post(self):
+        return self.client.get("/api/posts/").json()[0]
+
+    def test_like_only_reloads_the_liked_post(self):
+        self.client.get("/api/posts/")
+        with self.captureOnCommitCallbacks(execute=True):
+            Reaction.objects.create(post=self.post, user=self.reader)
+        with CaptureQueriesContext(connection) as context:
+            data = self.client.get("/api/posts/").json()
+        self.assertEqual(data[0]["reactions_count"], 1)
+        # Besides the ETag aggregates, only the liked post was read again
+        reads = [
+            query["sql"]
+            for query in context.captured_queries
+            if '"network_post"."content"' in query["sql"]
+        ]
+        self.assertEqual(len(reads), 1)
+        self.assertIn(f"IN ({self.post.id})", reads[0])
+
+    def test_user_changes_reach_cached_posts(self):
+        self.client.get("/api/posts/")
+        profile = self.author.profile
+        profile.name = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.save()
+        data = self.client.get("/api/posts/").json()
+        self.assertEqual(data[0]["user"]["name"], "Renamed")
+
+    def test_bumps_wait_for_commit(self):
+        self.client.get("/api/posts/")
+        with self.captureOnCommitCallbacks() as callbacks:
+            Reaction.objects.create(post=self.post, user=self.reader)
+            self.assertEqual(self.first_post()["reactions_count"], 0)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.first_post()["reactions_count"], 1)
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.credentials(HTTP_X_API_KEY=settings.STATIC_API_KEY)
+        self.author, self.reader = [create_user(name) for name in ("author", "reader")]
+        self.post = Post.objects.create(user=self.author, content="post")
+        Comment.objects.create(post=self.post, user=self.reader, content="comment")
+
+    def revalidate(self, url, etag):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_unchanged_list_is_not_fetched(self):
+        url = "/api/posts/"
+        etag = self.client.get(url)["ETag"]
+        with CaptureQueriesContext(connection) as context:
+            response = self.revalidate(url, etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        # Only the validator aggregates ran, no post or comment rows were read
+        for query in context.captured_queries:
+            self.assertNotIn('"content"', query["sql"])
+
+    def test_changes_invalidate_posts(self):
+        url = "/api/posts/"
+        etag = self.client.get(url)["ETag"]
+        updated_at = self.post.updated_at
+        with self.captureOnCommitCallbacks(execute=True):
+            Reaction.objects.create(post=self.post, user=self.reader)
+        response = self.revalidate(url, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]["reactions_count"], 1)
+        # Counters have their own timestamp, updated_at only follows edits
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.updated_at, updated_at)
+
+        etag = response["ETag"]
+        Post.objects.create(user=self.reader, content="newer").delete()
+        self.assertEqual(self.revalidate(url, etag).status_code, 200)
+
+    def test_changes_invalidate_comments(self):
+        url = f"/api/posts/{self.post.id}/comments/"
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.revalidate(url, etag).status_code, 304)
+
+        comment = self.post.comments.get()
+        comment.content = "edited"
+        with self.captureOnCommitCallbacks(execute=True):
+            comment.save()
+        response = self.revalidate(url, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]["content"], "edited")
+
+        etag = response["ETag"]
+        profile = self.reader.profile
+        profile.name = "Renamed"
+        profile.save()
+        self.assertEqual(self.revalidate(url, etag).status_code, 200)
+
+    def test_missing_post_is_not_found(self):
+        response = self.client.get("/api/posts/0/comments/", HTTP_IF_NONE_MATCH="*")
+        self.assertNotEqual(response.status_code, 304)
+        self.assertEqual(self.client.get("/api/posts/0/").status_code, 404)
+
+
+class SparseFieldsetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.credentials(HTTP_X_API_KEY=settings.STATIC_API_KEY)
+        self.author, reader = [create_user(name) for name in ("author", "reader")]
+        self.post = Post.objects.create(user=self.author, content="post")
+        Comment.objects.create(post=self.post, user=reader, content="comment")
+
+    def test_fields_and_omit(self):
+        data = self.client.get("/api/posts/?fields=id,content").json()
+        self.assertEqual(data, [{"id": self.post.id, "content": "post"}])
+        data = self.client.get("/api/profiles/?omit=following,email").json()
+        self.assertNotIn("following", data[0])
+        self.assertIn("username", data[0])
+
+    def test_unrequested_relations_are_not_joined(self):
+        for url in [
+            "/api/posts/?omit=user",
+            f"/api/posts/{self.post.id}/comments/?fields=id",
+        ]:
+            with CaptureQueriesContext(connection) as context:
+                self.client.get(url)
+            for query in context.captured_queries:
+                if '"network_profile"."name"' in query["sql"]:
+                    self.fail(f"{url} read profiles: {query['sql']}")
+
+    def test_compact_view(self):
+        data = self.client.get("/api/posts/?view=compact").json()
+        self.assertEqual(
+            set(data[0]),
+            {"id", "content", "date", "reactions_count", "comments_count", "user"},
+        )
+        self.assertEqual(
+            data[0]["user"],
+            {"id": self.author.id, "username": "author", "name": "author"},
+        )
+        data = self.client.get(
+            f"/api/posts/{self.post.id}/comments/?view=compact&fields=content"
+        ).json()
+        self.assertEqual(data, [{"content": "comment"}])
+
+
+class BulkCreateTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.credentials(HTTP_X_API_KEY=settings.STATIC_API_KEY)
+
+    def bulk_create(self, *usernames):
+        bots = [
+            {
+                "username": username,
+                "first_name": username.capitalize(),
+                "profile": {
+                    "name": f"{username.capitalize()} Bot",
+                    "image": "https://example.com/avatar.png",
+                    "dob": "1990-01-01",
+                },
+            }
+            for username in usernames
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/api/users/bulk/", {"bots": bots}, format="json"
+            )
+        self.assertEqual(response.status_code, 201)
+        return response.json()
+
+    def test_bulk_create_reaches_cached_profiles(self):
+        self.assertEqual(self.client.get("/api/profiles/?is_bot=true").json(), [])
+        self.bulk_create("alice", "bob")
+        data = self.client.get("/api/profiles/?is_bot=true").json()
+        self.assertEqual(
+            sorted(profile["username"] for profile in data), ["alice", "bob"]
+        )
+
+    def test_bulk_created_profiles_are_searchable(self):
+        self.bulk_create("alice", "bob")
+        for username in ("alice", "bob"):
+            data = self.client.get("/api/profiles/", {"search": username}).json()
+            self.assertEqual([profile["username"] for profile in data], [username])
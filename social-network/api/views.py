@@ -7,32 +7,142 @@ from rest_framework.permissions import (
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.filters import SearchFilter
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from network import caching, search, timelines
 from network.models import *
 from .serializers import *
+from .caching import CachedListMixin, ConditionalGetMixin
+from .fieldsets import SparseFieldsetViewMixin, reads_relation
+from .filters import FullTextSearchFilter
+from .pagination import (
+    CommentCursorPagination,
+    KeysetPagination,
+    PostCursorPagination,
+    ProfileCursorPagination,
+    ProfileExportPagination,
+)
+
+
+BULK_CREATE_MAX_BOTS = 500
+
+
+def parse_is_bot(request):
+    """Read the optional `is_bot` query flag; returns None when absent or invalid."""
+    is_bot = request.GET.get("is_bot")
+    if is_bot is None:
+        return None
+    return {"true": True, "false": False}.get(is_bot.lower())
+
+
+def user_validators():
+    """
+    Conditional GET validators covering every user and profile.
+
+    Following, unfollowing and deleting a post move User.counters_changed_at;
+    the count catches deleted users.
+    """
+    users = User.objects.aggregate(
+        modified=Max("updated_at"),
+        counters_changed=Max("counters_changed_at"),
+        count=Count("id"),
+    )
+    profiles = Profile.objects.aggregate(modified=Max("updated_at"))
+    timestamps = [users["modified"], users["counters_changed"], profiles["modified"]]
+    return timestamps, [*timestamps, users["count"]]
+
+
+def row_validators(model, lookup, *fields):
+    """Conditional GET validators from `fields` of one row; None if it is missing."""
+    try:
+        row = model.objects.filter(**lookup).values_list(*fields).first()
+    except (TypeError, ValueError):
+        return None  # malformed lookup, left to the view's 404
+    if row is None:
+        return None
+    return row, row
 
 
 # Get all users
-class ProfileViewSet(viewsets.ModelViewSet):
+class ProfileViewSet(
+    SparseFieldsetViewMixin,
+    ConditionalGetMixin,
+    CachedListMixin,
+    viewsets.ModelViewSet,
+):
     serializer_class = ProfileSerializer
+    compact_serializer_class = CompactProfileSerializer
     queryset = Profile.objects.all()
-    filter_backends = [SearchFilter]
-    search_fields = ["name", "user__username"]
+    filter_backends = [FullTextSearchFilter]
     lookup_field = "user"
+    pagination_class = ProfileCursorPagination
+    cache_namespaces = ["profiles"]
     http_method_names = ["get", "post", "head", "options"]
 
     def get_queryset(self):
         queryset = Profile.objects.all()
+        if reads_relation(self.get_fields(), "user"):
+            queryset = queryset.select_related("user")
         request = getattr(self, 'request', None)
         if request is not None:
-            is_bot = request.GET.get('is_bot')
+            is_bot = parse_is_bot(request)
             if is_bot is not None:
-                if is_bot.lower() == 'true':
-                    queryset = queryset.filter(user__is_bot=True)
-                elif is_bot.lower() == 'false':
-                    queryset = queryset.filter(user__is_bot=False)
+                queryset = queryset.filter(user__is_bot=is_bot)
         return queryset
 
+    def get_item_cache_namespaces(self, obj):
+        return [f"user:{obj.user_id}"]
+
+    def get_validators(self):
+        if self.action == "retrieve":
+            return row_validators(
+                Profile,
+                {"user": self.kwargs["user"]},
+                "updated_at",
+                "user__updated_at",
+                "user__counters_changed_at",
+            )
+        return user_validators()
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="export",
+        serializer_class=ProfileExportSerializer,
+        pagination_class=ProfileExportPagination,
+        filter_backends=[],
+    )
+    def export(self, request):
+        """
+        Keyset-paginated profile export (`?after=<next_cursor>&limit=`), ordered by user id.
+
+        `updated_since` (ISO 8601) limits the export to profiles whose profile or
+        user row changed since then (network.signals touches the profile when its
+        user is saved). `server_time` is taken before querying, so it
+        can be used as the next `updated_since` without missing concurrent writes.
+        """
+        server_time = timezone.now()
+        queryset = self.get_queryset()
+        updated_since = request.query_params.get("updated_since")
+        if updated_since:
+            since = parse_datetime(updated_since)
+            if since is None:
+                return Response(
+                    {"detail": "updated_since must be an ISO 8601 datetime"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since, timezone.utc)
+            queryset = queryset.filter(updated_at__gte=since)
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        response = self.get_paginated_response(serializer.data)
+        response.data["server_time"] = server_time.isoformat()
+        return response
+
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -44,30 +154,71 @@ class ProfileViewSet(viewsets.ModelViewSet):
 
 
 # Get all posts and like a post
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(
+    SparseFieldsetViewMixin,
+    ConditionalGetMixin,
+    CachedListMixin,
+    viewsets.ModelViewSet,
+):
     serializer_class = PostSerializer
+    compact_serializer_class = CompactPostSerializer
     queryset = Post.objects.all().order_by("-date")
-    filter_backends = [SearchFilter]
-    search_fields = ["content", "user__username", "user__profile__name"]
+    filter_backends = [FullTextSearchFilter]
     lookup_field = "id"
+    pagination_class = PostCursorPagination
+    cache_namespaces = ["posts"]
     http_method_names = ["get", "post", "head", "options"]
 
     def get_queryset(self):
-        queryset = Post.objects.all().order_by("-date")
-        request = getattr(self, "request", None)
-        if request is not None:
-            params = getattr(request, "query_params", None)
-            if params is not None:
-                limit = params.get("limit")
-                if limit is not None:
-                    try:
-                        limit = int(limit)
-                        if limit > 0:
-                            queryset = queryset[:limit]
-                    except ValueError:
-                        pass  # ignore invalid limit
+        # The author and profile are only joined when `user` is requested;
+        # the counters are columns
+        queryset = Post.objects.order_by("-date")
+        if reads_relation(self.get_fields(), "user"):
+            queryset = queryset.select_related("user__profile")
+        return queryset
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        # `limit` predates pagination and only applies to unpaginated lists
+        if self.action == "list" and not self.paginator.is_requested(self.request):
+            limit = self.request.query_params.get("limit")
+            if limit is not None:
+                try:
+                    limit = int(limit)
+                    if limit > 0:
+                        queryset = queryset[:limit]
+                except ValueError:
+                    pass  # ignore invalid limit
         return queryset
 
+    def get_item_cache_namespaces(self, obj):
+        return [f"post:{obj.pk}", f"user:{obj.user_id}"]
+
+    def get_validators(self):
+        # Reactions and comments move Post.counters_changed_at
+        if self.action == "retrieve":
+            return row_validators(
+                Post,
+                {"id": self.kwargs["id"]},
+                "updated_at",
+                "counters_changed_at",
+                "user__updated_at",
+                "user__profile__updated_at",
+            )
+        posts = Post.objects.aggregate(
+            modified=Max("updated_at"),
+            counters_changed=Max("counters_changed_at"),
+            last_id=Max("id"),
+        )
+        # Posts show their author's username, name and image
+        timestamps, values = user_validators()
+        post_timestamps = [posts["modified"], posts["counters_changed"]]
+        return [*post_timestamps, *timestamps], [
+            *post_timestamps,
+            posts["last_id"],
+            *values,
+        ]
+
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -93,23 +244,63 @@ class PostViewSet(viewsets.ModelViewSet):
         reaction, created = Reaction.objects.get_or_create(post=post, user=user)
         if not created:
             reaction.delete()
-            return Response(
-                {"status": "unliked", "postReactionsCount": post.reactions_count}
-            )
-        return Response({"status": "liked", "postReactionsCount": post.reactions_count})
+        post.refresh_from_db(fields=["reactions_count"])
+        return Response(
+            {
+                "status": "liked" if created else "unliked",
+                "postReactionsCount": post.reactions_count,
+            }
+        )
 
 
 # Get all comments for a post and add a comment
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+    SparseFieldsetViewMixin,
+    ConditionalGetMixin,
+    CachedListMixin,
+    viewsets.ModelViewSet,
+):
     serializer_class = CommentSerializer
+    compact_serializer_class = CompactCommentSerializer
     http_method_names = ["get", "post"]
     lookup_field = "id"
+    pagination_class = CommentCursorPagination
+
+    def get_cache_namespaces(self):
+        return [f"comments:{self.kwargs['post_id']}"]
+
+    def get_item_cache_namespaces(self, obj):
+        # Comment authors' names and images come from their profiles
+        return [f"comment:{obj.pk}", f"user:{obj.user_id}"]
 
     def get_queryset(self):
-        return Comment.objects.filter(post_id=self.kwargs["post_id"])
+        queryset = Comment.objects.filter(post_id=self.kwargs["post_id"])
+        if reads_relation(self.get_fields(), "user"):
+            queryset = queryset.select_related("user__profile")
+        return queryset
+
+    def get_validators(self):
+        post = row_validators(Post, {"id": self.kwargs["post_id"]}, "comments_count")
+        if post is None:
+            return None
+        # comments_count catches deletions, the latest updated_at new and
+        # edited comments
+        comments = Comment.objects.filter(post_id=self.kwargs["post_id"]).aggregate(
+            modified=Max("updated_at"), last_id=Max("id")
+        )
+        # Comments show their author's username, name and image
+        timestamps, values = user_validators()
+        return [comments["modified"], *timestamps], [
+            *post[1],
+            comments["modified"],
+            comments["last_id"],
+            *values,
+        ]
 
     def get_serializer_context(self):
-        return {"post_id": self.kwargs["post_id"]}
+        context = super().get_serializer_context()
+        context["post_id"] = self.kwargs["post_id"]
+        return context
 
     def create(self, request, *args, **kwargs):
         data = request.data.copy()
@@ -130,6 +321,132 @@ class UserViewSet(viewsets.ModelViewSet):
     http_method_names = ["get", "post"]
     permission_classes = [AllowAny]
 
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk",
+        serializer_class=BotAccountSerializer,
+        permission_classes=[AllowAny],
+    )
+    def bulk(self, request):
+        """
+        Create bot users together with their profiles in one request (`{"bots": [...]}`).
+
+        Usernames that already exist, or repeat within the payload, are skipped.
+        Bots get unusable passwords, so no password hashing is done per account.
+        """
+        bots = request.data.get("bots")
+        if not isinstance(bots, list) or not bots:
+            return Response(
+                {"detail": "bots must be a non-empty list"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(bots) > BULK_CREATE_MAX_BOTS:
+            return Response(
+                {"detail": f"At most {BULK_CREATE_MAX_BOTS} bots per request"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        serializer = self.get_serializer(data=bots, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        requested = [item["username"] for item in serializer.validated_data]
+        existing = set(
+            User.objects.filter(username__in=requested).values_list("username", flat=True)
+        )
+        users, profiles, skipped = [], {}, []
+        for item in serializer.validated_data:
+            profile_data = dict(item)
+            user_data = {k: profile_data.pop(k) for k in list(profile_data) if k != "profile"}
+            username = user_data["username"]
+            if username in existing:
+                skipped.append(username)
+                continue
+            existing.add(username)
+            user = User(is_bot=True, **user_data)
+            user.set_unusable_password()
+            users.append(user)
+            profiles[username] = profile_data["profile"]
+
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+            # Not every backend returns primary keys from bulk_create (e.g. MySQL)
+            created = list(
+                User.objects.filter(username__in=profiles).values("id", "username")
+            )
+            Profile.objects.bulk_create(
+                [
+                    Profile(user_id=row["id"], **profiles[row["username"]])
+                    for row in created
+                ]
+            )
+            # bulk_create sends no post_save, so neither the search index nor
+            # the cache signals run
+            if search.backend() == "index":
+                search.index_new_profiles(
+                    Profile.objects.filter(
+                        user_id__in=[row["id"] for row in created]
+                    ).values_list("pk", "name", "user__username")
+                )
+            caching.bump("profiles", *[f"user:{row['id']}" for row in created])
+
+        return Response(
+            {"created": created, "skipped": skipped}, status=status.HTTP_201_CREATED
+        )
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="usernames",
+        pagination_class=KeysetPagination,
+        permission_classes=[AllowAny],
+    )
+    def usernames(self, request):
+        """
+        Keyset-paginated list of user ids and usernames (`?after=&limit=&is_bot=`).
+
+        The first page (no `after`) also carries the total `count`, so callers can
+        detect deletions by comparing counts before paging through everything.
+        Repeated `username` parameters restrict the list to those names, so
+        callers can check which of a batch of names still exist.
+        """
+        queryset = User.objects.all()
+        is_bot = parse_is_bot(request)
+        if is_bot is not None:
+            queryset = queryset.filter(is_bot=is_bot)
+        names = request.query_params.getlist("username")
+        if names:
+            queryset = queryset.filter(username__in=names)
+        page = self.paginate_queryset(queryset.values("id", "username"))
+        response = self.get_paginated_response(page)
+        if not request.query_params.get("after"):
+            response.data["count"] = queryset.count()
+        return response
+
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="timeline",
+        serializer_class=PostSerializer,
+        permission_classes=[AllowAny],
+    )
+    def timeline(self, request, pk=None):
+        """
+        Posts by the users this user follows, newest first (`?cursor=<next_cursor>&limit=`).
+
+        Read from the user's home timeline; see network.timelines.
+        """
+        user = self.get_object()
+        try:
+            limit = int(request.query_params.get("limit", settings.API_PAGE_SIZE))
+        except ValueError:
+            limit = settings.API_PAGE_SIZE
+        limit = max(1, min(limit, settings.API_MAX_PAGE_SIZE))
+        posts, next_cursor = timelines.read(
+            user, cursor=request.query_params.get("cursor"), limit=limit
+        )
+        serializer = self.get_serializer(posts, many=True)
+        return Response({"next_cursor": next_cursor, "results": serializer.data})
+
     @action(
         detail=True, methods=["post"], url_path="follow", permission_classes=[AllowAny]
     )
@@ -209,6 +209,40 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # Add your static API key here (should be kept secret in production)
 STATIC_API_KEY = os.environ.get("API_KEY", "123")
 
+# Opt-in cursor pagination of the API lists (?page_size= or ?cursor=)
+API_PAGE_SIZE = int(os.environ.get("API_PAGE_SIZE", "50"))
+API_MAX_PAGE_SIZE = int(os.environ.get("API_MAX_PAGE_SIZE", "200"))
+
+# Home timelines (network.timelines): posts kept per follower, and the follower
+# count above which an author's posts are read at request time instead of pushed
+TIMELINE_MAX_LENGTH = int(os.environ.get("TIMELINE_MAX_LENGTH", "800"))
+TIMELINE_FANOUT_LIMIT = int(os.environ.get("TIMELINE_FANOUT_LIMIT", "5000"))
+
+# Cache used for rendered post cards, feed pages and API lists (network.caching).
+# Defaults to a per-process memory cache; point CACHE_BACKEND/CACHE_LOCATION at
+# e.g. django.core.cache.backends.redis.RedisCache or FileBasedCache to share it.
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
+        "TIMEOUT": int(os.environ.get("CACHE_TIMEOUT", "300")),
+    }
+}
+if CACHES["default"]["BACKEND"].endswith(("LocMemCache", "FileBasedCache")):
+    CACHES["default"]["OPTIONS"] = {
+        "MAX_ENTRIES": int(os.environ.get("CACHE_MAX_ENTRIES", "10000"))
+    }
+
+# Seconds the approximate post counts shown by the feed pagination are cached
+FEED_COUNT_CACHE_TTL = int(os.environ.get("FEED_COUNT_CACHE_TTL", "300"))
+
+# Full-text search (network.search): "fulltext" (MySQL FULLTEXT indexes),
+# "index" (built-in inverted index) or "auto" (fulltext on MySQL)
+SEARCH_BACKEND = os.environ.get("SEARCH_BACKEND", "auto")
+SEARCH_MAX_RESULTS = int(os.environ.get("SEARCH_MAX_RESULTS", "1000"))
+
 if hasattr(settings, "DJOSER"):
     DJOSER = settings.DJOSER
 else:
@@ -0,0 +1,70 @@
+"""
+Versioned cache keys.
+
+Cached values are stored under keys that embed the current version of every
+namespace they depend on, e.g. "posts" (which posts exist, and their order),
+"post:<id>" (one post with its counters) or "user:<id>" (one user with its
+profile and counters). network.signals bumps the versions when the data
+changes, so stale entries are never read again and simply expire; nothing
+has to find and delete them. Bumps wait for the transaction to commit, so a
+reader running before the commit cannot store old data under the new version.
+
+Versions start from the current time in milliseconds, so a version that was
+evicted from the cache does not come back with a value it had before.
+"""
+
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import transaction
+
+VERSION_PREFIX = "version:"
+
+
+def _initial_version():
+    return int(time.time() * 1000)
+
+
+def versions(*names):
+    """Current versions of the given namespaces, in order."""
+    keys = [VERSION_PREFIX + name for name in names]
+    found = cache.get_many(keys)
+    missing = {key: _initial_version() for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        found.update(missing)
+    return [found[key] for key in keys]
+
+
+def bump(*names):
+    """Invalidate everything cached under the given namespaces, once committed."""
+    transaction.on_commit(lambda: _bump(names))
+
+
+def _bump(names):
+    for name in names:
+        key = VERSION_PREFIX + name
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _initial_version(), timeout=None)
+
+
+def make_key(prefix, parts, depends_on):
+    """Cache key for `parts` that changes whenever a namespace in `depends_on` is bumped."""
+    version = ".".join(str(v) for v in versions(*depends_on))
+    # Parts can come from query strings; hashing keeps keys short and memcached-safe
+    digest = hashlib.md5(repr(list(parts)).encode()).hexdigest()
+    return f"{prefix}:{version}:{digest}"
+
+
+def get_or_set(prefix, parts, depends_on, compute, timeout=DEFAULT_TIMEOUT):
+    """Cached result of `compute()`, recomputed once a `depends_on` namespace changes."""
+    key = make_key(prefix, parts, depends_on)
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value, timeout)
+    return value
@@ -0,0 +1,69 @@
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+# (model, counter field, counted model, foreign key of the counted model to model)
+COUNTERS = [
+    ("Post", "reactions_count", "Reaction", "post"),
+    ("Post", "comments_count", "Comment", "post"),
+    ("User", "followers_count", "Connection", "user"),
+    ("User", "following_count", "Connection", "follower"),
+    ("User", "posts_count", "Post", "user"),
+]
+
+
+def increment(model, pk, field):
+    """Atomically add one to a counter column."""
+    model.objects.filter(pk=pk).update(
+        **{field: F(field) + 1, "counters_changed_at": timezone.now()}
+    )
+
+
+def decrement(model, pk, field):
+    """Atomically subtract one from a counter column, never going below zero."""
+    model.objects.filter(pk=pk, **{f"{field}__gt": 0}).update(
+        **{field: F(field) - 1, "counters_changed_at": timezone.now()}
+    )
+
+
+def actual_count(counted, fk):
+    """Correlated COUNT(*) of `counted` rows pointing at the outer row."""
+    return Coalesce(
+        Subquery(
+            counted.objects.filter(**{fk: OuterRef("pk")})
+            .order_by()
+            .values(fk)
+            .annotate(count=Count("pk"))
+            .values("count"),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def reconcile_counters(apps, dry_run=False, batch_size=1000):
+    """
+    Recount every stored counter and fix the rows that drifted.
+
+    `apps` is an app registry (`django.apps.apps`, or the historical one in a
+    data migration). Returns the number of wrong rows per "Model.field".
+    """
+    fixed = {}
+    for model_name, field, counted_name, fk in COUNTERS:
+        model = apps.get_model("network", model_name)
+        counted = apps.get_model("network", counted_name)
+        expression = actual_count(counted, fk)
+        wrong = list(
+            model.objects.annotate(actual=expression)
+            .exclude(**{field: F("actual")})
+            .values_list("pk", flat=True)
+        )
+        if not dry_run:
+            # Primary keys are listed first: MySQL cannot update a table while
+            # selecting from it in the same statement
+            for start in range(0, len(wrong), batch_size):
+                model.objects.filter(pk__in=wrong[start : start + batch_size]).update(
+                    **{field: expression}
+                )
+        fixed[f"{model_name}.{field}"] = len(wrong)
+    return fixed
@@ -0,0 +1,176 @@
+import random
+import statistics
+import time
+
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from network.counters import reconcile_counters
+from network.models import Comment, Post, User
+
+BENCH_PREFIX = "bench_"
+# Indexes added by migration 0007, by model
+INDEX_NAMES = {
+    User: ["user_is_bot_idx"],
+    Post: ["post_date_idx", "post_user_pinned_date_idx"],
+    Comment: ["comment_post_date_idx"],
+}
+
+
+def indexes_under_test():
+    return [
+        (model, index)
+        for model, names in INDEX_NAMES.items()
+        for index in model._meta.indexes
+        if index.name in names
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed synthetic users, posts and comments, then print the query plan and "
+        "latency of the feed, profile, comment and bot-list queries. Run it again "
+        "with --skip-seed --without-indexes to compare against the same data "
+        "without the indexes of migration 0007. Use a scratch database: seeded "
+        "rows are not removed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--posts", type=int, default=1_000_000)
+        parser.add_argument(
+            "--comments",
+            type=int,
+            default=200_000,
+            help="Comments spread over the posts",
+        )
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument(
+            "--repeat", type=int, default=20, help="Timed runs per query"
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--skip-seed",
+            action="store_true",
+            help="Only run the queries against the existing data",
+        )
+        parser.add_argument(
+            "--without-indexes",
+            action="store_true",
+            help="Drop the indexes under test for the timed runs, then recreate them",
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        if not options["skip_seed"]:
+            self.seed(rng, options)
+
+        user = (
+            User.objects.filter(username__startswith=BENCH_PREFIX)
+            .order_by("id")
+            .first()
+        )
+        post = Post.objects.filter(user=user).order_by("-date").first()
+        if user is None or post is None:
+            self.stderr.write("No benchmark data, run without --skip-seed first")
+            return
+
+        if options["without_indexes"]:
+            with connection.schema_editor() as editor:
+                for model, index in indexes_under_test():
+                    editor.remove_index(model, index)
+            try:
+                self.run_queries(user, post, options)
+            finally:
+                with connection.schema_editor() as editor:
+                    for model, index in indexes_under_test():
+                        editor.add_index(model, index)
+        else:
+            self.run_queries(user, post, options)
+
+    def run_queries(self, user, post, options):
+        queries = {
+            "feed": lambda: Post.objects.order_by("-date", "-id")[:25],
+            "profile": lambda: Post.objects.filter(user=user).order_by(
+                "-ispinned", "-date"
+            )[:10],
+            "comments": lambda: Comment.objects.filter(post=post).order_by(
+                "date", "id"
+            )[:50],
+            "bots": lambda: User.objects.filter(is_bot=True).order_by("id")[:500],
+        }
+        for name, build in queries.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f"== {name}"))
+            self.stdout.write(build().explain())
+            timings = []
+            for _ in range(options["repeat"]):
+                started = time.perf_counter()
+                list(build())
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            self.stdout.write(
+                f"median {statistics.median(timings):.2f} ms, p95 {p95:.2f} ms, "
+                f"max {timings[-1]:.2f} ms over {len(timings)} runs"
+            )
+
+    def seed(self, rng, options):
+        batch_size = options["batch_size"]
+        start = User.objects.filter(username__startswith=BENCH_PREFIX).count()
+        password = make_password(None)
+        users = [
+            User(username=f"{BENCH_PREFIX}{i}", is_bot=True, password=password)
+            for i in range(start, start + options["users"])
+        ]
+        User.objects.bulk_create(users, batch_size=batch_size)
+        user_ids = list(
+            User.objects.filter(username__startswith=BENCH_PREFIX).values_list(
+                "id", flat=True
+            )
+        )
+        self.stdout.write(f"Seeded {len(users)} users")
+
+        created = 0
+        while created < options["posts"]:
+            count = min(batch_size, options["posts"] - created)
+            Post.objects.bulk_create(
+                Post(
+                    user_id=rng.choice(user_ids),
+                    content=f"Benchmark post {created + i}",
+                )
+                for i in range(count)
+            )
+            created += count
+            self.stdout.write(f"Seeded {created}/{options['posts']} posts", ending="\r")
+        self.stdout.write("")
+
+        post_ids = list(
+            Post.objects.values_list("id", flat=True).order_by("-id")[
+                : options["posts"]
+            ]
+        )
+        created = 0
+        while created < options["comments"]:
+            count = min(batch_size, options["comments"] - created)
+            Comment.objects.bulk_create(
+                Comment(
+                    post_id=rng.choice(post_ids),
+                    user_id=rng.choice(user_ids),
+                    content="Benchmark comment",
+                )
+                for _ in range(count)
+            )
+            created += count
+        self.stdout.write(f"Seeded {created} comments")
+
+        # bulk_create bypasses the counter signals
+        reconcile_counters(apps, batch_size=batch_size)
+        with connection.cursor() as cursor:
+            if connection.vendor == "mysql":
+                cursor.execute(
+                    "ANALYZE TABLE network_user, network_post, network_comment"
+                )
+            elif connection.vendor in ("sqlite", "postgresql"):
+                cursor.execute("ANALYZE")
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from network import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the inverted search index of posts and profiles"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Index rows inserted per INSERT statement",
+        )
+
+    def handle(self, *args, batch_size=1000, **options):
+        if search.backend() != "index":
+            self.stdout.write(
+                "Search uses MySQL FULLTEXT indexes, the inverted index is not used"
+            )
+            return
+        indexed = search.rebuild_index(batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"{indexed} posts and profiles indexed"))
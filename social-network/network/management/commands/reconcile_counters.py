@@ -0,0 +1,28 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from network.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = "Recount the stored post and user counters and fix the ones that drifted"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report wrong counters without fixing them",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows fixed per UPDATE statement",
+        )
+
+    def handle(self, *args, dry_run=False, batch_size=1000, **options):
+        fixed = reconcile_counters(apps, dry_run=dry_run, batch_size=batch_size)
+        verb = "wrong" if dry_run else "fixed"
+        for counter, count in fixed.items():
+            self.stdout.write(f"{counter}: {count} {verb}")
+        self.stdout.write(self.style.SUCCESS(f"{sum(fixed.values())} counters {verb}"))
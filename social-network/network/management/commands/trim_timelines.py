@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from network import timelines
+from network.models import User
+
+
+class Command(BaseCommand):
+    help = "Trim home timelines to TIMELINE_MAX_LENGTH entries, or rebuild them"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Refill every timeline from the followed authors' posts",
+        )
+        parser.add_argument(
+            "--user",
+            help="Only rebuild the timeline of this username (implies --rebuild)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Timelines trimmed per batch of user ids",
+        )
+
+    def handle(self, *args, rebuild=False, user=None, batch_size=1000, **options):
+        if user:
+            users = User.objects.filter(username=user)
+        elif rebuild:
+            users = User.objects.filter(following__isnull=False).distinct()
+        else:
+            deleted = timelines.trim_all(batch_size=batch_size)
+            self.stdout.write(self.style.SUCCESS(f"{deleted} timeline entries trimmed"))
+            return
+
+        rebuilt = 0
+        for user in users.iterator():
+            timelines.rebuild(user)
+            rebuilt += 1
+        self.stdout.write(self.style.SUCCESS(f"{rebuilt} timelines rebuilt"))
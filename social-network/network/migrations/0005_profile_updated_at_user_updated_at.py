@@ -0,0 +1,40 @@
+# Generated by Django 4.2.3 on 2026-10-18 22:23
+
+import django.contrib.auth.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('network', '0004_alter_user_gender'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BotUser',
+            fields=[
+            ],
+            options={
+                'verbose_name': 'Bot',
+                'verbose_name_plural': 'Bots',
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('network.user',),
+            managers=[
+                ('objects', django.contrib.auth.models.UserManager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
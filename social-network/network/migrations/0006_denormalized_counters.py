@@ -0,0 +1,63 @@
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+# (model, counter field, counted model, foreign key of the counted model to model)
+COUNTERS = [
+    ("Post", "reactions_count", "Reaction", "post"),
+    ("Post", "comments_count", "Comment", "post"),
+    ("User", "followers_count", "Connection", "user"),
+    ("User", "following_count", "Connection", "follower"),
+    ("User", "posts_count", "Post", "user"),
+]
+
+
+def backfill_counters(apps, schema_editor):
+    for model_name, field, counted_name, fk in COUNTERS:
+        model = apps.get_model("network", model_name)
+        counted = apps.get_model("network", counted_name)
+        count = Subquery(
+            counted.objects.filter(**{fk: OuterRef("pk")})
+            .order_by()
+            .values(fk)
+            .annotate(count=Count("pk"))
+            .values("count"),
+            output_field=IntegerField(),
+        )
+        model.objects.update(**{field: Coalesce(count, 0)})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('network', '0005_profile_updated_at_user_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='posts_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='reactions_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
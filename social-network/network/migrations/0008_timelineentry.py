@@ -0,0 +1,82 @@
+# Generated by Django 4.2.3 on 2026-10-18 22:59
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_timelines(apps, schema_editor):
+    Connection = apps.get_model("network", "Connection")
+    Post = apps.get_model("network", "Post")
+    TimelineEntry = apps.get_model("network", "TimelineEntry")
+    pushed = Connection.objects.exclude(
+        user__followers_count__gt=settings.TIMELINE_FANOUT_LIMIT
+    )
+    follower_ids = pushed.values_list("follower_id", flat=True).distinct()
+    for follower_id in list(follower_ids):
+        authors = pushed.filter(follower_id=follower_id).values("user_id")
+        posts = (
+            Post.objects.filter(user_id__in=models.Subquery(authors))
+            .order_by("-date", "-id")
+            .values_list("id", "date")[: settings.TIMELINE_MAX_LENGTH]
+        )
+        TimelineEntry.objects.bulk_create(
+            [
+                TimelineEntry(user_id=follower_id, post_id=post_id, date=date)
+                for post_id, date in posts
+            ],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("network", "0007_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TimelineEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateTimeField()),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="network.post"
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="timeline",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["user", "date", "post"], name="timeline_user_date_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="timelineentry",
+            constraint=models.UniqueConstraint(
+                fields=("user", "post"), name="unique timeline entry"
+            ),
+        ),
+        migrations.RunPython(fill_timelines, migrations.RunPython.noop),
+    ]
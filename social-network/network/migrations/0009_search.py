@@ -0,0 +1,106 @@
+# Generated by Django 4.2.3 on 2026-10-18 23:03
+
+import re
+from collections import Counter
+
+from django.db import migrations, models
+
+FULLTEXT_INDEXES = [
+    ("network_post", "post_content_fulltext", "content"),
+    ("network_profile", "profile_name_fulltext", "name"),
+]
+
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text):
+    # network.search.tokenize as of this migration; 0013 drops the stopwords
+    return Counter(
+        word[:64] for word in WORD_RE.findall((text or "").lower()) if len(word) > 1
+    )
+
+
+def search_tokens(apps):
+    Post = apps.get_model("network", "Post")
+    Profile = apps.get_model("network", "Profile")
+    SearchToken = apps.get_model("network", "SearchToken")
+    for pk, content in Post.objects.values_list("pk", "content").iterator():
+        for term, weight in tokenize(content).items():
+            yield SearchToken(kind="post", object_id=pk, term=term, weight=weight)
+    profiles = Profile.objects.values_list("pk", "name", "user__username")
+    for pk, name, username in profiles.iterator():
+        tokens = tokenize(name)
+        tokens.update({term: 2 for term in tokenize(username)})
+        for term, weight in tokens.items():
+            yield SearchToken(kind="profile", object_id=pk, term=term, weight=weight)
+
+
+def fill_search_tokens(apps):
+    SearchToken = apps.get_model("network", "SearchToken")
+    batch = []
+    for token in search_tokens(apps):
+        batch.append(token)
+        if len(batch) >= 1000:
+            SearchToken.objects.bulk_create(batch)
+            batch = []
+    SearchToken.objects.bulk_create(batch)
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "mysql":
+        for table, name, column in FULLTEXT_INDEXES:
+            schema_editor.execute(f"CREATE FULLTEXT INDEX {name} ON {table} ({column})")
+    else:
+        fill_search_tokens(apps)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "mysql":
+        for table, name, _ in FULLTEXT_INDEXES:
+            schema_editor.execute(f"DROP INDEX {name} ON {table}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("network", "0008_timelineentry"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchToken",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("post", "Post"), ("profile", "Profile")],
+                        max_length=10,
+                    ),
+                ),
+                ("object_id", models.PositiveBigIntegerField()),
+                ("term", models.CharField(max_length=64)),
+                ("weight", models.PositiveIntegerField(default=1)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["kind", "term", "object_id"], name="search_term_idx"
+                    ),
+                    models.Index(
+                        fields=["kind", "object_id"], name="search_object_idx"
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,37 @@
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_comment_updated_at(apps, schema_editor):
+    Comment = apps.get_model("network", "Comment")
+    Comment.objects.update(updated_at=F("date"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('network', '0010_post_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='counters_changed_at',
+            field=models.DateTimeField(db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='counters_changed_at',
+            field=models.DateTimeField(db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='updated_at',
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_comment_updated_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_profile_updated_at(apps, schema_editor):
+    # Profiles whose user changed later than the profile itself
+    Profile = apps.get_model("network", "Profile")
+    User = apps.get_model("network", "User")
+    user_updated_at = Subquery(
+        User.objects.filter(pk=OuterRef("user_id")).values("updated_at")[:1]
+    )
+    stale = list(
+        Profile.objects.annotate(user_updated_at=user_updated_at)
+        .filter(updated_at__lt=user_updated_at)
+        .values_list("pk", flat=True)
+    )
+    # Primary keys are listed first: MySQL cannot update a table while
+    # selecting from it in the same statement
+    for start in range(0, len(stale), 1000):
+        Profile.objects.filter(pk__in=stale[start : start + 1000]).update(
+            updated_at=user_updated_at
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('network', '0011_counters_changed_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_profile_updated_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+# network.search.STOPWORDS as of this migration
+STOPWORDS = (
+    "about an are as at be by com de en for from how in is it la of on or "
+    "that the this to was what when where who will with und www".split()
+)
+
+
+def drop_stopword_tokens(apps, schema_editor):
+    SearchToken = apps.get_model("network", "SearchToken")
+    SearchToken.objects.filter(term__in=STOPWORDS).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('network', '0012_profile_updated_at_follows_user'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_stopword_tokens, migrations.RunPython.noop),
+    ]
@@ -12,27 +12,22 @@ class User(AbstractUser):
     repost_probability = models.FloatField(default=0.5)
     gender = models.CharField(max_length=10, default="Male")
     prompt = models.TextField(default="", blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # Maintained by network.signals, repaired by `manage.py reconcile_counters`
+    followers_count = models.PositiveIntegerField(default=0, editable=False)
+    following_count = models.PositiveIntegerField(default=0, editable=False)
+    posts_count = models.PositiveIntegerField(default=0, editable=False)
+    # Last change of a counter; updated_at only follows edits of the row
+    counters_changed_at = models.DateTimeField(null=True, editable=False, db_index=True)
 
     @property
     def followers_list(self):
         return [connection.follower for connection in self.followers.all()]
 
-    @property
-    def followers_count(self):
-        return self.followers.count()
-
     @property
     def following_list(self):
         return [connection.user for connection in self.following.all()]
 
-    @property
-    def following_count(self):
-        return self.following.count()
-
-    @property
-    def posts_count(self):
-        return self.posts.count()
-
     @property
     def liked_posts(self):
         reactions = Reaction.objects.filter(user=self)
@@ -47,6 +42,12 @@ class User(AbstractUser):
     def __str__(self):
         return f"{self.username}"
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Bot/human filters, paged by id
+            models.Index(fields=["is_bot", "id"], name="user_is_bot_idx"),
+        ]
+
 
 class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, blank=False, null=False)
@@ -54,6 +55,7 @@ class Profile(models.Model):
     image = models.URLField(blank=False, null=False)
     dob = models.DateField(blank=False, null=False)
     bio = models.TextField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return f"{self.user} -> {self.name}"
@@ -94,18 +96,26 @@ class Post(models.Model):
     content = models.TextField(blank=False, null=False)
     date = models.DateTimeField(auto_now_add=True)
     ispinned = models.BooleanField(default=False)
-
-    @property
-    def reactions_count(self):
-        return self.reactions.count()
-
-    @property
-    def comments_count(self):
-        return self.comments.count()
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # Maintained by network.signals, repaired by `manage.py reconcile_counters`
+    reactions_count = models.PositiveIntegerField(default=0, editable=False)
+    comments_count = models.PositiveIntegerField(default=0, editable=False)
+    # Last change of a counter; updated_at only follows edits of the row
+    counters_changed_at = models.DateTimeField(null=True, editable=False, db_index=True)
 
     def __str__(self):
         return f"{self.user}: {self.content[:25]}"
 
+    class Meta:
+        indexes = [
+            # Feeds ordered by (-date, -id)
+            models.Index(fields=["date", "id"], name="post_date_idx"),
+            # Profile pages ordered by (-ispinned, -date)
+            models.Index(
+                fields=["user", "ispinned", "date"], name="post_user_pinned_date_idx"
+            ),
+        ]
+
 
 class Reaction(models.Model):
     post = models.ForeignKey(
@@ -134,10 +144,17 @@ class Comment(models.Model):
     )
     user = models.ForeignKey(User, on_delete=models.CASCADE, blank=False, null=False)
     date = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.user} commented {self.content} on {self.post}"
 
+    class Meta:
+        indexes = [
+            # A post's comments ordered by (date, id)
+            models.Index(fields=["post", "date", "id"], name="comment_post_date_idx"),
+        ]
+
 
 class Bookmark(models.Model):
     post = models.ForeignKey(Post, on_delete=models.CASCADE, blank=False, null=False)
@@ -157,3 +174,58 @@ class Bookmark(models.Model):
         constraints = [
             models.UniqueConstraint(fields=["post", "user"], name="unique bookmark")
         ]
+
+
+class TimelineEntry(models.Model):
+    """A post pushed into a follower's home timeline (see network.timelines)."""
+
+    user = models.ForeignKey(
+        User,
+        related_name="timeline",
+        on_delete=models.CASCADE,
+        blank=False,
+        null=False,
+    )
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, blank=False, null=False)
+    # Copy of post.date, so a timeline page is read from this table's index alone
+    date = models.DateTimeField(blank=False, null=False)
+
+    def __str__(self):
+        return f"{self.user}: {self.post}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "post"], name="unique timeline entry"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["user", "date", "post"], name="timeline_user_date_idx"
+            ),
+        ]
+
+
+class SearchToken(models.Model):
+    """
+    Inverted index entry: one word of a post or profile (see network.search).
+
+    Only used when search does not run on MySQL FULLTEXT indexes.
+    """
+
+    KIND_CHOICES = [("post", "Post"), ("profile", "Profile")]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    term = models.CharField(max_length=64)
+    # Occurrences of the word in the object
+    weight = models.PositiveIntegerField(default=1)
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}: {self.term}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["kind", "term", "object_id"], name="search_term_idx"),
+            models.Index(fields=["kind", "object_id"], name="search_object_idx"),
+        ]
@@ -0,0 +1,176 @@
+"""
+Count-free pagination for the HTML feeds.
+
+Django's Paginator runs COUNT(*) over the whole queryset on every page to
+know the number of pages. SeekPaginator instead pages by the ordering key of
+the first and last rows (`?after=` / `?before=` cursors), so every page is an
+index range scan of at most per_page + 1 rows. A total, if wanted, is passed
+in from a stored counter or from approximate_count(), which caches COUNT(*).
+"""
+
+import base64
+import json
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+
+def approximate_count(queryset, key, timeout=None):
+    """COUNT(*) of a queryset, cached for FEED_COUNT_CACHE_TTL seconds under `key`."""
+    if timeout is None:
+        timeout = settings.FEED_COUNT_CACHE_TTL
+    return cache.get_or_set(f"seek-count:{key}", queryset.count, timeout)
+
+
+def page_cursors(request):
+    """The `after` and `before` cursors of a request, e.g. as part of a cache key."""
+    return [request.GET.get("after", ""), request.GET.get("before", "")]
+
+
+def encode_cursor(values):
+    key = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(key, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor, fields):
+    """Decode a cursor into field values; raises ValueError when it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(raw)
+        if not isinstance(key, list) or len(key) != len(fields):
+            raise ValueError("Malformed cursor")
+        return [field.to_python(value) for field, value in zip(fields, key)]
+    except Exception:
+        raise ValueError("Malformed cursor")
+
+
+class SeekPage:
+    """One page of a SeekPaginator, iterable like a Django Page."""
+
+    def __init__(
+        self,
+        object_list,
+        next_cursor=None,
+        previous_cursor=None,
+        has_previous=False,
+        total=None,
+        per_page=10,
+    ):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        # A page reached through ?after= has a previous page even if its
+        # cursor is unknown, in which case the link goes back to the first page
+        self._has_previous = has_previous
+        self.total = total
+        self.per_page = per_page
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self._has_previous or self.previous_cursor is not None
+
+    @property
+    def num_pages(self):
+        """Approximate number of pages, or None without a total."""
+        if self.total is None:
+            return None
+        return max(1, -(-self.total // self.per_page))
+
+
+class SeekPaginator:
+    """
+    Pages a queryset by its ordering key.
+
+    `ordering` must end with a unique field (e.g. ("-date", "-id")) so every
+    row has a distinct key. Cursors are read from `after` (the page following
+    a row) and `before` (the page preceding a row).
+    """
+
+    def __init__(self, queryset, per_page=10, ordering=("-date", "-id"), total=None):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = list(ordering)
+        self.total = total
+        self.fields = [
+            queryset.model._meta.get_field(name.lstrip("-")) for name in self.ordering
+        ]
+
+    def _key(self, obj):
+        return [getattr(obj, field.attname) for field in self.fields]
+
+    def _seek(self, values, forward):
+        """Rows after (forward) or before the row with the given key."""
+        condition = Q()
+        equal = Q()
+        for name, value in zip(self.ordering, values):
+            descending = name.startswith("-")
+            name = name.lstrip("-")
+            lookup = "lt" if descending == forward else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def get_page(self, params):
+        """Get the page selected by the `after` / `before` query parameters."""
+        for direction in ("after", "before"):
+            cursor = params.get(direction)
+            if cursor:
+                try:
+                    values = decode_cursor(cursor, self.fields)
+                except ValueError:
+                    break  # invalid cursor, show the first page
+                if direction == "after":
+                    return self._page_after(values)
+                return self._page_before(values)
+        return self._page_after(None)
+
+    def _page_after(self, values):
+        queryset = self.queryset.order_by(*self.ordering)
+        if values is not None:
+            queryset = queryset.filter(self._seek(values, forward=True))
+        rows = list(queryset[: self.per_page + 1])
+        has_next = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        return SeekPage(
+            rows,
+            next_cursor=encode_cursor(self._key(rows[-1])) if has_next else None,
+            previous_cursor=(
+                encode_cursor(self._key(rows[0]))
+                if values is not None and rows
+                else None
+            ),
+            has_previous=values is not None,
+            total=self.total,
+            per_page=self.per_page,
+        )
+
+    def _page_before(self, values):
+        reverse = [
+            name[1:] if name.startswith("-") else f"-{name}" for name in self.ordering
+        ]
+        queryset = self.queryset.order_by(*reverse).filter(
+            self._seek(values, forward=False)
+        )
+        rows = list(queryset[: self.per_page + 1])
+        has_previous = len(rows) > self.per_page
+        rows = rows[: self.per_page][::-1]
+        if not rows:
+            return self._page_after(None)
+        return SeekPage(
+            rows,
+            next_cursor=encode_cursor(self._key(rows[-1])),
+            previous_cursor=encode_cursor(self._key(rows[0])) if has_previous else None,
+            total=self.total,
+            per_page=self.per_page,
+        )
@@ -0,0 +1,199 @@
+"""
+Full-text search over posts and profiles.
+
+On MySQL, searches use FULLTEXT indexes on post content and profile names
+(created by migration 0009) and MATCH ... AGAINST relevance. Other databases
+(SQLite in development) use SearchToken, an inverted index of the words of
+each post and profile kept current by network.signals. Either way a search
+reads the index entries of the query words instead of scanning every row, and
+returns at most SEARCH_MAX_RESULTS ids, best match first.
+
+SEARCH_BACKEND selects "fulltext" or "index" explicitly; the default "auto"
+picks by database vendor. `manage.py rebuild_search_index` rebuilds the
+inverted index.
+"""
+
+import re
+from collections import Counter
+
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, Sum
+from django.db.models.expressions import RawSQL
+
+from .models import Post, Profile, SearchToken
+
+# Longest word kept in the inverted index (SearchToken.term)
+MAX_TERM_LENGTH = 64
+# Query words considered per search
+MAX_QUERY_TERMS = 10
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# Words too common to narrow a search, neither indexed nor looked up. The
+# InnoDB FULLTEXT default list, so both backends ignore the same words.
+STOPWORDS = frozenset(
+    "about an are as at be by com de en for from how in is it la of on or "
+    "that the this to was what when where who will with und www".split()
+)
+
+
+def backend():
+    """The search backend in use: "fulltext" or "index"."""
+    if settings.SEARCH_BACKEND != "auto":
+        return settings.SEARCH_BACKEND
+    return "fulltext" if connection.vendor == "mysql" else "index"
+
+
+def tokenize(text):
+    """Lower-cased words of two or more characters, minus stopwords, with counts."""
+    return Counter(
+        word[:MAX_TERM_LENGTH]
+        for word in WORD_RE.findall((text or "").lower())
+        if len(word) > 1 and word not in STOPWORDS
+    )
+
+
+def query_terms(query):
+    return list(tokenize(query))[:MAX_QUERY_TERMS]
+
+
+# --- Inverted index maintenance ---
+
+
+def index_post(post, apps=django_apps):
+    _replace_tokens(apps, "post", post.pk, tokenize(post.content))
+
+
+def index_profile(profile, username, apps=django_apps):
+    _replace_tokens(apps, "profile", profile.pk, profile_tokens(profile.name, username))
+
+
+def index_new_profiles(rows, apps=django_apps):
+    """Index profiles that have no tokens yet from (pk, name, username) rows."""
+    SearchToken = apps.get_model("network", "SearchToken")
+    SearchToken.objects.bulk_create(
+        [
+            SearchToken(kind="profile", object_id=pk, term=term, weight=weight)
+            for pk, name, username in rows
+            for term, weight in profile_tokens(name, username).items()
+        ]
+    )
+
+
+def profile_tokens(name, username):
+    tokens = tokenize(name)
+    # Username words weigh double
+    tokens.update({term: 2 for term in tokenize(username)})
+    return tokens
+
+
+def unindex(kind, object_id, apps=django_apps):
+    SearchToken = apps.get_model("network", "SearchToken")
+    SearchToken.objects.filter(kind=kind, object_id=object_id).delete()
+
+
+def _replace_tokens(apps, kind, object_id, tokens):
+    SearchToken = apps.get_model("network", "SearchToken")
+    SearchToken.objects.filter(kind=kind, object_id=object_id).delete()
+    SearchToken.objects.bulk_create(
+        SearchToken(kind=kind, object_id=object_id, term=term, weight=weight)
+        for term, weight in tokens.items()
+    )
+
+
+def rebuild_index(apps=django_apps, batch_size=1000):
+    """Rebuild the inverted index of every post and profile; returns the rows indexed."""
+    Post = apps.get_model("network", "Post")
+    Profile = apps.get_model("network", "Profile")
+    SearchToken = apps.get_model("network", "SearchToken")
+    SearchToken.objects.all().delete()
+
+    indexed = 0
+    sources = [
+        ("post", Post.objects.values_list("pk", "content")),
+        (
+            "profile",
+            Profile.objects.values_list("pk", "name", "user__username"),
+        ),
+    ]
+    for kind, rows in sources:
+        batch = []
+        for pk, *texts in rows.order_by("pk").iterator(chunk_size=batch_size):
+            if kind == "profile":
+                tokens = profile_tokens(*texts)
+            else:
+                tokens = tokenize(texts[0])
+            batch.extend(
+                SearchToken(kind=kind, object_id=pk, term=term, weight=weight)
+                for term, weight in tokens.items()
+            )
+            indexed += 1
+            if len(batch) >= batch_size:
+                SearchToken.objects.bulk_create(batch)
+                batch = []
+        SearchToken.objects.bulk_create(batch)
+    return indexed
+
+
+# --- Searching ---
+
+
+def _ranked_from_index(kind, terms, limit):
+    return list(
+        SearchToken.objects.filter(kind=kind, term__in=terms)
+        .values("object_id")
+        .annotate(matched=Count("term"), score=Sum("weight"))
+        .order_by("-matched", "-score", "-object_id")
+        .values_list("object_id", flat=True)[:limit]
+    )
+
+
+def _ranked_from_fulltext(queryset, column, query, limit):
+    relevance = RawSQL(
+        f"MATCH({column}) AGAINST (%s IN NATURAL LANGUAGE MODE)", [query]
+    )
+    return list(
+        queryset.annotate(relevance=relevance)
+        .filter(relevance__gt=0)
+        .order_by("-relevance", "-pk")
+        .values_list("pk", flat=True)[:limit]
+    )
+
+
+def search_posts(query, limit=None):
+    """Ids of the posts matching `query`, most relevant first."""
+    limit = limit or settings.SEARCH_MAX_RESULTS
+    terms = query_terms(query)
+    if not terms:
+        return []
+    if backend() == "fulltext":
+        return _ranked_from_fulltext(
+            Post.objects.all(), "network_post.content", " ".join(terms), limit
+        )
+    return _ranked_from_index("post", terms, limit)
+
+
+def search_profiles(query, limit=None):
+    """Ids of the profiles matching `query` by name or username, best match first."""
+    limit = limit or settings.SEARCH_MAX_RESULTS
+    terms = query_terms(query)
+    if not terms:
+        return []
+    if backend() == "index":
+        return _ranked_from_index("profile", terms, limit)
+
+    # Username prefix matches (through the unique username index) come first
+    ranked = list(
+        Profile.objects.filter(user__username__istartswith=query.strip())
+        .order_by("user__username")
+        .values_list("pk", flat=True)[:limit]
+    )
+    seen = set(ranked)
+    for pk in _ranked_from_fulltext(
+        Profile.objects.all(), "network_profile.name", " ".join(terms), limit
+    ):
+        if pk not in seen:
+            ranked.append(pk)
+    return ranked[:limit]
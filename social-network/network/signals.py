@@ -1,7 +1,11 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.conf import settings
-from .models import User
+from django.db import transaction
+from django.utils import timezone
+from . import caching, search, timelines
+from .counters import increment, decrement
+from .models import User, Profile, Post, Reaction, Comment, Connection
 
 
 @receiver(post_save, sender=User)
@@ -12,3 +16,164 @@ def make_first_user_admin(sender, instance, created, **kwargs):
             instance.is_superuser = True
             instance.is_staff = True
             instance.save(update_fields=["is_superuser", "is_staff"])
+
+
+# --- Denormalized counters ---
+# Each create/delete adjusts the stored count with a single UPDATE ... SET
+# count = count +/- 1, so concurrent writers never overwrite each other.
+# Fixture loading (raw) is skipped; `manage.py reconcile_counters` recounts.
+
+
+@receiver(post_save, sender=Reaction)
+def reaction_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        increment(Post, instance.post_id, "reactions_count")
+
+
+@receiver(post_delete, sender=Reaction)
+def reaction_deleted(sender, instance, **kwargs):
+    decrement(Post, instance.post_id, "reactions_count")
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        increment(Post, instance.post_id, "comments_count")
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    decrement(Post, instance.post_id, "comments_count")
+
+
+@receiver(post_save, sender=Connection)
+def connection_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        increment(User, instance.user_id, "followers_count")
+        increment(User, instance.follower_id, "following_count")
+        timelines.add_author(instance.follower_id, instance.user_id)
+
+
+@receiver(post_delete, sender=Connection)
+def connection_deleted(sender, instance, **kwargs):
+    decrement(User, instance.user_id, "followers_count")
+    decrement(User, instance.follower_id, "following_count")
+    timelines.remove_author(instance.follower_id, instance.user_id)
+
+
+@receiver(post_save, sender=Post)
+def post_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        increment(User, instance.user_id, "posts_count")
+        transaction.on_commit(lambda: timelines.fan_out(instance))
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    decrement(User, instance.user_id, "posts_count")
+
+
+# --- Profile change tracking ---
+# Profile.updated_at also follows edits of the user row, so the incremental
+# profile export (api ProfileViewSet.export) filters on that indexed column
+# alone. Counter updates do not save the user and are not changes here.
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # Logins only update last_login
+    if created or raw or update_fields == frozenset(["last_login"]):
+        return
+    Profile.objects.filter(user_id=instance.pk).update(updated_at=timezone.now())
+
+
+# --- Search index ---
+# Only maintained when search does not use MySQL FULLTEXT indexes.
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or search.backend() != "index":
+        return
+    if update_fields is None or "content" in update_fields:
+        search.index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def post_unindexed(sender, instance, **kwargs):
+    if search.backend() == "index":
+        search.unindex("post", instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+def profile_saved(sender, instance, raw=False, **kwargs):
+    if not raw and search.backend() == "index":
+        search.index_profile(instance, instance.user.username)
+
+
+@receiver(post_save, sender=User)
+def user_reindexed(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # Profiles are also found by username
+    if created or raw or search.backend() != "index":
+        return
+    if update_fields is None or "username" in update_fields:
+        profile = Profile.objects.filter(user=instance).first()
+        if profile is not None:
+            search.index_profile(profile, instance.username)
+
+
+@receiver(post_delete, sender=Profile)
+def profile_unindexed(sender, instance, **kwargs):
+    if search.backend() == "index":
+        search.unindex("profile", instance.pk)
+
+
+# --- Cache invalidation ---
+# Bumps the versions of the cache namespaces (network.caching) that depend on
+# the saved or deleted row. List namespaces ("posts", "profiles",
+# "comments:<post id>") only change when rows are added, removed or
+# reordered; likes, comments and follows only touch the rows they count on.
+
+
+@receiver([post_save, post_delete], sender=Post)
+def post_changed(sender, instance, raw=False, created=True, **kwargs):
+    if not raw:
+        caching.bump("posts", f"post:{instance.pk}")
+        # The author's posts_count (post_delete sends no `created`)
+        if created:
+            caching.bump(f"user:{instance.user_id}")
+
+
+@receiver([post_save, post_delete], sender=Reaction)
+def reaction_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        caching.bump(f"post:{instance.post_id}")
+
+
+@receiver([post_save, post_delete], sender=Comment)
+def comment_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        caching.bump(
+            f"post:{instance.post_id}",
+            f"comments:{instance.post_id}",
+            f"comment:{instance.pk}",
+        )
+
+
+@receiver([post_save, post_delete], sender=Profile)
+def profile_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        caching.bump("profiles", f"user:{instance.user_id}")
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Logins only update last_login
+    if not raw and update_fields != frozenset(["last_login"]):
+        caching.bump("profiles", f"user:{instance.pk}")
+
+
+@receiver([post_save, post_delete], sender=Connection)
+def connection_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        caching.bump(f"user:{instance.user_id}", f"user:{instance.follower_id}")
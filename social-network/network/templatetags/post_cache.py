@@ -0,0 +1,20 @@
+from django import template
+
+from network import caching
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_card_key(post, user):
+    """
+    Fragment cache key of a post card as seen by `user`.
+
+    Changes when the post, its author or the author's profile changes, and
+    differs for the author, who also gets the edit and pin controls.
+    """
+    post_version, author_version = caching.versions(
+        f"post:{post.pk}", f"user:{post.user_id}"
+    )
+    is_author = user.is_authenticated and user.pk == post.user_id
+    return f"{post.pk}.{post_version}.{author_version}.{int(is_author)}"
@@ -1,3 +1,90 @@
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
 
-# Create your tests here.
+from .models import Comment, Connection, Post, Reaction, User
+
+
+class CounterSignalTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create(username="author")
+        self.reader = User.objects.create(username="reader")
+        self.post = Post.objects.create(user=self.author, content="post")
+
+    def counts(self, obj, *fields):
+        return tuple(type(obj).objects.filter(pk=obj.pk).values_list(*fields).get())
+
+    def test_follow_and_unfollow(self):
+        connection = Connection.objects.create(user=self.author, follower=self.reader)
+        self.assertEqual(self.counts(self.author, "followers_count"), (1,))
+        self.assertEqual(self.counts(self.reader, "following_count"), (1,))
+        connection.delete()
+        self.assertEqual(self.counts(self.author, "followers_count"), (0,))
+        self.assertEqual(self.counts(self.reader, "following_count"), (0,))
+
+    def test_like_and_unlike(self):
+        reaction = Reaction.objects.create(post=self.post, user=self.reader)
+        self.assertEqual(self.counts(self.post, "reactions_count"), (1,))
+        reaction.delete()
+        self.assertEqual(self.counts(self.post, "reactions_count"), (0,))
+
+    def test_comment_delete(self):
+        first = Comment.objects.create(post=self.post, user=self.reader, content="1")
+        Comment.objects.create(post=self.post, user=self.reader, content="2")
+        self.assertEqual(self.counts(self.post, "comments_count"), (2,))
+        first.delete()
+        self.assertEqual(self.counts(self.post, "comments_count"), (1,))
+
+    def test_post_delete(self):
+        Post.objects.create(user=self.author, content="second")
+        self.assertEqual(self.counts(self.author, "posts_count"), (2,))
+        self.post.delete()
+        self.assertEqual(self.counts(self.author, "posts_count"), (1,))
+
+    def test_cascade_after_explicit_delete_stays_non_negative(self):
+        reaction = Reaction.objects.create(post=self.post, user=self.reader)
+        comment = Comment.objects.create(post=self.post, user=self.reader, content="c")
+        Comment.objects.create(post=self.post, user=self.author, content="c")
+        Connection.objects.create(user=self.author, follower=self.reader)
+        reaction.delete()
+        comment.delete()
+        # Cascades over the reader's connection and remaining rows
+        self.reader.delete()
+        self.assertEqual(
+            self.counts(self.post, "reactions_count", "comments_count"), (0, 1)
+        )
+        self.assertEqual(self.counts(self.author, "followers_count"), (0,))
+        # Cascades over the post, its comment and the author's counters
+        self.post.delete()
+        self.assertEqual(self.counts(self.author, "posts_count"), (0,))
+        self.author.delete()
+        self.assertFalse(Post.objects.exists() or Comment.objects.exists())
+
+    def test_decrement_never_goes_below_zero(self):
+        Comment.objects.create(post=self.post, user=self.reader, content="c")
+        Post.objects.filter(pk=self.post.pk).update(comments_count=0)
+        Comment.objects.filter(post=self.post).delete()
+        self.assertEqual(self.counts(self.post, "comments_count"), (0,))
+
+
+class ReconcileCountersTests(TestCase):
+    def test_repairs_drifted_counters(self):
+        author = User.objects.create(username="author")
+        reader = User.objects.create(username="reader")
+        post = Post.objects.create(user=author, content="post")
+        Reaction.objects.create(post=post, user=reader)
+        Connection.objects.create(user=author, follower=reader)
+        Post.objects.filter(pk=post.pk).update(reactions_count=7, comments_count=3)
+        User.objects.filter(pk=author.pk).update(followers_count=0, posts_count=5)
+
+        out = StringIO()
+        call_command("reconcile_counters", "--dry-run", stdout=out)
+        self.assertIn("4 counters wrong", out.getvalue())
+        self.assertEqual(Post.objects.get(pk=post.pk).reactions_count, 7)
+
+        call_command("reconcile_counters", stdout=StringIO())
+        post.refresh_from_db()
+        author.refresh_from_db()
+        self.assertEqual((post.reactions_count, post.comments_count), (1, 0))
+        self.assertEqual((author.followers_count, author.posts_count), (1, 1))
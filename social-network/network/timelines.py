@@ -0,0 +1,211 @@
+"""
+Home timelines for the following feed.
+
+Creating a post pushes it into the timeline of every follower of its author
+(fan-out on write), so reading the feed is a range scan over the reader's own
+TimelineEntry rows instead of a query over everything they follow. Authors with
+more than TIMELINE_FANOUT_LIMIT followers are not pushed; their posts are
+pulled and merged in when a timeline is read.
+
+Fan-out runs once the post's transaction commits. Neither it nor reads trim
+timelines, so a post costs one insert per batch of followers; run
+`manage.py trim_timelines` periodically to cut every timeline back to its
+newest TIMELINE_MAX_LENGTH entries. The command can also rebuild timelines
+from scratch.
+
+Posts made while an author is above the fan-out limit are never pushed, so
+they drop out of their followers' timelines once the author falls back below
+it; `manage.py trim_timelines --rebuild` refills them.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Q, Subquery
+
+from .models import Connection, Post, TimelineEntry, User
+
+FANOUT_BATCH_SIZE = 1000
+
+
+def encode_cursor(date, post_id):
+    """Encode the (date, post id) of the last post on a page."""
+    return f"{int(date.timestamp() * 1_000_000)}-{post_id}"
+
+
+def decode_cursor(cursor):
+    """Decode a timeline cursor; raises ValueError when it is malformed."""
+    micros, _, post_id = cursor.partition("-")
+    try:
+        date = datetime.fromtimestamp(int(micros) / 1_000_000, tz=dt_timezone.utc)
+    except (OverflowError, OSError):
+        raise ValueError("Malformed cursor")
+    return date, int(post_id)
+
+
+def before(cursor, date_field, id_field):
+    """Keyset filter for rows ordered by (-date, -id) after `cursor`."""
+    date, post_id = cursor
+    return Q(**{f"{date_field}__lt": date}) | Q(
+        **{date_field: date, f"{id_field}__lt": post_id}
+    )
+
+
+def is_pulled(author_id):
+    """Whether the author has too many followers to be pushed to timelines."""
+    followers = (
+        User.objects.filter(pk=author_id)
+        .values_list("followers_count", flat=True)
+        .first()
+    )
+    return (followers or 0) > settings.TIMELINE_FANOUT_LIMIT
+
+
+def pulled_authors(user):
+    """Ids of the high-fanout authors `user` follows."""
+    return Connection.objects.filter(
+        follower=user, user__followers_count__gt=settings.TIMELINE_FANOUT_LIMIT
+    ).values("user_id")
+
+
+def fan_out(post):
+    """Push a new post into the timelines of its author's followers."""
+    if is_pulled(post.user_id):
+        return
+    followers = (
+        Connection.objects.filter(user_id=post.user_id)
+        .values_list("follower_id", flat=True)
+        .iterator(chunk_size=FANOUT_BATCH_SIZE)
+    )
+    batch = []
+    for follower_id in followers:
+        batch.append(TimelineEntry(user_id=follower_id, post=post, date=post.date))
+        if len(batch) >= FANOUT_BATCH_SIZE:
+            _push(batch)
+            batch = []
+    if batch:
+        _push(batch)
+
+
+def _push(batch):
+    TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def add_author(follower_id, author_id):
+    """Copy an author's recent posts into a new follower's timeline."""
+    if is_pulled(author_id):
+        return
+    posts = Post.objects.filter(user_id=author_id).order_by("-date", "-id")
+    TimelineEntry.objects.bulk_create(
+        [
+            TimelineEntry(user_id=follower_id, post_id=post_id, date=date)
+            for post_id, date in posts.values_list("id", "date")[
+                : settings.TIMELINE_MAX_LENGTH
+            ]
+        ],
+        ignore_conflicts=True,
+    )
+    trim(follower_id)
+
+
+def remove_author(follower_id, author_id):
+    """Drop an unfollowed author's posts from the follower's timeline."""
+    post_ids = Post.objects.filter(user_id=author_id).values("id")
+    TimelineEntry.objects.filter(user_id=follower_id, post_id__in=post_ids).delete()
+
+
+def trim(user_id):
+    """Delete a timeline's entries beyond TIMELINE_MAX_LENGTH; returns how many."""
+    last_kept = (
+        TimelineEntry.objects.filter(user_id=user_id)
+        .order_by("-date", "-post_id")
+        .values_list("date", "post_id")[
+            settings.TIMELINE_MAX_LENGTH - 1 : settings.TIMELINE_MAX_LENGTH
+        ]
+        .first()
+    )
+    if last_kept is None:
+        return 0
+    deleted, _ = (
+        TimelineEntry.objects.filter(user_id=user_id)
+        .filter(before(last_kept, "date", "post_id"))
+        .delete()
+    )
+    return deleted
+
+
+def trim_all(batch_size=1000):
+    """Trim every timeline, one user at a time; returns the deleted entries."""
+    deleted = 0
+    last_user_id = None
+    while True:
+        user_ids = TimelineEntry.objects.order_by("user_id").values_list(
+            "user_id", flat=True
+        )
+        if last_user_id is not None:
+            user_ids = user_ids.filter(user_id__gt=last_user_id)
+        user_ids = list(user_ids.distinct()[:batch_size])
+        if not user_ids:
+            return deleted
+        for user_id in user_ids:
+            deleted += trim(user_id)
+        last_user_id = user_ids[-1]
+
+
+def rebuild(user):
+    """Refill a timeline from the newest posts of the pushed authors `user` follows."""
+    TimelineEntry.objects.filter(user=user).delete()
+    followed = Connection.objects.filter(follower=user).exclude(
+        user__followers_count__gt=settings.TIMELINE_FANOUT_LIMIT
+    )
+    posts = Post.objects.filter(user_id__in=Subquery(followed.values("user_id")))
+    TimelineEntry.objects.bulk_create(
+        [
+            TimelineEntry(user=user, post_id=post_id, date=date)
+            for post_id, date in posts.order_by("-date", "-id").values_list(
+                "id", "date"
+            )[: settings.TIMELINE_MAX_LENGTH]
+        ],
+        batch_size=FANOUT_BATCH_SIZE,
+    )
+
+
+def read(user, cursor=None, limit=10):
+    """
+    Get one page of a user's following timeline, newest first.
+
+    `cursor` is the `next_cursor` of the previous page. Returns the page's
+    posts (with author and profile loaded) and the next cursor, or None on
+    the last page.
+    """
+    position = None
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+        except ValueError:
+            pass  # ignore invalid cursor
+
+    pushed = TimelineEntry.objects.filter(user=user)
+    pulled = Post.objects.filter(user_id__in=Subquery(pulled_authors(user)))
+    if position is not None:
+        pushed = pushed.filter(before(position, "date", "post_id"))
+        pulled = pulled.filter(before(position, "date", "id"))
+    # An author who crossed the fan-out limit can have a post in both sources
+    keys = {
+        post_id: date
+        for post_id, date in pushed.order_by("-date", "-post_id").values_list(
+            "post_id", "date"
+        )[: limit + 1]
+    }
+    keys.update(pulled.order_by("-date", "-id").values_list("id", "date")[: limit + 1])
+    page = sorted(keys.items(), key=lambda item: (item[1], item[0]), reverse=True)
+
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_cursor(page[-1][1], page[-1][0])
+    posts = Post.objects.select_related("user__profile").in_bulk(
+        [post_id for post_id, _ in page]
+    )
+    # Skip posts deleted since the page was read
+    return [posts[post_id] for post_id, _ in page if post_id in posts], next_cursor
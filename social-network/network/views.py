@@ -1,3 +1,4 @@
+import copy
 import json
 import uuid
 from django.contrib.auth import authenticate, login, logout
@@ -8,20 +9,43 @@ from django.urls import reverse
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.views.decorators.http import require_POST
 from django.views.decorators.csrf import csrf_exempt
-from django.core.paginator import Paginator
 
+from . import caching, timelines
+from .paginator import SeekPage, SeekPaginator, approximate_count, page_cursors
 from .utils import profile_check
 from .models import *
 
 
+def cached_posts_page(prefix, parts, get_page):
+    """
+    A SeekPage of posts whose post ids are cached until a post is added or removed.
+
+    The posts themselves are read again by primary key, so counters are current
+    and a like does not invalidate every cached page; post cards are cached
+    per post (see templatetags/post_cache.py).
+    """
+
+    def get_ids():
+        page = copy.copy(get_page())
+        page.object_list = [post.pk for post in page.object_list]
+        return page
+
+    page = copy.copy(caching.get_or_set(prefix, parts, ["posts"], get_ids))
+    posts = Post.objects.select_related("user__profile").in_bulk(page.object_list)
+    # Skip posts deleted since the page was cached
+    page.object_list = [posts[pk] for pk in page.object_list if pk in posts]
+    return page
+
+
 @user_passes_test(
     profile_check, login_url="network:update_profile"
 )
 def index(request):
-    posts = Post.objects.all().order_by("-date")
-    paginator = Paginator(posts, 10)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    def get_page():
+        total = approximate_count(Post.objects.all(), "posts")
+        return SeekPaginator(Post.objects.all(), 10, total=total).get_page(request.GET)
+
+    page_obj = cached_posts_page("index", page_cursors(request), get_page)
     return render(request, "network/index.html", {"posts_page": page_obj})
 
 
@@ -135,10 +159,17 @@ def profile(request, username):
             f"<h3>Either {username} does not exist or has not created profile</h3>"
         )
 
-    posts = user.posts.all().order_by("-ispinned", "-date")
-    paginator = Paginator(posts, 10)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    def get_page():
+        return SeekPaginator(
+            user.posts.all(),
+            10,
+            ordering=("-ispinned", "-date", "-id"),
+            total=user.posts_count,
+        ).get_page(request.GET)
+
+    page_obj = cached_posts_page(
+        "profile-posts", [user.pk, *page_cursors(request)], get_page
+    )
 
     return render(
         request, "network/profile.html", {"profile": profile, "posts_page": page_obj}
@@ -150,11 +181,9 @@ def profile(request, username):
     profile_check, login_url="network:update_profile"
 )
 def following(request):
-    following = request.user.following_list
-    posts = Post.objects.filter(user__in=following).order_by("-date")
-    paginator = Paginator(posts, 10)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    cursor = request.GET.get("after")
+    posts, next_cursor = timelines.read(request.user, cursor=cursor, limit=10)
+    page_obj = SeekPage(posts, next_cursor=next_cursor, has_previous=bool(cursor))
 
     return render(request, "network/following.html", {"posts_page": page_obj})
 
@@ -314,6 +343,7 @@ def react(request, post_id):
     try:
         reaction = Reaction.objects.get(post=post, user=request.user)
         reaction.delete()
+        post.refresh_from_db(fields=["reactions_count"])
         return JsonResponse(
             {
                 "status": "201",
@@ -324,6 +354,7 @@ def react(request, post_id):
     except Reaction.DoesNotExist:
         reaction = Reaction(post=post, user=request.user)
         reaction.save()
+        post.refresh_from_db(fields=["reactions_count"])
         return JsonResponse(
             {
                 "status": "201",
@@ -338,14 +369,10 @@ def react(request, post_id):
     profile_check, login_url="network:update_profile"
 )
 def bookmarks(request):
-    try:
-        bookmarks = request.user.bookmarked_posts
-    except:
-        bookmarks = []
-
-    paginator = Paginator(bookmarks, 10)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    bookmarks = request.user.bookmarks.select_related("post__user__profile")
+    total = approximate_count(bookmarks, f"bookmarks:{request.user.pk}")
+    page_obj = SeekPaginator(bookmarks, 10, total=total).get_page(request.GET)
+    page_obj.object_list = [bookmark.post for bookmark in page_obj]
 
     return render(request, "network/bookmarks.html", {"posts_page": page_obj})
 